@@ -0,0 +1,281 @@
+"""HTTP JSON API for the FIFA Realistic Toolkit calculators.
+
+A small asyncio HTTP/1.1 server that runs alongside the Streamlit UI and uses
+the same pricing functions (and the same shared lookup caches). Connections are
+kept alive by default and every calculator has a batch endpoint, so a client
+can price thousands of players per request.
+
+Usage:
+    python api.py --host 127.0.0.1 --port 8502
+
+Endpoints (POST, JSON body):
+    /stature                {"league", "country", "european"}
+    /minimum-offer          {"player_value", "is_young", "stature_diff"}
+                            or {"player_value", "is_young", "club", "offering_club"}
+    /starting-bid           {"player_value", "player_overall", "player_age", "average_team_overall"}
+    /proportional-wage      {"player_overall", "starting_11"}
+    /batch/<calculator>     {"items": [...], ...shared fields merged into each item}
+
+GET /health and GET /stats (lookup cache counters) are also available, and
+GET /metrics serves request counts, latencies and payload sizes in Prometheus
+text format. Each request is also written to the structured event log, when
+one is configured (see telemetry.py), off the request path.
+"""
+import argparse
+import asyncio
+import json
+import math
+import time
+
+from pricing import (
+    calculate_score,
+    calculate_minimum_offer,
+    calculate_starting_bid,
+    calculate_proportional_wage,
+    pricing_cache_stats
+)
+from reference import reference_tables
+from telemetry import metrics, record_event
+
+MAX_BODY_BYTES = 16 * 1024 * 1024
+# Largest magnitude accepted for any number (values, wages, overalls)
+MAX_NUMBER = 1e12
+KEEP_ALIVE_TIMEOUT = 15
+
+class ApiError(Exception):
+    def __init__(self, message, status=400):
+        super().__init__(message)
+        self.status = status
+
+# Input validation
+def _number(data, key, minimum=None):
+    value = data.get(key)
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        raise ApiError(f"'{key}' must be a number.")
+    if not math.isfinite(value) or abs(value) > MAX_NUMBER:
+        raise ApiError(f"'{key}' must be a finite number no larger than {MAX_NUMBER:,.0f}.")
+    if minimum is not None and value < minimum:
+        raise ApiError(f"'{key}' must be at least {minimum}.")
+    return value
+
+def _club(data):
+    if not isinstance(data, dict):
+        raise ApiError("Club must be an object with 'league', 'country' and 'european'.")
+    tables = reference_tables()
+    if data.get("league") not in tables.league_tiers:
+        raise ApiError(f"Unknown league: {data.get('league')!r}.")
+    if data.get("country") not in tables.country_prestige:
+        raise ApiError(f"Unknown country: {data.get('country')!r}.")
+    return data["league"], data["country"], bool(data.get("european", False))
+
+# Calculators
+def stature(data):
+    league, country, european = _club(data)
+    return {"stature": calculate_score(league, country, european, reference_tables().league_tiers)}
+
+def minimum_offer(data):
+    player_value = _number(data, "player_value", minimum=0)
+    if player_value <= 0:
+        raise ApiError("Player value must be greater than 0.")
+    if "stature_diff" in data:
+        stature_diff = _number(data, "stature_diff")
+    else:
+        league_tiers = reference_tables().league_tiers
+        score1 = calculate_score(*_club(data.get("club")), league_tiers)
+        score2 = calculate_score(*_club(data.get("offering_club")), league_tiers)
+        stature_diff = score2 - score1
+    offer = calculate_minimum_offer(player_value, stature_diff, bool(data.get("is_young", False)))
+    return {"minimum_offer": math.ceil(offer / 1000) * 1000, "stature_diff": stature_diff}
+
+def starting_bid(data):
+    player_value = _number(data, "player_value")
+    player_overall = _number(data, "player_overall")
+    if player_value <= 0 or player_overall <= 0:
+        raise ApiError("Player value and overall must be greater than 0.")
+    player_age = _number(data, "player_age", minimum=16)
+    average_team_overall = data.get("average_team_overall")
+    if average_team_overall is not None:
+        average_team_overall = _number(data, "average_team_overall")
+    bid, is_accurate = calculate_starting_bid(player_value, player_overall, player_age, average_team_overall)
+    return {"starting_bid": math.ceil(bid / 1000) * 1000, "is_accurate": is_accurate}
+
+def proportional_wage(data):
+    player_overall = _number(data, "player_overall")
+    starting_11 = data.get("starting_11")
+    if not isinstance(starting_11, list) or not all(isinstance(player, dict) for player in starting_11):
+        raise ApiError("'starting_11' must be a list of players with 'overall' and 'wage'.")
+    for player in starting_11:
+        _number(player, "overall")
+        _number(player, "wage")
+    wage, wage_error = calculate_proportional_wage(player_overall, starting_11)
+    if wage is None:
+        raise ApiError(wage_error)
+    return {"wage": wage}
+
+CALCULATORS = {
+    "stature": stature,
+    "minimum-offer": minimum_offer,
+    "starting-bid": starting_bid,
+    "proportional-wage": proportional_wage,
+}
+
+def batch(calculator, data):
+    items = data.get("items")
+    if not isinstance(items, list):
+        raise ApiError("'items' must be a list.")
+    shared = {key: value for key, value in data.items() if key != "items"}
+    results = []
+    for item in items:
+        if not isinstance(item, dict):
+            results.append({"error": "Each item must be an object."})
+            continue
+        try:
+            results.append(calculator({**shared, **item}))
+        except ApiError as e:
+            results.append({"error": str(e)})
+        except (ValueError, OverflowError) as e:
+            results.append({"error": f"Could not price this item: {e}"})
+    return {"results": results}
+
+def _reject_constant(name):
+    raise ValueError(f"{name} is not a valid number.")
+
+def handle(method, path, body):
+    path = path.split("?", 1)[0].rstrip("/")
+    if method == "GET" and path == "/health":
+        return {"status": "ok"}
+    if method == "GET" and path == "/stats":
+        return {"cache": pricing_cache_stats()}
+    name = path[len("/batch/"):] if path.startswith("/batch/") else path.lstrip("/")
+    if name not in CALCULATORS:
+        raise ApiError(f"Not found: {path}", status=404)
+    if method != "POST":
+        raise ApiError("Use POST with a JSON body.", status=405)
+    try:
+        data = json.loads(body or b"{}", parse_constant=_reject_constant)
+    except (json.JSONDecodeError, UnicodeDecodeError):
+        raise ApiError("Invalid JSON body.")
+    except RecursionError:
+        raise ApiError("JSON body is nested too deeply.")
+    except ValueError as e:
+        raise ApiError(str(e))
+    if not isinstance(data, dict):
+        raise ApiError("JSON body must be an object.")
+    if path.startswith("/batch/"):
+        return batch(CALCULATORS[name], data)
+    return CALCULATORS[name](data)
+
+# HTTP/1.1 server
+REASONS = {
+    200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed", 413: "Payload Too Large",
+    431: "Request Header Fields Too Large"
+}
+
+def _response(status, payload, keep_alive, content_type="application/json"):
+    if isinstance(payload, str):
+        body = payload.encode("utf-8")
+    else:
+        body = json.dumps(payload, separators=(",", ":")).encode("utf-8")
+    headers = (
+        f"HTTP/1.1 {status} {REASONS.get(status, 'Error')}\r\n"
+        f"Content-Type: {content_type}\r\n"
+        f"Content-Length: {len(body)}\r\n"
+        f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n"
+        "\r\n"
+    )
+    return headers.encode("latin-1") + body
+
+def _endpoint_label(path):
+    # Unknown paths share one label so scans cannot grow the metric series
+    path = path.split("?", 1)[0].rstrip("/")
+    name = path[len("/batch/"):] if path.startswith("/batch/") else path.lstrip("/")
+    if name in CALCULATORS or path in ("/health", "/stats", "/metrics"):
+        return path
+    return "other"
+
+async def serve_connection(reader, writer):
+    try:
+        while True:
+            try:
+                request_line = await asyncio.wait_for(reader.readline(), KEEP_ALIVE_TIMEOUT)
+            except asyncio.TimeoutError:
+                break
+            except (ValueError, asyncio.LimitOverrunError):
+                # Longer than the stream limit
+                writer.write(_response(431, {"error": "Request line too long."}, False))
+                break
+            if not request_line.strip():
+                break
+            try:
+                method, path, version = request_line.decode("latin-1").split()
+            except ValueError:
+                writer.write(_response(400, {"error": "Malformed request line."}, False))
+                break
+            headers = {}
+            try:
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+            except (ValueError, asyncio.LimitOverrunError):
+                writer.write(_response(431, {"error": "Request header line too long."}, False))
+                break
+            connection = headers.get("connection", "").lower()
+            keep_alive = connection != "close" if version == "HTTP/1.1" else connection == "keep-alive"
+            try:
+                length = int(headers.get("content-length", 0) or 0)
+            except ValueError:
+                length = -1
+            if length < 0:
+                writer.write(_response(400, {"error": "Invalid Content-Length."}, False))
+                break
+            if length > MAX_BODY_BYTES:
+                writer.write(_response(413, {"error": "Request body too large."}, False))
+                break
+            body = await reader.readexactly(length) if length else b""
+            started = time.perf_counter()
+            if method == "GET" and path.split("?", 1)[0].rstrip("/") == "/metrics":
+                status = 200
+                response = _response(status, metrics.render(), keep_alive, "text/plain; version=0.0.4; charset=utf-8")
+            else:
+                try:
+                    status, payload = 200, handle(method, path, body)
+                except ApiError as e:
+                    status, payload = e.status, {"error": str(e)}
+                except (ValueError, OverflowError) as e:
+                    status, payload = 400, {"error": f"Could not price this request: {e}"}
+                response = _response(status, payload, keep_alive)
+            record_event(
+                "api", duration=time.perf_counter() - started, payload_bytes=len(body),
+                endpoint=_endpoint_label(path), status=status
+            )
+            writer.write(response)
+            await writer.drain()
+            if not keep_alive:
+                break
+    except (asyncio.IncompleteReadError, ConnectionResetError):
+        pass
+    finally:
+        writer.close()
+
+async def run_server(host, port):
+    server = await asyncio.start_server(serve_connection, host, port)
+    addresses = ", ".join(f"{sock.getsockname()[0]}:{sock.getsockname()[1]}" for sock in server.sockets)
+    print(f"FIFA Realistic Toolkit API listening on {addresses}")
+    async with server:
+        await server.serve_forever()
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve the transfer calculators as a JSON API.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8502)
+    args = parser.parse_args()
+    try:
+        asyncio.run(run_server(args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,37 @@
 import streamlit as st
-import math
 import json
-import io
+import math
+import time
+from pricing import (
+    calculate_score,
+    calculate_minimum_offer,
+    calculate_starting_bid,
+    calculate_proportional_wage,
+    pricing_cache_stats
+)
+from ledger import TransferLedger, WINDOW_LIMITS, YOUTH_PROMOTION_MAX
+from watchlist import Watchlist
+from dashboard import SeasonTrend
+from history import History, thaw_record
+from scouting import scout_permission, scout_rating_message
+from browser_storage import browser_storage
+from html_blocks import block_cache_stats, progress_bar, tally_table, window_tally
+from session_lifecycle import collect_transient_state, resume_session, spiller
+from reference import reference_error, reference_tables
+from telemetry import METRICS_PORT, record_event, start_metrics_server
+
+rerun_started = time.perf_counter()
+
+def rerun():
+    # st.rerun() ends the script early, so time the run before it
+    record_rerun()
+    st.rerun()
+
+def record_rerun():
+    record_event("rerun", duration=time.perf_counter() - rerun_started, tab=st.session_state.get("active_tab"))
+
+# Prometheus metrics for this server process (started on the first rerun only)
+start_metrics_server()
 
 # Add viewport meta tag for mobile optimization
 st.markdown(
@@ -245,8 +275,15 @@ st.markdown(
     }
     .custom-progress-bar {
         height: 20px;
+        background-color: #3498db;
         transition: width 0.3s ease, background-color 0.3s ease;
     }
+    .custom-progress-bar.complete {
+        background-color: #28a745;
+    }
+    .progress-label {
+        margin-bottom: 5px;
+    }
     /* Checklist tables */
     .checklist-section {
         margin-bottom: 1rem;
@@ -265,6 +302,9 @@ st.markdown(
     th {
         background-color: #2c3e50 !important;
     }
+    .tally {
+        margin-bottom: 1rem;
+    }
     /* Load message styling */
     .load-message {
         background-color: #34495e !important;
@@ -398,122 +438,22 @@ st.markdown(
     unsafe_allow_html=True
 )
 
-# League tier mapping
-league_tiers = {
-    "First Division": 10,
-    "Second Division": 7,
-    "Third Division": 4,
-    "Fourth Division": 1
-}
+# League tiers, country prestige and player positions from reference_tables.json,
+# picked up again on the next rerun whenever the file is edited
+reference = reference_tables()
+league_tiers = reference.league_tiers
+country_prestige = reference.country_prestige
+player_positions = list(reference.player_positions)
+default_positions = list(reference.default_positions)
 
-# Country prestige mapping
-country_prestige = {
-    "England": 3, "Spain": 3, "Germany": 3, "Italy": 3, "France": 3,
-    "Netherlands": 2, "Portugal": 2, "USA": 2, "Belgium": 2,
-    "Other": 1
-}
+def option_index(options, value):
+    # Values saved before a reference table edit may no longer be an option
+    return options.index(value) if value in options else 0
 
-# Player position options
-player_positions = [
-    "GK", "LB", "LWB", "CB", "RB", "RWB", "CDM", "LM", "CM", "RM",
-    "CAM", "CF", "LW", "ST", "RW"
-]
-
-# Default positions for starting 11
-default_positions = ["GK", "LB", "CB", "CB", "RB", "LM", "CM", "CM", "RM", "ST", "ST"]
-
-# Function definitions
-def calculate_score(league, country, european, league_tiers):
-    league_score = league_tiers.get(league, 1)
-    if league_tiers.get(league, 1) < 3:
-        league_score /= 2
-    country_score = country_prestige.get(country, 1)
-    european_bonus = 1.0 if european else 0.0
-    return league_score + country_score + european_bonus
-
-def calculate_minimum_offer(player_value, stature_diff, is_young):
-    if stature_diff <= 0:
-        markup = 65.0
-    else:
-        markup = 65.0 - (stature_diff / 12.0) * 50.0
-        markup = max(markup, 15.0)
-    multiplier = 1.0 + markup / 100.0
-    if is_young:
-        if stature_diff <= 0 or stature_diff <= 3.5:
-            age_markup = 0.25
-        elif stature_diff <= 7.0:
-            age_markup = 0.18
-        else:
-            age_markup = 0.12
-    else:
-        age_markup = 0.0
-    return player_value * multiplier + player_value * age_markup
-
-def calculate_starting_bid(player_value, player_overall, player_age, average_team_overall=None):
-    if player_age >= 16 and player_age <= 24:
-        if average_team_overall is None:
-            return player_value * 1.75, False
-        elif player_overall > average_team_overall:
-            return player_value * 2.00, True
-        elif player_overall == average_team_overall:
-            return player_value * 1.75, True
-        else:
-            return player_value * 1.50, True
-    elif player_age >= 25 and player_age <= 29:
-        if average_team_overall is None:
-            return player_value * 1.75, False
-        elif player_overall > average_team_overall:
-            return player_value * 1.40, True
-        elif player_overall == average_team_overall:
-            return player_value * 1.30, True
-        else:
-            return player_value * 1.10, True
-    else:
-        return player_value * 1.30, average_team_overall is not None
-
-def calculate_proportional_wage(player_overall, starting_11):
-    valid_players = [
-        player for player in starting_11
-        if player["overall"] > 0 and player["wage"] > 0
-    ]
-    if not valid_players:
-        return None, "No valid Starting 11 data with non-zero wages and overalls."
-    max_wage = max(player["wage"] for player in valid_players)
-    max_wage_players = [player for player in valid_players if player["wage"] == max_wage]
-    max_wage_overall = max_wage_players[0]["overall"]
-    max_overall = max(player["overall"] for player in valid_players)
-    wage = max_wage * (player_overall / max_wage_overall)
-    if player_overall > max_overall:
-        wage *= 1.2
-    wage = math.ceil(wage / 100) * 100
-    return wage, None
-
-# Initialize session state for existing sections
-if "starting_11" not in st.session_state:
-    st.session_state.starting_11 = [
-        {"position": default_positions[i], "overall": 0, "wage": 0} for i in range(11)
-    ]
-if "average_team_overall" not in st.session_state:
-    st.session_state.average_team_overall = None
-if "club_details" not in st.session_state:
-    st.session_state.club_details = {
-        "name": "",
-        "league": "First Division",
-        "country": "England",
-        "european": False
-    }
-if "scout_rating_display" not in st.session_state:
-    st.session_state.scout_rating_display = None
-if "uploaded_json_content" not in st.session_state:
-    st.session_state.uploaded_json_content = ""
-if "apply_json_content" not in st.session_state:
-    st.session_state.apply_json_content = ""
-if "show_load_message" not in st.session_state:
-    st.session_state.show_load_message = False
-
-# Initialize session state for Career Checklist
-if "checklist" not in st.session_state:
-    st.session_state.checklist = {
+# Session state defaults. Each tab initialises only the keys it uses, so a new
+# session does not build state for tabs the user has not opened yet.
+def default_checklist():
+    return {
         "summer": {
             "starting_signings": 0,
             "bench_signings": 0,
@@ -531,830 +471,1919 @@ if "checklist" not in st.session_state:
         "youth_promotions": 0
     }
 
+session_defaults = {
+    "starting_11": lambda: [
+        {"position": default_positions[i], "overall": 0, "wage": 0} for i in range(11)
+    ],
+    "average_team_overall": lambda: None,
+    "club_details": lambda: {
+        "name": "",
+        "league": "First Division",
+        "country": "England",
+        "european": False
+    },
+    "scout_rating_display": lambda: None,
+    "uploaded_json_content": lambda: "",
+    "apply_json_content": lambda: "",
+    "show_load_message": lambda: False,
+    "checklist": default_checklist,
+    "squad": lambda: [],
+    "season": lambda: 1,
+    "ledger": TransferLedger,
+    "season_trend": SeasonTrend,
+    "watchlist": Watchlist,
+    "contracts": tuple,
+    "history": History,
+    "offline_mode": lambda: False,
+    "live_calculators": lambda: False
+}
+
+def init_session_state(*keys):
+    for key in keys:
+        if key not in st.session_state:
+            st.session_state[key] = session_defaults[key]()
+
+# Checklist counters are derived from the transfer ledger
+def record_transfer(window, category, **details):
+    st.session_state.ledger.record(st.session_state.season, window, category, **details)
+    st.session_state.checklist = st.session_state.ledger.checklist(st.session_state.season)
+    record_event("checklist", action="record", window=window, category=category, season=st.session_state.season)
+
+def reverse_transfer(window, category):
+    st.session_state.ledger.reverse_last(st.session_state.season, window, category)
+    st.session_state.checklist = st.session_state.ledger.checklist(st.session_state.season)
+    record_event("checklist", action="reverse", window=window, category=category, season=st.session_state.season)
+
+# Undo/redo restores a history snapshot into session state
+def restore_snapshot(snapshot):
+    if snapshot.club_details is not None:
+        if thaw_record(snapshot.club_details) != st.session_state.get("club_details"):
+            st.session_state.scout_rating_display = None
+        st.session_state.club_details = thaw_record(snapshot.club_details)
+        for key in ["club_name", "form_league", "club_country", "club_european"]:
+            st.session_state.pop(key, None)
+    if snapshot.starting_11 is not None:
+        st.session_state.starting_11 = [thaw_record(player) for player in snapshot.starting_11]
+        if any(player["overall"] > 0 for player in st.session_state.starting_11):
+            total_overall = sum(player["overall"] for player in st.session_state.starting_11)
+            st.session_state.average_team_overall = math.floor(total_overall / 11)
+        else:
+            st.session_state.average_team_overall = None
+        for i in range(11):
+            for field in ["position", "overall", "wage"]:
+                st.session_state.pop(f"player_{i}_{field}", None)
+    if snapshot.season is not None and "ledger" in st.session_state:
+        st.session_state.season = snapshot.season
+        st.session_state.checklist = st.session_state.ledger.checklist(snapshot.season)
+
+# Validates a saved career (Save/Load JSON or browser storage) and applies it
+# to session state. Returns None if invalid, otherwise any warnings to show.
+def load_career_data(loaded_data):
+    from contracts import read_contracts
+
+    if not isinstance(loaded_data, dict):
+        return None
+    # Validate club_details
+    club_valid = (
+        isinstance(loaded_data.get("club_details"), dict) and
+        all(key in loaded_data["club_details"] for key in ["name", "league", "country", "european"]) and
+        isinstance(loaded_data["club_details"]["name"], str) and
+        loaded_data["club_details"]["league"] in league_tiers and
+        loaded_data["club_details"]["country"] in country_prestige and
+        isinstance(loaded_data["club_details"]["european"], bool)
+    )
+    # Validate starting_11
+    starting_11_valid = (
+        isinstance(loaded_data.get("starting_11"), list) and
+        len(loaded_data["starting_11"]) == 11 and
+        all(
+            isinstance(player, dict) and
+            all(key in player for key in ["position", "overall", "wage"]) and
+            player["position"] in player_positions and
+            isinstance(player["overall"], int) and
+            0 <= player["overall"] <= 99 and
+            isinstance(player["wage"], int) and
+            player["wage"] >= 0
+            for player in loaded_data["starting_11"]
+        )
+    )
+    # Validate checklist
+    checklist_valid = (
+        isinstance(loaded_data.get("checklist"), dict) and
+        "summer" in loaded_data["checklist"] and
+        "winter" in loaded_data["checklist"] and
+        "youth_promotions" in loaded_data["checklist"] and
+        isinstance(loaded_data["checklist"]["summer"], dict) and
+        isinstance(loaded_data["checklist"]["winter"], dict) and
+        isinstance(loaded_data["checklist"]["youth_promotions"], int) and
+        loaded_data["checklist"]["youth_promotions"] >= 0 and
+        all(
+            key in loaded_data["checklist"]["summer"]
+            for key in ["starting_signings", "bench_signings", "reserve_signings", "loans", "starting_sold"]
+        ) and
+        all(
+            key in loaded_data["checklist"]["winter"]
+            for key in ["starting_signings", "bench_signings", "reserve_signings", "loans", "starting_sold"]
+        ) and
+        all(
+            isinstance(loaded_data["checklist"]["summer"][key], int) and
+            loaded_data["checklist"]["summer"][key] >= 0
+            for key in loaded_data["checklist"]["summer"]
+        ) and
+        all(
+            isinstance(loaded_data["checklist"]["winter"][key], int) and
+            loaded_data["checklist"]["winter"][key] >= 0
+            for key in loaded_data["checklist"]["winter"]
+        )
+    )
+    # Validate squad (optional, older saves have none)
+    squad_valid = (
+        isinstance(loaded_data.get("squad"), list) and
+        all(
+            isinstance(player, dict) and
+            all(key in player for key in ["position", "overall", "wage"]) and
+            player["position"] in player_positions and
+            isinstance(player["overall"], int) and
+            0 <= player["overall"] <= 99 and
+            isinstance(player["wage"], int) and
+            player["wage"] >= 0
+            for player in loaded_data["squad"]
+        )
+    )
+    if not (club_valid and starting_11_valid):
+        return None
+    # Everything is read into locals first and assigned at the end, so a bad
+    # part never leaves the session half loaded
+    warnings = []
+    # Checklist counters come from the ledger; older saves only have counters
+    loaded_season = loaded_data.get("season")
+    if not isinstance(loaded_season, int) or isinstance(loaded_season, bool) or loaded_season < 1:
+        loaded_season = 1
+    try:
+        loaded_ledger = TransferLedger.from_dict(loaded_data["ledger"]) if "ledger" in loaded_data else None
+    except ValueError:
+        loaded_ledger = None
+        warnings.append("Transfer history invalid; rebuilt from checklist counters.")
+    if loaded_ledger is None:
+        if checklist_valid:
+            loaded_ledger = TransferLedger.from_checklist(loaded_data["checklist"], loaded_season)
+        else:
+            loaded_ledger = TransferLedger()
+            warnings.append("Checklist data invalid or missing; reset to defaults.")
+    # Watchlist is optional; older saves have none
+    try:
+        loaded_watchlist = Watchlist.from_dict(loaded_data["watchlist"]) if "watchlist" in loaded_data else Watchlist()
+    except ValueError:
+        loaded_watchlist = Watchlist()
+        warnings.append("Watchlist data invalid; cleared.")
+    try:
+        loaded_trend = SeasonTrend.from_dict(loaded_data["season_trend"]) if "season_trend" in loaded_data else SeasonTrend()
+    except ValueError:
+        loaded_trend = SeasonTrend()
+        warnings.append("Season trend data invalid; cleared.")
+    try:
+        loaded_contracts = read_contracts(loaded_data["contracts"]) if "contracts" in loaded_data else ()
+    except ValueError:
+        loaded_contracts = ()
+        warnings.append("Contract plan invalid; cleared.")
+    total_overall = sum(player["overall"] for player in loaded_data["starting_11"])
+    st.session_state.club_details = loaded_data["club_details"]
+    st.session_state.starting_11 = loaded_data["starting_11"]
+    st.session_state.squad = loaded_data["squad"] if squad_valid else []
+    st.session_state.ledger = loaded_ledger
+    st.session_state.watchlist = loaded_watchlist
+    st.session_state.season_trend = loaded_trend
+    st.session_state.contracts = loaded_contracts
+    # A loaded career starts a fresh undo history
+    st.session_state.history = History()
+    st.session_state.season = loaded_season
+    st.session_state.checklist = loaded_ledger.checklist(loaded_season)
+    st.session_state.average_team_overall = math.floor(total_overall / 11)
+    return warnings
+
+# Everything Save/Load and browser storage keep
+def career_data():
+    return {
+        "club_details": st.session_state.club_details,
+        "starting_11": st.session_state.starting_11,
+        "checklist": st.session_state.checklist,
+        "squad": st.session_state.squad,
+        "season": st.session_state.season,
+        "ledger": st.session_state.ledger.to_dict(),
+        "watchlist": st.session_state.watchlist.to_dict(),
+        "season_trend": st.session_state.season_trend.to_dict(),
+        "contracts": [contract._asdict() for contract in st.session_state.contracts]
+    }
+
+# Cheap stand-in for comparing career_data() between reruns: the small parts
+# as they are, and revision numbers for the ledger, watchlist and trend
+def career_fingerprint():
+    return (
+        json.dumps(
+            [st.session_state.club_details, st.session_state.starting_11, st.session_state.checklist,
+             st.session_state.squad, st.session_state.season, st.session_state.contracts],
+            sort_keys=True, default=str
+        ),
+        st.session_state.ledger.revision,
+        st.session_state.watchlist.revision,
+        st.session_state.season_trend.revision
+    )
+
+# Bring back career data spilled to disk while this session was idle, and
+# drop flow keys that are finished or belong to a tab the user has left
+resume_session()
+collect_transient_state(st.session_state, st.session_state.get("active_tab", "Club Details"))
+
+# League room: keep this club's entry in the shared room up to date (a no-op
+# when nothing changed)
+if st.session_state.get("room_view") is not None:
+    from rooms import RoomError
+
+    init_session_state("club_details", "average_team_overall")
+    try:
+        st.session_state.room_view.publish(st.session_state.club_details, st.session_state.average_team_overall)
+    except RoomError as e:
+        st.session_state.room_view = None
+        st.error(str(e))
+
 # App title
 st.title("FIFA Realistic Toolkit")
 
-# Create tabs with Save/Load as the last tab
-tab1, tab2, tab3, tab4, tab5, tab6 = st.tabs(["Club Details", "Career Checklist", "Starting 11", "Transfer Calculators", "Help/Info", "Save/Load"])
+# Undo/redo for club details, Starting 11 and checklist edits
+init_session_state("history")
+history = st.session_state.history
+history.track(history.snapshot(
+    st.session_state.get("club_details"),
+    st.session_state.get("starting_11"),
+    st.session_state.get("season"),
+    st.session_state.get("ledger")
+))
+col1, col2, _ = st.columns([1, 1, 4])
+with col1:
+    if st.button(f"Undo ({len(history.undo_stack)})", key="undo", disabled=not history.undo_stack):
+        restore_snapshot(history.undo(st.session_state.get("ledger")))
+        rerun()
+with col2:
+    if st.button(f"Redo ({len(history.redo_stack)})", key="redo", disabled=not history.redo_stack):
+        restore_snapshot(history.redo(st.session_state.get("ledger")))
+        rerun()
+
+# Offline mode keeps a copy of the career in this browser and restores it
+# into a fresh session, e.g. after a dropped mobile connection
+init_session_state("offline_mode")
+# The component reports what this device has stored once per session; act on
+# it before drawing anything so the restored career is what gets shown
+stored_career = st.session_state.get("browser_storage")
+if stored_career is not None and not st.session_state.get("browser_storage_checked"):
+    st.session_state.browser_storage_checked = True
+    # Corrupted storage or an older component version may report anything
+    if isinstance(stored_career, dict) and stored_career.get("enabled"):
+        st.session_state.offline_mode = True
+        # Never overwrite anything already entered in this session
+        if not history.undo_stack and isinstance(stored_career.get("career"), dict):
+            try:
+                restore_warnings = load_career_data(stored_career["career"])
+            except Exception:
+                restore_warnings = None
+            if restore_warnings is None:
+                st.warning("The career saved on this device could not be restored.")
+            else:
+                record_event("load", action="browser")
+                st.info(f"Restored your career saved on this device ({stored_career.get('saved_at') or 'an earlier visit'}).")
+                for restore_warning in restore_warnings:
+                    st.warning(restore_warning)
+    # The reported copy is no longer needed; don't keep it for the whole session
+    del st.session_state["browser_storage"]
+# The career is only serialised and sent to the browser when it changed since
+# the last copy the component stored
+career_payload = None
+if st.session_state.offline_mode:
+    init_session_state("club_details", "starting_11", "checklist", "squad", "season", "ledger", "watchlist", "season_trend", "contracts")
+    fingerprint = career_fingerprint()
+    if fingerprint != st.session_state.get("browser_storage_sent"):
+        career_payload = career_data()
+        # The component only starts storing once it has reported what the device has
+        if st.session_state.get("browser_storage_checked"):
+            st.session_state.browser_storage_sent = fingerprint
+else:
+    st.session_state.pop("browser_storage_sent", None)
+browser_storage(career_payload, st.session_state.offline_mode)
+
+# Create tabs with Save/Load as the last tab. Tabs track the selected tab and
+# rerun on switch, so only the open tab's content is built and sent.
+tab1, tab2, tab3, tab4, tab5, tab6, tab7 = st.tabs(
+    ["Club Details", "Career Checklist", "Starting 11", "Transfer Calculators", "Career Dashboard", "Help/Info", "Save/Load"],
+    key="active_tab",
+    on_change="rerun"
+)
 
 # Tab 1: Club Details
 with tab1:
-    st.header("Your Club Details")
-    st.write(
-        """
-        Welcome to the FIFA Realistic Toolkit! Enter your club details below to calculate team stature and guide transfers.
-        Use the Save/Load tab to save or upload your data.
-        """
-    )
+    if tab1.open:
+        init_session_state("club_details", "scout_rating_display")
+        st.header("Your Club Details")
+        st.write(
+            """
+            Welcome to the FIFA Realistic Toolkit! Enter your club details below to calculate team stature and guide transfers.
+            Use the Save/Load tab to save or upload your data.
+            """
+        )
     
-    # Progress indicator for club details
-    def is_field_valid(value, field_type):
-        if field_type == "league" and value in league_tiers:
-            return True
-        elif field_type == "country" and value in country_prestige:
-            return True
-        elif field_type == "european" and isinstance(value, bool):
-            return True
-        elif field_type == "name" and value != "":
-            return True
-        return False
-
-    club_progress = (
-        (1 if is_field_valid(st.session_state.club_details["league"], "league") else 0) +
-        (1 if is_field_valid(st.session_state.club_details["country"], "country") else 0) +
-        (1 if is_field_valid(st.session_state.club_details["european"], "european") else 0) +
-        (1 if is_field_valid(st.session_state.club_details["name"], "name") else 0)
-    ) / 4
-    club_progress_percentage = int(club_progress * 100)
-    club_progress_color = "#28a745" if club_progress == 1 else "#3498db"
-    st.markdown(
-        f"""
-        <div style="margin-bottom: 5px;">Club Details Completion: {club_progress_percentage}%</div>
-        <div class="custom-progress-container">
-            <div class="custom-progress-bar" style="width: {club_progress_percentage}%; background-color: {club_progress_color};"></div>
-        </div>
-        """,
-        unsafe_allow_html=True
-    )
-    st.write("**Required**: League, Country, European status.")
-
-    # Display scout rating if set
-    if st.session_state.scout_rating_display:
-        st.success(st.session_state.scout_rating_display)
-
-    # Club details form in expander
-    with st.expander("Enter Club Details", expanded=True):
-        with st.form(key="club_details_form"):
-            club_name = st.text_input(
-                "Club Name",
-                value=st.session_state.club_details["name"],
-                key="club_name"
-            )
-            club_league = st.selectbox(
-                "League/Division",
-                list(league_tiers.keys()),
-                index=list(league_tiers.keys()).index(st.session_state.club_details["league"]),
-                key="form_league"
-            )
-            club_country = st.selectbox(
-                "Country",
-                list(country_prestige.keys()),
-                index=list(country_prestige.keys()).index(st.session_state.club_details["country"]),
-                key="club_country"
-            )
-            club_european = st.checkbox(
-                "Participates in European Competitions (e.g., Champions League)",
-                value=st.session_state.club_details["european"],
-                key="club_european"
-            )
-            submit_club_details = st.form_submit_button("Save Club Details")
-
-        if submit_club_details:
-            st.session_state.club_details = {
-                "name": club_name,
-                "league": club_league,
-                "country": club_country,
-                "european": club_european
-            }
-            # Calculate scout star rating
-            league = st.session_state.club_details["league"]
-            european = st.session_state.club_details["european"]
-            if league == "First Division" and european:
-                scout_rating = 10
-                message = f"Scout Star Rating: {scout_rating} stars. Can assign worldwide."
-            elif league == "First Division" and not european:
-                scout_rating = 8
-                message = f"Scout Star Rating: {scout_rating} stars. Can only assign to local continent and neighbouring continents."
-            elif league == "Second Division":
-                scout_rating = 6
-                message = f"Scout Star Rating: {scout_rating} stars. Can only assign to local continent."
-            elif league == "Third Division":
-                scout_rating = 4
-                message = f"Scout Star Rating: {scout_rating} stars. Can only assign to local country and neighbouring countries."
-            else:  # Fourth Division
-                scout_rating = 2
-                message = f"Scout Star Rating: {scout_rating} stars. Can only assign to local country."
-            st.session_state.scout_rating_display = message
-            st.rerun()
+        # Progress indicator for club details
+        def is_field_valid(value, field_type):
+            if field_type == "league" and value in league_tiers:
+                return True
+            elif field_type == "country" and value in country_prestige:
+                return True
+            elif field_type == "european" and isinstance(value, bool):
+                return True
+            elif field_type == "name" and value != "":
+                return True
+            return False
+
+        club_progress = (
+            (1 if is_field_valid(st.session_state.club_details["league"], "league") else 0) +
+            (1 if is_field_valid(st.session_state.club_details["country"], "country") else 0) +
+            (1 if is_field_valid(st.session_state.club_details["european"], "european") else 0) +
+            (1 if is_field_valid(st.session_state.club_details["name"], "name") else 0)
+        ) / 4
+        st.markdown(progress_bar("Club Details Completion", int(club_progress * 100)), unsafe_allow_html=True)
+        st.write("**Required**: League, Country, European status.")
+
+        # Display scout rating if set
+        if st.session_state.scout_rating_display:
+            st.success(st.session_state.scout_rating_display)
+
+        # Club details form in expander
+        with st.expander("Enter Club Details", expanded=True):
+            with st.form(key="club_details_form"):
+                club_name = st.text_input(
+                    "Club Name",
+                    value=st.session_state.club_details["name"],
+                    key="club_name"
+                )
+                club_league = st.selectbox(
+                    "League/Division",
+                    list(league_tiers.keys()),
+                    index=option_index(list(league_tiers.keys()), st.session_state.club_details["league"]),
+                    key="form_league"
+                )
+                club_country = st.selectbox(
+                    "Country",
+                    list(country_prestige.keys()),
+                    index=option_index(list(country_prestige.keys()), st.session_state.club_details["country"]),
+                    key="club_country"
+                )
+                club_european = st.checkbox(
+                    "Participates in European Competitions (e.g., Champions League)",
+                    value=st.session_state.club_details["european"],
+                    key="club_european"
+                )
+                submit_club_details = st.form_submit_button("Save Club Details")
+
+            if submit_club_details:
+                st.session_state.club_details = {
+                    "name": club_name,
+                    "league": club_league,
+                    "country": club_country,
+                    "european": club_european
+                }
+                # Calculate scout star rating
+                permission = scout_permission(st.session_state.club_details["league"], st.session_state.club_details["european"])
+                message = scout_rating_message(permission)
+                st.session_state.scout_rating_display = message
+                rerun()
+
+        # Scout assignment planner
+        with st.expander("Scout Assignment Planner", expanded=False):
+            from scouting import SCOUTING_COUNTRIES, plan_assignments
+
+            permission = scout_permission(st.session_state.club_details["league"], st.session_state.club_details["european"])
+            st.write(f"Your saved club details allow scouts up to {permission.rating} stars. {permission.description}")
+            with st.form(key="scout_plan_form"):
+                club_home = st.session_state.club_details["country"]
+                scout_home_country = st.selectbox(
+                    "Home Country",
+                    SCOUTING_COUNTRIES,
+                    index=SCOUTING_COUNTRIES.index(club_home) if club_home in SCOUTING_COUNTRIES else 0,
+                    key="scout_home_country"
+                )
+                scout_targets = st.multiselect("Target Countries (in priority order)", SCOUTING_COUNTRIES, key="scout_targets")
+                scout_list = st.text_area(
+                    "Scouts (one per line: Name, Stars)",
+                    key="scout_list",
+                    help="Stars are the scout's experience plus judgement, e.g. Smith, 6"
+                )
+                submit_scout_plan = st.form_submit_button("Plan Assignments")
+
+            if submit_scout_plan:
+                scouts = []
+                invalid_lines = []
+                for line in scout_list.splitlines():
+                    if not line.strip():
+                        continue
+                    name, _, stars = line.rpartition(",")
+                    try:
+                        scouts.append({"name": name.strip() or f"Scout {len(scouts) + 1}", "stars": int(stars)})
+                    except ValueError:
+                        invalid_lines.append(line.strip())
+                if invalid_lines:
+                    st.error(f"Could not read scout line(s): {', '.join(invalid_lines)}")
+                elif not scout_targets or not scouts:
+                    st.warning("Please choose at least one target country and enter at least one scout.")
+                else:
+                    plan = plan_assignments(scout_home_country, permission, scout_targets, scouts)
+                    if plan["assignments"]:
+                        st.dataframe([
+                            {"Scout": assignment["scout"], "Stars": assignment["stars"], "Country": assignment["country"]}
+                            for assignment in plan["assignments"]
+                        ])
+                    st.success(f"Coverage: {plan['coverage']:.0%} of target countries.")
+                    if plan["unreachable"]:
+                        st.warning(f"Outside your scouting region: {', '.join(plan['unreachable'])}")
+                    if plan["uncovered"]:
+                        st.info(f"Need more scouts for: {', '.join(plan['uncovered'])}")
+                    if plan["idle_scouts"]:
+                        st.info(f"Unassigned scouts: {', '.join(plan['idle_scouts'])}")
+                    if plan["ineligible_scouts"]:
+                        st.warning(f"Rated above {permission.rating} stars and cannot be hired: {', '.join(plan['ineligible_scouts'])}")
 
 # Tab 2: Career Checklist
 with tab2:
-    st.header("Career Checklist")
-    st.write("Track your signings, sales, and youth promotions to stay within the guidelines.")
-
-    # Reset button for the checklist
-    if st.button("Reset for New Season", key="reset_checklist"):
-        st.session_state.checklist = {
-            "summer": {
-                "starting_signings": 0,
-                "bench_signings": 0,
-                "reserve_signings": 0,
-                "loans": 0,
-                "starting_sold": 0
-            },
-            "winter": {
-                "starting_signings": 0,
-                "bench_signings": 0,
-                "reserve_signings": 0,
-                "loans": 0,
-                "starting_sold": 0
-            },
-            "youth_promotions": 0
-        }
-        st.session_state.pop("summer_signing_category", None)
-        st.session_state.pop("winter_signing_category", None)
-        st.session_state.pop("summer_loan_mode", None)
-        st.session_state.pop("winter_loan_mode", None)
-        st.success("Checklist reset for the new season!")
-        st.rerun()
-
-    # Summer Window
-    with st.expander("Summer Window", expanded=True):
-        st.subheader("Summer Window Guidelines")
+    if tab2.open:
+        init_session_state("season", "ledger", "checklist")
+        st.header("Career Checklist")
+        st.write("Track your signings, sales, and youth promotions to stay within the guidelines.")
+        st.write(f"**Season {st.session_state.season}**")
+
+        # Reset button for the checklist. Past seasons stay in the transfer history.
+        if st.button("Reset for New Season", key="reset_checklist"):
+            # Freeze the closing season's squad trend for the dashboard
+            init_session_state("starting_11", "squad", "season_trend")
+            st.session_state.season_trend.record(st.session_state.season, st.session_state.starting_11, st.session_state.squad)
+            st.session_state.season += 1
+            st.session_state.checklist = st.session_state.ledger.checklist(st.session_state.season)
+            st.session_state.pop("summer_signing_category", None)
+            st.session_state.pop("winter_signing_category", None)
+            st.session_state.pop("summer_loan_mode", None)
+            st.session_state.pop("winter_loan_mode", None)
+            record_event("checklist", action="new_season", season=st.session_state.season)
+            st.success("Checklist reset for the new season!")
+            rerun()
+
+        # Summer Window
+        with st.expander("Summer Window", expanded=True):
+            st.subheader("Summer Window Guidelines")
         
-        # Tally display as a table
-        summer_starting_max = 2
-        summer_bench_max = 2
-        summer_reserve_max = 3
-        summer_loan_max = 3
-        summer_starting_extra = 1 if st.session_state.checklist["summer"]["starting_sold"] >= 2 else 0
-        summer_starting_total_max = summer_starting_max + summer_starting_extra
-        summer_bench_total_max = summer_bench_max + summer_starting_extra
-        st.markdown(
-            """
-            <table style="width:100%; border-collapse: collapse; margin-bottom: 1rem;">
-                <tr style="background-color: #2c3e50; color: white;">
-                    <th>Category</th>
-                    <th>Current Count</th>
-                    <th>Max Limit</th>
-                </tr>
-                <tr style="background-color: #34495e; color: white;">
-                    <td>First Team Signings</td>
-                    <td>{}</td>
-                    <td>{}</td>
-                </tr>
-                <tr style="background-color: #34495e; color: white;">
-                    <td>Bench Signings</td>
-                    <td>{}</td>
-                    <td>{}</td>
-                </tr>
-                <tr style="background-color: #34495e; color: white;">
-                    <td>Reserve Signings</td>
-                    <td>{}</td>
-                    <td>{}</td>
-                </tr>
-                <tr style="background-color: #34495e; color: white;">
-                    <td>Loans</td>
-                    <td>{}</td>
-                    <td>{}</td>
-                </tr>
-                <tr style="background-color: #34495e; color: white;">
-                    <td>Starting Players Sold</td>
-                    <td>{}</td>
-                    <td>-</td>
-                </tr>
-            </table>
-            """.format(
-                st.session_state.checklist["summer"]["starting_signings"],
-                summer_starting_total_max,
-                st.session_state.checklist["summer"]["bench_signings"],
-                summer_bench_total_max,
-                st.session_state.checklist["summer"]["reserve_signings"],
-                summer_reserve_max,
-                st.session_state.checklist["summer"]["loans"],
-                summer_loan_max,
-                st.session_state.checklist["summer"]["starting_sold"]
-            ),
-            unsafe_allow_html=True
-        )
-        if summer_starting_extra:
-            st.markdown("*Extra signing unlocked (2 starting players sold)!*")
-
-        # Signing question and category buttons
-        if st.button("Did you make a signing?", key="summer_signing_question"):
-            st.session_state["summer_signing_mode"] = True
-            st.rerun()
-        if st.session_state.get("summer_signing_mode", False):
-            with st.container():
-                col1, col2, col3 = st.columns([1, 1, 1])
-                with col1:
-                    if st.button("First Team Player", key="summer_starting_add"):
-                        st.session_state["summer_signing_category"] = "starting"
-                        st.session_state["summer_loan_mode"] = True
-                        st.session_state["summer_signing_mode"] = False
-                        st.rerun()
-                with col2:
-                    if st.button("Bench Player", key="summer_bench_add"):
-                        st.session_state["summer_signing_category"] = "bench"
-                        st.session_state["summer_loan_mode"] = True
-                        st.session_state["summer_signing_mode"] = False
-                        st.rerun()
-                with col3:
-                    if st.button("Reserve Player", key="summer_reserve_add"):
-                        st.session_state["summer_signing_category"] = "reserve"
-                        st.session_state["summer_loan_mode"] = True
-                        st.session_state["summer_signing_mode"] = False
-                        st.rerun()
-        if st.session_state.get("summer_loan_mode", False):
-            st.write("Is this a loan?")
-            with st.container():
-                col1, col2 = st.columns([1, 1])
-                with col1:
-                    if st.button("Yes", key="summer_loan_yes"):
-                        if st.session_state.checklist["summer"]["loans"] < summer_loan_max:
+            # Tally display as a table
+            summer_starting_max = WINDOW_LIMITS["summer"]["starting_signings"]
+            summer_bench_max = WINDOW_LIMITS["summer"]["bench_signings"]
+            summer_reserve_max = WINDOW_LIMITS["summer"]["reserve_signings"]
+            summer_loan_max = WINDOW_LIMITS["summer"]["loans"]
+            summer_starting_extra = 1 if st.session_state.checklist["summer"]["starting_sold"] >= 2 else 0
+            summer_starting_total_max = summer_starting_max + summer_starting_extra
+            summer_bench_total_max = summer_bench_max + summer_starting_extra
+            st.markdown(
+                window_tally(
+                    st.session_state.checklist["summer"], summer_starting_total_max, summer_bench_total_max, summer_reserve_max, summer_loan_max
+                ),
+                unsafe_allow_html=True
+            )
+            if summer_starting_extra:
+                st.markdown("*Extra signing unlocked (2 starting players sold)!*")
+
+            # Signing question and category buttons
+            if st.button("Did you make a signing?", key="summer_signing_question"):
+                st.session_state["summer_signing_mode"] = True
+                rerun()
+            if st.session_state.get("summer_signing_mode", False):
+                with st.container():
+                    col1, col2, col3 = st.columns([1, 1, 1])
+                    with col1:
+                        if st.button("First Team Player", key="summer_starting_add"):
+                            st.session_state["summer_signing_category"] = "starting"
+                            st.session_state["summer_loan_mode"] = True
+                            st.session_state["summer_signing_mode"] = False
+                            rerun()
+                    with col2:
+                        if st.button("Bench Player", key="summer_bench_add"):
+                            st.session_state["summer_signing_category"] = "bench"
+                            st.session_state["summer_loan_mode"] = True
+                            st.session_state["summer_signing_mode"] = False
+                            rerun()
+                    with col3:
+                        if st.button("Reserve Player", key="summer_reserve_add"):
+                            st.session_state["summer_signing_category"] = "reserve"
+                            st.session_state["summer_loan_mode"] = True
+                            st.session_state["summer_signing_mode"] = False
+                            rerun()
+            if st.session_state.get("summer_loan_mode", False):
+                with st.container():
+                    col1, col2, col3 = st.columns([2, 1, 1])
+                    with col1:
+                        summer_signing_player = st.text_input("Player Name (Optional)", key="summer_signing_player")
+                    with col2:
+                        summer_signing_fee = st.number_input("Fee", min_value=0.0, step=1000.0, format="%.2f", key="summer_signing_fee")
+                    with col3:
+                        summer_signing_wage = st.number_input("Wage (p/w)", min_value=0, step=1000, format="%d", key="summer_signing_wage")
+                summer_signing_details = {"player": summer_signing_player, "fee": summer_signing_fee, "wage": summer_signing_wage}
+                st.write("Is this a loan?")
+                with st.container():
+                    col1, col2 = st.columns([1, 1])
+                    with col1:
+                        if st.button("Yes", key="summer_loan_yes"):
+                            if st.session_state.checklist["summer"]["loans"] < summer_loan_max:
+                                if st.session_state["summer_signing_category"] == "starting" and st.session_state.checklist["summer"]["starting_signings"] < summer_starting_total_max:
+                                    record_transfer("summer", "starting", loan=True, **summer_signing_details)
+                                elif st.session_state["summer_signing_category"] == "bench" and st.session_state.checklist["summer"]["bench_signings"] < summer_bench_total_max:
+                                    record_transfer("summer", "bench", loan=True, **summer_signing_details)
+                                elif st.session_state["summer_signing_category"] == "reserve" and st.session_state.checklist["summer"]["reserve_signings"] < summer_reserve_max:
+                                    record_transfer("summer", "reserve", loan=True, **summer_signing_details)
+                                else:
+                                    st.error(f"Exceeded {st.session_state['summer_signing_category']} signings limit!")
+                            else:
+                                st.error("Exceeded loan limit!")
+                            st.session_state.pop("summer_signing_category", None)
+                            st.session_state.pop("summer_loan_mode", None)
+                            rerun()
+                    with col2:
+                        if st.button("No", key="summer_loan_no"):
                             if st.session_state["summer_signing_category"] == "starting" and st.session_state.checklist["summer"]["starting_signings"] < summer_starting_total_max:
-                                st.session_state.checklist["summer"]["starting_signings"] += 1
-                                st.session_state.checklist["summer"]["loans"] += 1
+                                record_transfer("summer", "starting", **summer_signing_details)
                             elif st.session_state["summer_signing_category"] == "bench" and st.session_state.checklist["summer"]["bench_signings"] < summer_bench_total_max:
-                                st.session_state.checklist["summer"]["bench_signings"] += 1
-                                st.session_state.checklist["summer"]["loans"] += 1
+                                record_transfer("summer", "bench", **summer_signing_details)
                             elif st.session_state["summer_signing_category"] == "reserve" and st.session_state.checklist["summer"]["reserve_signings"] < summer_reserve_max:
-                                st.session_state.checklist["summer"]["reserve_signings"] += 1
-                                st.session_state.checklist["summer"]["loans"] += 1
+                                record_transfer("summer", "reserve", **summer_signing_details)
                             else:
                                 st.error(f"Exceeded {st.session_state['summer_signing_category']} signings limit!")
-                        else:
-                            st.error("Exceeded loan limit!")
-                        st.session_state.pop("summer_signing_category", None)
-                        st.session_state.pop("summer_loan_mode", None)
-                        st.rerun()
-                with col2:
-                    if st.button("No", key="summer_loan_no"):
-                        if st.session_state["summer_signing_category"] == "starting" and st.session_state.checklist["summer"]["starting_signings"] < summer_starting_total_max:
-                            st.session_state.checklist["summer"]["starting_signings"] += 1
-                        elif st.session_state["summer_signing_category"] == "bench" and st.session_state.checklist["summer"]["bench_signings"] < summer_bench_total_max:
-                            st.session_state.checklist["summer"]["bench_signings"] += 1
-                        elif st.session_state["summer_signing_category"] == "reserve" and st.session_state.checklist["summer"]["reserve_signings"] < summer_reserve_max:
-                            st.session_state.checklist["summer"]["reserve_signings"] += 1
-                        else:
-                            st.error(f"Exceeded {st.session_state['summer_signing_category']} signings limit!")
-                        st.session_state.pop("summer_signing_category", None)
-                        st.session_state.pop("summer_loan_mode", None)
-                        st.rerun()
-
-        # Starting Players Sold
-        st.markdown('<div class="checklist-section"><strong>Starting Players Sold (Unlocks Extra Signing at 2)</strong></div>', unsafe_allow_html=True)
-        if st.button("Add Sold Player", key="summer_sale_add"):
-            st.session_state.checklist["summer"]["starting_sold"] += 1
-            st.rerun()
-        if st.session_state.checklist["summer"]["starting_sold"] > 0:
-            if st.button("Remove Sold Player", key="summer_sale_remove"):
-                st.session_state.checklist["summer"]["starting_sold"] -= 1
-                st.rerun()
-
-    # Winter Window
-    with st.expander("Winter Window", expanded=False):
-        st.subheader("Winter Window Guidelines")
-        
-        # Tally display as a table
-        winter_starting_max = 1
-        winter_bench_max = 1
-        winter_reserve_max = 2
-        winter_loan_max = 1
-        winter_starting_extra = 1 if st.session_state.checklist["winter"]["starting_sold"] >= 2 else 0
-        winter_starting_total_max = winter_starting_max + winter_starting_extra
-        winter_bench_total_max = winter_bench_max + winter_starting_extra
-        st.markdown(
-            """
-            <table style="width:100%; border-collapse: collapse; margin-bottom: 1rem;">
-                <tr style="background-color: #2c3e50; color: white;">
-                    <th>Category</th>
-                    <th>Current Count</th>
-                    <th>Max Limit</th>
-                </tr>
-                <tr style="background-color: #34495e; color: white;">
-                    <td>First Team Signings</td>
-                    <td>{}</td>
-                    <td>{}</td>
-                </tr>
-                <tr style="background-color: #34495e; color: white;">
-                    <td>Bench Signings</td>
-                    <td>{}</td>
-                    <td>{}</td>
-                </tr>
-                <tr style="background-color: #34495e; color: white;">
-                    <td>Reserve Signings</td>
-                    <td>{}</td>
-                    <td>{}</td>
-                </tr>
-                <tr style="background-color: #34495e; color: white;">
-                    <td>Loans</td>
-                    <td>{}</td>
-                    <td>{}</td>
-                </tr>
-                <tr style="background-color: #34495e; color: white;">
-                    <td>Starting Players Sold</td>
-                    <td>{}</td>
-                    <td>-</td>
-                </tr>
-            </table>
-            """.format(
-                st.session_state.checklist["winter"]["starting_signings"],
-                winter_starting_total_max,
-                st.session_state.checklist["winter"]["bench_signings"],
-                winter_bench_total_max,
-                st.session_state.checklist["winter"]["reserve_signings"],
-                winter_reserve_max,
-                st.session_state.checklist["winter"]["loans"],
-                winter_loan_max,
-                st.session_state.checklist["winter"]["starting_sold"]
-            ),
-            unsafe_allow_html=True
-        )
-        if winter_starting_extra:
-            st.markdown("*Extra signing unlocked (2 starting players sold)!*")
-
-        # Signing question and category buttons
-        if st.button("Did you make a signing?", key="winter_signing_question"):
-            st.session_state["winter_signing_mode"] = True
-            st.rerun()
-        if st.session_state.get("winter_signing_mode", False):
+                            st.session_state.pop("summer_signing_category", None)
+                            st.session_state.pop("summer_loan_mode", None)
+                            rerun()
+
+            # Starting Players Sold
+            st.markdown('<div class="checklist-section"><strong>Starting Players Sold (Unlocks Extra Signing at 2)</strong></div>', unsafe_allow_html=True)
             with st.container():
-                col1, col2, col3 = st.columns([1, 1, 1])
+                col1, col2 = st.columns([2, 1])
                 with col1:
-                    if st.button("First Team Player", key="winter_starting_add"):
-                        st.session_state["winter_signing_category"] = "starting"
-                        st.session_state["winter_loan_mode"] = True
-                        st.session_state["winter_signing_mode"] = False
-                        st.rerun()
+                    summer_sale_player = st.text_input("Sold Player Name (Optional)", key="summer_sale_player")
                 with col2:
-                    if st.button("Bench Player", key="winter_bench_add"):
-                        st.session_state["winter_signing_category"] = "bench"
-                        st.session_state["winter_loan_mode"] = True
-                        st.session_state["winter_signing_mode"] = False
-                        st.rerun()
-                with col3:
-                    if st.button("Reserve Player", key="winter_reserve_add"):
-                        st.session_state["winter_signing_category"] = "reserve"
-                        st.session_state["winter_loan_mode"] = True
-                        st.session_state["winter_signing_mode"] = False
-                        st.rerun()
-        if st.session_state.get("winter_loan_mode", False):
-            st.write("Is this a loan?")
-            with st.container():
-                col1, col2 = st.columns([1, 1])
-                with col1:
-                    if st.button("Yes", key="winter_loan_yes"):
-                        if st.session_state.checklist["winter"]["loans"] < winter_loan_max:
+                    summer_sale_fee = st.number_input("Sale Fee", min_value=0.0, step=1000.0, format="%.2f", key="summer_sale_fee")
+            if st.button("Add Sold Player", key="summer_sale_add"):
+                record_transfer("summer", "sold", player=summer_sale_player, fee=summer_sale_fee)
+                rerun()
+            if st.session_state.checklist["summer"]["starting_sold"] > 0:
+                if st.button("Remove Sold Player", key="summer_sale_remove"):
+                    reverse_transfer("summer", "sold")
+                    rerun()
+
+        # Winter Window
+        with st.expander("Winter Window", expanded=False):
+            st.subheader("Winter Window Guidelines")
+        
+            # Tally display as a table
+            winter_starting_max = WINDOW_LIMITS["winter"]["starting_signings"]
+            winter_bench_max = WINDOW_LIMITS["winter"]["bench_signings"]
+            winter_reserve_max = WINDOW_LIMITS["winter"]["reserve_signings"]
+            winter_loan_max = WINDOW_LIMITS["winter"]["loans"]
+            winter_starting_extra = 1 if st.session_state.checklist["winter"]["starting_sold"] >= 2 else 0
+            winter_starting_total_max = winter_starting_max + winter_starting_extra
+            winter_bench_total_max = winter_bench_max + winter_starting_extra
+            st.markdown(
+                window_tally(
+                    st.session_state.checklist["winter"], winter_starting_total_max, winter_bench_total_max, winter_reserve_max, winter_loan_max
+                ),
+                unsafe_allow_html=True
+            )
+            if winter_starting_extra:
+                st.markdown("*Extra signing unlocked (2 starting players sold)!*")
+
+            # Signing question and category buttons
+            if st.button("Did you make a signing?", key="winter_signing_question"):
+                st.session_state["winter_signing_mode"] = True
+                rerun()
+            if st.session_state.get("winter_signing_mode", False):
+                with st.container():
+                    col1, col2, col3 = st.columns([1, 1, 1])
+                    with col1:
+                        if st.button("First Team Player", key="winter_starting_add"):
+                            st.session_state["winter_signing_category"] = "starting"
+                            st.session_state["winter_loan_mode"] = True
+                            st.session_state["winter_signing_mode"] = False
+                            rerun()
+                    with col2:
+                        if st.button("Bench Player", key="winter_bench_add"):
+                            st.session_state["winter_signing_category"] = "bench"
+                            st.session_state["winter_loan_mode"] = True
+                            st.session_state["winter_signing_mode"] = False
+                            rerun()
+                    with col3:
+                        if st.button("Reserve Player", key="winter_reserve_add"):
+                            st.session_state["winter_signing_category"] = "reserve"
+                            st.session_state["winter_loan_mode"] = True
+                            st.session_state["winter_signing_mode"] = False
+                            rerun()
+            if st.session_state.get("winter_loan_mode", False):
+                with st.container():
+                    col1, col2, col3 = st.columns([2, 1, 1])
+                    with col1:
+                        winter_signing_player = st.text_input("Player Name (Optional)", key="winter_signing_player")
+                    with col2:
+                        winter_signing_fee = st.number_input("Fee", min_value=0.0, step=1000.0, format="%.2f", key="winter_signing_fee")
+                    with col3:
+                        winter_signing_wage = st.number_input("Wage (p/w)", min_value=0, step=1000, format="%d", key="winter_signing_wage")
+                winter_signing_details = {"player": winter_signing_player, "fee": winter_signing_fee, "wage": winter_signing_wage}
+                st.write("Is this a loan?")
+                with st.container():
+                    col1, col2 = st.columns([1, 1])
+                    with col1:
+                        if st.button("Yes", key="winter_loan_yes"):
+                            if st.session_state.checklist["winter"]["loans"] < winter_loan_max:
+                                if st.session_state["winter_signing_category"] == "starting" and st.session_state.checklist["winter"]["starting_signings"] < winter_starting_total_max:
+                                    record_transfer("winter", "starting", loan=True, **winter_signing_details)
+                                elif st.session_state["winter_signing_category"] == "bench" and st.session_state.checklist["winter"]["bench_signings"] < winter_bench_total_max:
+                                    record_transfer("winter", "bench", loan=True, **winter_signing_details)
+                                elif st.session_state["winter_signing_category"] == "reserve" and st.session_state.checklist["winter"]["reserve_signings"] < winter_reserve_max:
+                                    record_transfer("winter", "reserve", loan=True, **winter_signing_details)
+                                else:
+                                    st.error(f"Exceeded {st.session_state['winter_signing_category']} signings limit!")
+                            else:
+                                st.error("Exceeded loan limit!")
+                            st.session_state.pop("winter_signing_category", None)
+                            st.session_state.pop("winter_loan_mode", None)
+                            rerun()
+                    with col2:
+                        if st.button("No", key="winter_loan_no"):
                             if st.session_state["winter_signing_category"] == "starting" and st.session_state.checklist["winter"]["starting_signings"] < winter_starting_total_max:
-                                st.session_state.checklist["winter"]["starting_signings"] += 1
-                                st.session_state.checklist["winter"]["loans"] += 1
+                                record_transfer("winter", "starting", **winter_signing_details)
                             elif st.session_state["winter_signing_category"] == "bench" and st.session_state.checklist["winter"]["bench_signings"] < winter_bench_total_max:
-                                st.session_state.checklist["winter"]["bench_signings"] += 1
-                                st.session_state.checklist["winter"]["loans"] += 1
+                                record_transfer("winter", "bench", **winter_signing_details)
                             elif st.session_state["winter_signing_category"] == "reserve" and st.session_state.checklist["winter"]["reserve_signings"] < winter_reserve_max:
-                                st.session_state.checklist["winter"]["reserve_signings"] += 1
-                                st.session_state.checklist["winter"]["loans"] += 1
+                                record_transfer("winter", "reserve", **winter_signing_details)
                             else:
                                 st.error(f"Exceeded {st.session_state['winter_signing_category']} signings limit!")
-                        else:
-                            st.error("Exceeded loan limit!")
-                        st.session_state.pop("winter_signing_category", None)
-                        st.session_state.pop("winter_loan_mode", None)
-                        st.rerun()
+                            st.session_state.pop("winter_signing_category", None)
+                            st.session_state.pop("winter_loan_mode", None)
+                            rerun()
+
+            # Starting Players Sold
+            st.markdown('<div class="checklist-section"><strong>Starting Players Sold (Unlocks Extra Signing at 2)</strong></div>', unsafe_allow_html=True)
+            with st.container():
+                col1, col2 = st.columns([2, 1])
+                with col1:
+                    winter_sale_player = st.text_input("Sold Player Name (Optional)", key="winter_sale_player")
                 with col2:
-                    if st.button("No", key="winter_loan_no"):
-                        if st.session_state["winter_signing_category"] == "starting" and st.session_state.checklist["winter"]["starting_signings"] < winter_starting_total_max:
-                            st.session_state.checklist["winter"]["starting_signings"] += 1
-                        elif st.session_state["winter_signing_category"] == "bench" and st.session_state.checklist["winter"]["bench_signings"] < winter_bench_total_max:
-                            st.session_state.checklist["winter"]["bench_signings"] += 1
-                        elif st.session_state["winter_signing_category"] == "reserve" and st.session_state.checklist["winter"]["reserve_signings"] < winter_reserve_max:
-                            st.session_state.checklist["winter"]["reserve_signings"] += 1
-                        else:
-                            st.error(f"Exceeded {st.session_state['winter_signing_category']} signings limit!")
-                        st.session_state.pop("winter_signing_category", None)
-                        st.session_state.pop("winter_loan_mode", None)
-                        st.rerun()
-
-        # Starting Players Sold
-        st.markdown('<div class="checklist-section"><strong>Starting Players Sold (Unlocks Extra Signing at 2)</strong></div>', unsafe_allow_html=True)
-        if st.button("Add Sold Player", key="winter_sale_add"):
-            st.session_state.checklist["winter"]["starting_sold"] += 1
-            st.rerun()
-        if st.session_state.checklist["winter"]["starting_sold"] > 0:
-            if st.button("Remove Sold Player", key="winter_sale_remove"):
-                st.session_state.checklist["winter"]["starting_sold"] -= 1
-                st.rerun()
-
-    # Youth Academy
-    with st.expander("Youth Academy", expanded=False):
-        st.subheader("Youth Academy Guidelines")
-        st.write("A total of 3 players can be promoted to the senior team.")
+                    winter_sale_fee = st.number_input("Sale Fee", min_value=0.0, step=1000.0, format="%.2f", key="winter_sale_fee")
+            if st.button("Add Sold Player", key="winter_sale_add"):
+                record_transfer("winter", "sold", player=winter_sale_player, fee=winter_sale_fee)
+                rerun()
+            if st.session_state.checklist["winter"]["starting_sold"] > 0:
+                if st.button("Remove Sold Player", key="winter_sale_remove"):
+                    reverse_transfer("winter", "sold")
+                    rerun()
+
+        # Youth Academy
+        with st.expander("Youth Academy", expanded=False):
+            st.subheader("Youth Academy Guidelines")
+            st.write("A total of 3 players can be promoted to the senior team.")
         
-        # Tally display as a table
-        youth_promotion_max = 3
-        st.markdown(
-            """
-            <table style="width:100%; border-collapse: collapse; margin-bottom: 1rem;">
-                <tr style="background-color: #2c3e50; color: white;">
-                    <th>Category</th>
-                    <th>Current Count</th>
-                    <th>Max Limit</th>
-                </tr>
-                <tr style="background-color: #34495e; color: white;">
-                    <td>Youth Promotions</td>
-                    <td>{}</td>
-                    <td>{}</td>
-                </tr>
-            </table>
-            """.format(
-                st.session_state.checklist["youth_promotions"],
-                youth_promotion_max
-            ),
-            unsafe_allow_html=True
-        )
+            # Tally display as a table
+            youth_promotion_max = YOUTH_PROMOTION_MAX
+            st.markdown(
+                tally_table((("Youth Promotions", st.session_state.checklist["youth_promotions"], youth_promotion_max),)),
+                unsafe_allow_html=True
+            )
         
-        # Promotion button
-        if st.button("I promoted a youth player", key="youth_promotion_add"):
-            if st.session_state.checklist["youth_promotions"] < youth_promotion_max:
-                st.session_state.checklist["youth_promotions"] += 1
-                st.rerun()
+            # Promotion button
+            if st.button("I promoted a youth player", key="youth_promotion_add"):
+                if st.session_state.checklist["youth_promotions"] < youth_promotion_max:
+                    record_transfer("season", "youth")
+                    rerun()
+                else:
+                    st.error("Exceeded youth promotion limit of 3!")
+            if st.session_state.checklist["youth_promotions"] > 0:
+                if st.button("Remove Youth Promotion", key="youth_promotion_remove"):
+                    reverse_transfer("season", "youth")
+                    rerun()
+
+        # Transfer History
+        with st.expander("Transfer History", expanded=False):
+            season_entries = st.session_state.ledger.entries(season=st.session_state.season)
+            if season_entries:
+                st.dataframe([
+                    {
+                        "Window": entry["window"].capitalize(),
+                        "Type": "Youth Promotion" if entry["category"] == "youth" else (
+                            "Sale" if entry["category"] == "sold" else f"{entry['category'].capitalize()} Signing"
+                        ),
+                        "Player": entry["player"] or "-",
+                        "Fee": f"{entry['fee']:,.0f}",
+                        "Wage (p/w)": f"{entry['wage']:,}",
+                        "Loan": "Yes" if entry["loan"] else "No"
+                    }
+                    for entry in season_entries
+                ])
             else:
-                st.error("Exceeded youth promotion limit of 3!")
-        if st.session_state.checklist["youth_promotions"] > 0:
-            if st.button("Remove Youth Promotion", key="youth_promotion_remove"):
-                st.session_state.checklist["youth_promotions"] -= 1
-                st.rerun()
+                st.write("No transfers recorded this season.")
+            season_totals = st.session_state.ledger.season_totals()
+            if season_totals:
+                st.subheader("Net Spend per Season")
+                st.dataframe([
+                    {
+                        "Season": season,
+                        "Spend": f"{totals['spend']:,.0f}",
+                        "Income": f"{totals['income']:,.0f}",
+                        "Net Spend": f"{totals['net_spend']:,.0f}"
+                    }
+                    for season, totals in season_totals.items()
+                ])
 
 # Tab 3: Starting 11
 with tab3:
-    st.header("Starting 11 Calculator")
-    st.write("Enter your starting 11 to calculate team average overall and wage cap. Use the Save/Load tab to save your data.")
+    if tab3.open:
+        init_session_state("starting_11", "average_team_overall")
+        st.header("Starting 11 Calculator")
+        st.write("Enter your starting 11 to calculate team average overall and wage cap. Use the Save/Load tab to save your data.")
     
-    # Progress indicator for starting 11
-    valid_players = sum(1 for player in st.session_state.starting_11 if player["overall"] > 0) / 11
-    starting_11_progress_percentage = int(valid_players * 100)
-    starting_11_progress_color = "#28a745" if valid_players == 1 else "#3498db"
-    st.markdown(
-        f"""
-        <div style="margin-bottom: 5px;">Starting 11 Completion: {starting_11_progress_percentage}%</div>
-        <div class="custom-progress-container">
-            <div class="custom-progress-bar" style="width: {starting_11_progress_percentage}%; background-color: {starting_11_progress_color};"></div>
-        </div>
-        """,
-        unsafe_allow_html=True
-    )
+        # Progress indicator for starting 11
+        valid_players = sum(1 for player in st.session_state.starting_11 if player["overall"] > 0) / 11
+        st.markdown(progress_bar("Starting 11 Completion", int(valid_players * 100)), unsafe_allow_html=True)
     
-    with st.expander("Enter Starting 11 Details", expanded=True):
-        with st.form(key="starting_11_form"):
-            players = []
-            for i in range(11):
-                with st.container():
-                    col1, col2, col3 = st.columns([1, 1, 1])
-                    with col1:
-                        st.markdown(f"**Player {i+1} Position**")
-                        position = st.selectbox(
-                            f"Player {i+1} Position",
-                            player_positions,
-                            index=player_positions.index(st.session_state.starting_11[i]["position"]),
-                            key=f"player_{i}_position",
-                            label_visibility="collapsed"
-                        )
-                    with col2:
-                        st.markdown(f"**Player {i+1} Overall**")
-                        overall = st.number_input(
-                            f"Player {i+1} Overall",
-                            min_value=0,
-                            max_value=99,
-                            value=st.session_state.starting_11[i]["overall"],
-                            step=1,
-                            format="%d",
-                            key=f"player_{i}_overall",
-                            label_visibility="collapsed"
-                        )
-                    with col3:
-                        st.markdown(f"**Player {i+1} Wage (p/w)**")
-                        wage = st.number_input(
-                            f"Player {i+1} Wage",
-                            min_value=0,
-                            value=st.session_state.starting_11[i]["wage"],
-                            step=1000,
-                            format="%d",
-                            key=f"player_{i}_wage",
-                            label_visibility="collapsed"
-                        )
-                    players.append({"position": position, "overall": overall, "wage": wage})
+        with st.expander("Enter Starting 11 Details", expanded=True):
+            with st.form(key="starting_11_form"):
+                players = []
+                for i in range(11):
+                    with st.container():
+                        col1, col2, col3 = st.columns([1, 1, 1])
+                        with col1:
+                            st.markdown(f"**Player {i+1} Position**")
+                            position = st.selectbox(
+                                f"Player {i+1} Position",
+                                player_positions,
+                                index=option_index(player_positions, st.session_state.starting_11[i]["position"]),
+                                key=f"player_{i}_position",
+                                label_visibility="collapsed"
+                            )
+                        with col2:
+                            st.markdown(f"**Player {i+1} Overall**")
+                            overall = st.number_input(
+                                f"Player {i+1} Overall",
+                                min_value=0,
+                                max_value=99,
+                                value=st.session_state.starting_11[i]["overall"],
+                                step=1,
+                                format="%d",
+                                key=f"player_{i}_overall",
+                                label_visibility="collapsed"
+                            )
+                        with col3:
+                            st.markdown(f"**Player {i+1} Wage (p/w)**")
+                            wage = st.number_input(
+                                f"Player {i+1} Wage",
+                                min_value=0,
+                                value=st.session_state.starting_11[i]["wage"],
+                                step=1000,
+                                format="%d",
+                                key=f"player_{i}_wage",
+                                label_visibility="collapsed"
+                            )
+                        players.append({"position": position, "overall": overall, "wage": wage})
             
-            submit_starting_11 = st.form_submit_button("Calculate Team Overall")
+                submit_starting_11 = st.form_submit_button("Calculate Team Overall")
     
-    if submit_starting_11:
-        if all(player["overall"] >= 0 and player["wage"] >= 0 for player in players):
-            st.session_state.starting_11 = players
-            total_overall = sum(player["overall"] for player in players)
-            average_overall = math.floor(total_overall / 11)
-            st.session_state.average_team_overall = average_overall
-            max_signing_overall = average_overall + 2
-            max_wage = max(player["wage"] for player in players)
-            wage_cap = int(max_wage * 1.2)
-            st.success(f"Average Team Overall: {average_overall}")
-            st.success(f"Sign players with overall {max_signing_overall} or below.")
-            st.success(f"Wage Cap: {wage_cap:,} p/w")
-        else:
-            st.error("All player overalls and wages must be non-negative.")
+        if submit_starting_11:
+            calculator_started = time.perf_counter()
+            if all(player["overall"] >= 0 and player["wage"] >= 0 for player in players):
+                st.session_state.starting_11 = players
+                total_overall = sum(player["overall"] for player in players)
+                average_overall = math.floor(total_overall / 11)
+                st.session_state.average_team_overall = average_overall
+                max_signing_overall = average_overall + 2
+                max_wage = max(player["wage"] for player in players)
+                wage_cap = int(max_wage * 1.2)
+                st.success(f"Average Team Overall: {average_overall}")
+                st.success(f"Sign players with overall {max_signing_overall} or below.")
+                st.success(f"Wage Cap: {wage_cap:,} p/w")
+            else:
+                st.error("All player overalls and wages must be non-negative.")
+            record_event("calculator", duration=time.perf_counter() - calculator_started, calculator="starting_11")
+
+        # Bulk import from a pasted table or CSV
+        with st.expander("Bulk Import", expanded=False):
+            from squad_import import parse_players
+
+            st.write(
+                "Paste rows of Position, Overall and Wage (e.g. copied from a spreadsheet) or upload a CSV. "
+                "The first 11 rows become your Starting 11."
+            )
+            with st.form(key="bulk_import_form"):
+                bulk_text = st.text_area("Paste Players", height=200, key="bulk_import_text", placeholder="Position\tOverall\tWage\nGK\t78\t25000")
+                bulk_file = st.file_uploader("Or Upload CSV", type=["csv", "txt", "tsv"], key="bulk_import_csv")
+                bulk_to_squad = st.checkbox("Import rows after the first 11 into the squad", value=True, key="bulk_import_squad")
+                submit_bulk_import = st.form_submit_button("Import Players")
+
+            if submit_bulk_import:
+                try:
+                    bulk_source = bulk_file.getvalue().decode("utf-8-sig") if bulk_file is not None else bulk_text
+                except UnicodeDecodeError:
+                    bulk_source = None
+                    st.error("Uploaded file must be UTF-8 text.")
+                if bulk_source is not None and not bulk_source.strip():
+                    st.warning("Please paste players or upload a CSV to import.")
+                elif bulk_source is not None:
+                    try:
+                        imported, import_errors = parse_players(bulk_source, player_positions)
+                    except ValueError as e:
+                        st.error(f"Could not read the table: {str(e)}")
+                    else:
+                        if import_errors:
+                            st.error(f"Nothing imported: {len(import_errors)} problem(s) found.")
+                            st.dataframe([{"Line": line, "Problem": message} for line, message in import_errors])
+                        elif len(imported) < 11:
+                            st.error(f"Need at least 11 players for the Starting 11; found {len(imported)}.")
+                        else:
+                            st.session_state.starting_11 = imported[:11]
+                            total_overall = sum(player["overall"] for player in imported[:11])
+                            st.session_state.average_team_overall = math.floor(total_overall / 11)
+                            if bulk_to_squad and len(imported) > 11:
+                                init_session_state("squad")
+                                st.session_state.squad = imported[11:]
+                                st.session_state.pop("squad_editor", None)
+                            for i in range(11):
+                                for field in ["position", "overall", "wage"]:
+                                    st.session_state.pop(f"player_{i}_{field}", None)
+                            rerun()
+
+        # Squad wage structure planner
+        with st.expander("Squad Wage Planner", expanded=False):
+            import pandas as pd
+            from wages import WagePlanner
+
+            init_session_state("squad")
+            st.write(
+                "Add the rest of your squad to see every player's proportional wage, "
+                "the projected wage bill and the headroom under the Starting 11 wage cap."
+            )
+            squad_df = st.data_editor(
+                pd.DataFrame(st.session_state.squad, columns=["position", "overall", "wage"]),
+                num_rows="dynamic",
+                column_config={
+                    "position": st.column_config.SelectboxColumn("Position", options=player_positions, required=True),
+                    "overall": st.column_config.NumberColumn("Overall", min_value=0, max_value=99, step=1, required=True),
+                    "wage": st.column_config.NumberColumn("Wage (p/w)", min_value=0, step=1000, required=True)
+                },
+                key="squad_editor"
+            )
+            squad = [
+                {"position": row["position"], "overall": int(row["overall"]), "wage": int(row["wage"])}
+                for row in squad_df.dropna().to_dict("records")
+            ]
+            st.session_state.squad = squad
+
+            # The planner lives in session state and only reprices what changed
+            squad_players = st.session_state.starting_11 + squad
+            if "wage_planner" not in st.session_state:
+                st.session_state.wage_planner = WagePlanner(squad_players)
+            else:
+                st.session_state.wage_planner.sync(squad_players)
+            planner = st.session_state.wage_planner
+
+            if planner.proportional is None:
+                st.warning("Calculate your Starting 11 with non-zero overalls and wages to plan the wage structure.")
+            else:
+                st.dataframe(planner.rows())
+                col1, col2, col3 = st.columns([1, 1, 1])
+                col1.metric("Current Wage Bill", f"{planner.wage_bill:,} p/w")
+                col2.metric(
+                    "Projected Wage Bill",
+                    f"{planner.projected_wage_bill:,} p/w",
+                    delta=f"{planner.projected_wage_bill - planner.wage_bill:,}",
+                    delta_color="inverse"
+                )
+                col3.metric("Wage Cap", f"{planner.wage_cap:,} p/w")
+                over_cap = int((planner.headroom < 0).sum())
+                if over_cap:
+                    st.warning(f"{over_cap} player(s) would be paid above the wage cap.")
+
+        # Best XI selector over the Starting 11 and squad
+        with st.expander("Best XI Selector", expanded=False):
+            from lineup import FORMATIONS, best_lineup
+
+            init_session_state("squad")
+            st.write(
+                "Pick the Starting 11 with the highest average overall from your Starting 11 and squad. "
+                "Players only fill slots their position suits."
+            )
+            with st.form(key="best_xi_form"):
+                formation_name = st.selectbox("Formation", list(FORMATIONS.keys()), key="best_xi_formation")
+                exact_positions = st.checkbox("Exact positions only", key="best_xi_exact")
+                minimise_wages = st.checkbox("Prefer lower wages between equally strong line-ups", key="best_xi_wages")
+                submit_best_xi = st.form_submit_button("Find Best XI")
+
+            if submit_best_xi:
+                calculator_started = time.perf_counter()
+                formation = FORMATIONS[formation_name]
+                pool = st.session_state.starting_11 + st.session_state.squad
+                selection = best_lineup(pool, formation, exact_positions, minimise_wages)
+                if None in selection:
+                    st.error(f"Not enough players to fill {selection.count(None)} slot(s) of the {formation_name}. Add players to your squad.")
+                else:
+                    best_xi = [pool[index] for index in selection]
+                    best_average = math.floor(sum(player["overall"] for player in best_xi) / 11)
+                    # Keep the pool solved against so a later squad edit cannot shift the picks
+                    st.session_state.best_xi = {
+                        "formation": formation_name, "selection": selection, "pool": [dict(player) for player in pool]
+                    }
+                    st.dataframe([
+                        {"Slot": slot, "Position": player["position"], "Overall": player["overall"], "Wage (p/w)": f"{player['wage']:,}"}
+                        for slot, player in zip(formation, best_xi)
+                    ])
+                    st.success(f"Best XI Average Overall: {best_average} (sign players with overall {best_average + 2} or below).")
+                    st.success(f"Best XI Wage Bill: {sum(player['wage'] for player in best_xi):,} p/w")
+                record_event("calculator", duration=time.perf_counter() - calculator_started, calculator="best_xi")
+
+            best_xi = st.session_state.get("best_xi")
+            if best_xi and best_xi["pool"] != st.session_state.starting_11 + st.session_state.squad:
+                st.session_state.pop("best_xi")
+                st.info("Your Starting 11 or squad changed since the Best XI was found. Find the Best XI again to use it.")
+            elif best_xi:
+                if st.button("Use Best XI as Starting 11", key="apply_best_xi"):
+                    pool = st.session_state.pop("best_xi")["pool"]
+                    selection = best_xi["selection"]
+                    st.session_state.starting_11 = [pool[index] for index in selection]
+                    st.session_state.squad = [
+                        player for index, player in enumerate(pool)
+                        if index not in selection and player["overall"] > 0
+                    ]
+                    total_overall = sum(player["overall"] for player in st.session_state.starting_11)
+                    st.session_state.average_team_overall = math.floor(total_overall / 11)
+                    for i in range(11):
+                        for field in ["position", "overall", "wage"]:
+                            st.session_state.pop(f"player_{i}_{field}", None)
+                    st.session_state.pop("squad_editor", None)
+                    rerun()
 
 # Tab 4: Transfer Calculators
 with tab4:
-    st.header("Transfer Calculators")
-    
-    # Selling Transfer Calculator
-    with st.expander("Selling Transfer Calculator", expanded=False):
-        with st.form(key="selling_transfer_form"):
-            st.subheader("Offering Club Details")
-            club2_name_sell = st.text_input("Offering Club Name (Optional)", key="club2_name_sell")
-            club2_league_sell = st.selectbox("Offering Club League", list(league_tiers.keys()), key="club2_league_sell")
-            club2_country_sell = st.selectbox("Offering Club Country", list(country_prestige.keys()), key="club2_country_sell")
-            club2_european_sell = st.checkbox("Offering Club in European Competitions", key="club2_european_sell")
-            
-            st.subheader("Transfer Details")
-            player_value_sell = st.number_input(
-                "Player Value",
-                min_value=0.0,
-                step=1000.0,
-                format="%.2f",
-                key="player_value_sell",
-                help="Enter value without commas, e.g., 1000000"
-            )
-            is_young_sell = st.checkbox("Player Aged 16-21", key="is_young_sell")
-            submit_selling_transfer = st.form_submit_button("Calculate Selling Offer")
-        
-        if submit_selling_transfer:
-            if player_value_sell > 0:
+    if tab4.open:
+        init_session_state("club_details", "starting_11", "average_team_overall", "live_calculators")
+        st.header("Transfer Calculators")
+
+        # Live mode: the selling and buying calculators recalculate as inputs
+        # change, rerunning only the calculator rather than the whole app
+        def toggle_live_calculators():
+            st.session_state.live_calculators = st.session_state.live_calculators_toggle
+        st.toggle(
+            "Live Mode",
+            value=st.session_state.live_calculators,
+            key="live_calculators_toggle",
+            on_change=toggle_live_calculators,
+            help="Update the selling and buying results as you edit, without pressing a button."
+        )
+        if st.session_state.live_calculators:
+            from live_calculator import LiveResults, buying_result, career_version, selling_result
+
+            if "live_results" not in st.session_state:
+                st.session_state.live_results = LiveResults()
+
+            @st.fragment
+            def live_selling_calculator():
+                # Fragment runs skip the top of the script, so restore and mark the session active here
+                resume_session()
+                st.subheader("Offering Club Details")
+                club2_name_sell = st.text_input("Offering Club Name (Optional)", key="club2_name_sell")
+                club2_league_sell = st.selectbox("Offering Club League", list(league_tiers.keys()), key="club2_league_sell")
+                club2_country_sell = st.selectbox("Offering Club Country", list(country_prestige.keys()), key="club2_country_sell")
+                club2_european_sell = st.checkbox("Offering Club in European Competitions", key="club2_european_sell")
+                st.subheader("Transfer Details")
+                player_value_sell = st.number_input(
+                    "Player Value",
+                    min_value=0.0,
+                    step=1000.0,
+                    format="%.2f",
+                    key="player_value_sell",
+                    help="Enter value without commas, e.g., 1000000"
+                )
+                is_young_sell = st.checkbox("Player Aged 16-21", key="is_young_sell")
+                if player_value_sell <= 0:
+                    st.info("Enter the player's value to see the minimum offer.")
+                    return
+                calculator_started = time.perf_counter()
                 club_details = st.session_state.club_details
-                score1 = calculate_score(club_details["league"], club_details["country"], club_details["european"], league_tiers)
-                score2 = calculate_score(club2_league_sell, club2_country_sell, club2_european_sell, league_tiers)
-                stature_diff = score2 - score1
+                (score1, score2, minimum_offer), reused = st.session_state.live_results.get(
+                    (
+                        "selling", club2_league_sell, club2_country_sell, club2_european_sell, player_value_sell, is_young_sell,
+                        career_version(club_details, st.session_state.average_team_overall, st.session_state.starting_11)
+                    ),
+                    lambda: selling_result(club_details, club2_league_sell, club2_country_sell, club2_european_sell, player_value_sell, is_young_sell)
+                )
                 display_name1 = club_details["name"] if club_details["name"] else "Your Club"
                 display_name2 = club2_name_sell if club2_name_sell else "Offering Club"
-                st.write(f"**{display_name1}**: {club_details['league']}, {club_details['country']}, European: {club_details['european']}")
-                st.write(f"**Stature Score**: {score1:.1f}")
-                st.write(f"**{display_name2}**: {club2_league_sell}, {club2_country_sell}, European: {club2_european_sell}")
-                st.write(f"**Stature Score**: {score2:.1f}")
-                if score1 > score2:
-                    st.success(f"{display_name1} has higher stature by {score1 - score2:.1f}.")
-                elif score2 > score1:
-                    st.warning(f"{display_name2} has higher stature by {score2 - score1:.1f}.")
-                else:
-                    st.info("Clubs have equal stature.")
-                minimum_offer = calculate_minimum_offer(player_value_sell, stature_diff, is_young_sell)
-                minimum_offer = math.ceil(minimum_offer / 1000) * 1000
+                st.write(f"**{display_name1}** Stature Score: {score1:.1f}. **{display_name2}** Stature Score: {score2:.1f}.")
                 st.success(f"Accept offers from {display_name2} of {minimum_offer:,.0f} or higher.")
-            else:
-                st.error("Player value must be greater than 0.")
-
-    # Buying Transfer Calculator
-    with st.expander("Buying Transfer Calculator", expanded=False):
-        with st.form(key="buying_transfer_form"):
-            st.subheader("Player Details")
-            player_value_buy = st.number_input(
-                "Player Value",
-                min_value=0.0,
-                step=1000.0,
-                format="%.2f",
-                key="player_value_buy",
-                help="Enter value without commas, e.g., 1000000"
-            )
-            player_overall_buy = st.number_input(
-                "Player Overall",
-                min_value=0,
-                max_value=99,
-                step=1,
-                format="%d",
-                key="player_overall_buy"
-            )
-            player_age_buy = st.number_input(
-                "Player Age",
-                min_value=16,
-                max_value=40,
-                step=1,
-                format="%d",
-                key="player_age_buy"
-            )
-            submit_buying_transfer = st.form_submit_button("Calculate Bid and Wage")
-        
-        if submit_buying_transfer:
-            if player_value_buy > 0 and player_overall_buy > 0:
-                if st.session_state.average_team_overall is not None and player_overall_buy > st.session_state.average_team_overall + 2:
-                    st.warning("Player's overall is too high. Sign players with lower overall or update Starting 11.")
-                starting_bid, is_accurate = calculate_starting_bid(
-                    player_value_buy, player_overall_buy, player_age_buy, st.session_state.average_team_overall
+                record_event(
+                    "calculator", duration=time.perf_counter() - calculator_started, calculator="selling", action="live", reused=reused
                 )
-                starting_bid = math.ceil(starting_bid / 1000) * 1000
+
+            @st.fragment
+            def live_buying_calculator():
+                # Fragment runs skip the top of the script, so restore and mark the session active here
+                resume_session()
+                st.subheader("Player Details")
+                player_value_buy = st.number_input(
+                    "Player Value",
+                    min_value=0.0,
+                    step=1000.0,
+                    format="%.2f",
+                    key="player_value_buy",
+                    help="Enter value without commas, e.g., 1000000"
+                )
+                player_overall_buy = st.number_input("Player Overall", min_value=0, max_value=99, step=1, format="%d", key="player_overall_buy")
+                player_age_buy = st.number_input("Player Age", min_value=16, max_value=40, step=1, format="%d", key="player_age_buy")
+                if player_value_buy <= 0 or player_overall_buy <= 0:
+                    st.info("Enter the player's value and overall to see the starting bid and wage.")
+                    return
+                calculator_started = time.perf_counter()
+                average_team_overall = st.session_state.average_team_overall
+                (starting_bid, is_accurate, wage), reused = st.session_state.live_results.get(
+                    (
+                        "buying", player_value_buy, player_overall_buy, player_age_buy,
+                        career_version(st.session_state.club_details, average_team_overall, st.session_state.starting_11)
+                    ),
+                    lambda: buying_result(player_value_buy, player_overall_buy, player_age_buy, average_team_overall, st.session_state.starting_11)
+                )
+                if average_team_overall is not None and player_overall_buy > average_team_overall + 2:
+                    st.warning("Player's overall is too high. Sign players with lower overall or update Starting 11.")
                 st.success(f"Start your bid at {starting_bid:,.0f}.")
                 if not is_accurate:
                     st.warning("Bid uses default markup. Calculate Starting 11 average for accuracy.")
-                wage, wage_error = calculate_proportional_wage(player_overall_buy, st.session_state.starting_11)
                 if wage is not None:
                     st.success(f"Minimum Wage: {wage:,} p/w")
                 else:
-                    st.warning(f"Wage error: {wage_error}")
+                    st.warning("Wage error: No valid Starting 11 data with non-zero wages and overalls.")
+                # Offered to the Contract Planner
+                st.session_state.last_buy = {"bid": starting_bid, "wage": wage or 0}
+                record_event(
+                    "calculator", duration=time.perf_counter() - calculator_started, calculator="buying", action="live", reused=reused
+                )
+
+        # Live calculators run in the browser and update as you type
+        with st.expander("Live Calculators", expanded=False):
+            from live_calculator import render_live_calculators
+
+            st.write("Results update as you type, using your saved club details and Starting 11.")
+            render_live_calculators(
+                st.session_state.club_details,
+                st.session_state.average_team_overall,
+                st.session_state.starting_11
+            )
+    
+        # Selling Transfer Calculator
+        with st.expander("Selling Transfer Calculator", expanded=False):
+            if st.session_state.live_calculators:
+                live_selling_calculator()
+            else:
+                with st.form(key="selling_transfer_form"):
+                    st.subheader("Offering Club Details")
+                    club2_name_sell = st.text_input("Offering Club Name (Optional)", key="club2_name_sell")
+                    club2_league_sell = st.selectbox("Offering Club League", list(league_tiers.keys()), key="club2_league_sell")
+                    club2_country_sell = st.selectbox("Offering Club Country", list(country_prestige.keys()), key="club2_country_sell")
+                    club2_european_sell = st.checkbox("Offering Club in European Competitions", key="club2_european_sell")
+            
+                    st.subheader("Transfer Details")
+                    player_value_sell = st.number_input(
+                        "Player Value",
+                        min_value=0.0,
+                        step=1000.0,
+                        format="%.2f",
+                        key="player_value_sell",
+                        help="Enter value without commas, e.g., 1000000"
+                    )
+                    is_young_sell = st.checkbox("Player Aged 16-21", key="is_young_sell")
+                    submit_selling_transfer = st.form_submit_button("Calculate Selling Offer")
+        
+                if submit_selling_transfer:
+                    calculator_started = time.perf_counter()
+                    if player_value_sell > 0:
+                        club_details = st.session_state.club_details
+                        score1 = calculate_score(club_details["league"], club_details["country"], club_details["european"], league_tiers)
+                        score2 = calculate_score(club2_league_sell, club2_country_sell, club2_european_sell, league_tiers)
+                        stature_diff = score2 - score1
+                        display_name1 = club_details["name"] if club_details["name"] else "Your Club"
+                        display_name2 = club2_name_sell if club2_name_sell else "Offering Club"
+                        st.write(f"**{display_name1}**: {club_details['league']}, {club_details['country']}, European: {club_details['european']}")
+                        st.write(f"**Stature Score**: {score1:.1f}")
+                        st.write(f"**{display_name2}**: {club2_league_sell}, {club2_country_sell}, European: {club2_european_sell}")
+                        st.write(f"**Stature Score**: {score2:.1f}")
+                        if score1 > score2:
+                            st.success(f"{display_name1} has higher stature by {score1 - score2:.1f}.")
+                        elif score2 > score1:
+                            st.warning(f"{display_name2} has higher stature by {score2 - score1:.1f}.")
+                        else:
+                            st.info("Clubs have equal stature.")
+                        minimum_offer = calculate_minimum_offer(player_value_sell, stature_diff, is_young_sell)
+                        minimum_offer = math.ceil(minimum_offer / 1000) * 1000
+                        st.success(f"Accept offers from {display_name2} of {minimum_offer:,.0f} or higher.")
+                    else:
+                        st.error("Player value must be greater than 0.")
+                    record_event("calculator", duration=time.perf_counter() - calculator_started, calculator="selling")
+
+        # Club search: which clubs can afford a player, ranked by stature
+        with st.expander("Club Search", expanded=False):
+            from club_index import ClubIndex, load_club_index, read_clubs
+
+            st.write(
+                "Find the clubs in a club database whose stature is close to yours and the minimum offer you should accept from each. "
+                "Uses the sample club database unless you upload your own CSV (Club Name, League, Country, European Bonus)."
+            )
+            with st.form(key="club_search_form"):
+                club_search_file = st.file_uploader("Club Database CSV (Optional)", type=["csv"], key="club_search_csv")
+                club_search_value = st.number_input(
+                    "Player Value",
+                    min_value=0.0,
+                    step=1000.0,
+                    format="%.2f",
+                    key="club_search_value",
+                    help="Enter value without commas, e.g., 1000000"
+                )
+                club_search_young = st.checkbox("Player Aged 16-21", key="club_search_young")
+                club_search_range = st.slider(
+                    "Stature Difference (theirs minus yours)",
+                    min_value=-15.0,
+                    max_value=15.0,
+                    value=(0.0, 2.0),
+                    step=0.5,
+                    key="club_search_range"
+                )
+                submit_club_search = st.form_submit_button("Search Clubs")
+
+            if submit_club_search:
+                calculator_started = time.perf_counter()
+                if club_search_value > 0:
+                    import io
+
+                    try:
+                        if club_search_file is not None:
+                            club_index = ClubIndex(read_clubs(io.TextIOWrapper(club_search_file, encoding="utf-8", newline="")))
+                        else:
+                            club_index = load_club_index()
+                    except ValueError as e:
+                        st.error(f"Invalid club database: {str(e)}")
+                    except UnicodeDecodeError:
+                        st.error("Club database must be UTF-8 text.")
+                    else:
+                        club_details = st.session_state.club_details
+                        club_stature = calculate_score(club_details["league"], club_details["country"], club_details["european"], league_tiers)
+                        buyers = club_index.buyers(club_search_value, club_search_young, club_stature, *club_search_range)
+                        if buyers:
+                            st.success(f"{len(buyers)} of {len(club_index)} clubs within range of your stature ({club_stature:.1f}).")
+                            st.dataframe([
+                                {
+                                    "Club": buyer["name"],
+                                    "League": buyer["league"],
+                                    "Country": buyer["country"],
+                                    "European": "Yes" if buyer["european"] else "No",
+                                    "Stature Score": f"{buyer['stature']:.1f}",
+                                    "Difference": f"{buyer['stature_diff']:+.1f}",
+                                    "Minimum Offer": f"{buyer['minimum_offer']:,.0f}"
+                                }
+                                for buyer in buyers
+                            ])
+                        else:
+                            st.info(f"No clubs within that stature range of yours ({club_stature:.1f}).")
+                else:
+                    st.error("Player value must be greater than 0.")
+                record_event("calculator", duration=time.perf_counter() - calculator_started, calculator="club_search")
+
+        # Buying Transfer Calculator
+        with st.expander("Buying Transfer Calculator", expanded=False):
+            if st.session_state.live_calculators:
+                live_buying_calculator()
+            else:
+                with st.form(key="buying_transfer_form"):
+                    st.subheader("Player Details")
+                    player_value_buy = st.number_input(
+                        "Player Value",
+                        min_value=0.0,
+                        step=1000.0,
+                        format="%.2f",
+                        key="player_value_buy",
+                        help="Enter value without commas, e.g., 1000000"
+                    )
+                    player_overall_buy = st.number_input(
+                        "Player Overall",
+                        min_value=0,
+                        max_value=99,
+                        step=1,
+                        format="%d",
+                        key="player_overall_buy"
+                    )
+                    player_age_buy = st.number_input(
+                        "Player Age",
+                        min_value=16,
+                        max_value=40,
+                        step=1,
+                        format="%d",
+                        key="player_age_buy"
+                    )
+                    submit_buying_transfer = st.form_submit_button("Calculate Bid and Wage")
+        
+                if submit_buying_transfer:
+                    calculator_started = time.perf_counter()
+                    if player_value_buy > 0 and player_overall_buy > 0:
+                        if st.session_state.average_team_overall is not None and player_overall_buy > st.session_state.average_team_overall + 2:
+                            st.warning("Player's overall is too high. Sign players with lower overall or update Starting 11.")
+                        starting_bid, is_accurate = calculate_starting_bid(
+                            player_value_buy, player_overall_buy, player_age_buy, st.session_state.average_team_overall
+                        )
+                        starting_bid = math.ceil(starting_bid / 1000) * 1000
+                        st.success(f"Start your bid at {starting_bid:,.0f}.")
+                        if not is_accurate:
+                            st.warning("Bid uses default markup. Calculate Starting 11 average for accuracy.")
+                        wage, wage_error = calculate_proportional_wage(player_overall_buy, st.session_state.starting_11)
+                        if wage is not None:
+                            st.success(f"Minimum Wage: {wage:,} p/w")
+                        else:
+                            st.warning(f"Wage error: {wage_error}")
+                        # Offered to the Contract Planner
+                        st.session_state.last_buy = {"bid": starting_bid, "wage": wage or 0}
+                    else:
+                        st.error("Player value and overall must be greater than 0.")
+                    record_event("calculator", duration=time.perf_counter() - calculator_started, calculator="buying")
+
+        # Contract planner: multi-season cost of signings on top of the squad's wages
+        with st.expander("Contract Planner", expanded=False):
+            import pandas as pd
+            from contracts import MAX_CONTRACT_YEARS, MAX_SEASONS, Contract, contract_rows, project, projection_rows, read_contracts
+
+            init_session_state("contracts", "starting_11", "squad", "season")
+            st.write(
+                "Plan signings as contracts (fee, wage and length) to see each season's cost: transfer fees spread evenly "
+                "over the contract plus wages, on top of your Starting 11 and squad wage bill. "
+                f"Start Season is the career season the contract begins in (this is season {st.session_state.season}), "
+                "so contracts run down as you start new seasons."
+            )
+            last_buy = st.session_state.get("last_buy")
+            if last_buy and st.button(
+                f"Add Last Buying Calculation ({last_buy['bid']:,.0f} bid, {last_buy['wage']:,} p/w)", key="contract_add_last_buy"
+            ):
+                st.session_state.contracts += (Contract("", float(last_buy["bid"]), int(last_buy["wage"]), 3, st.session_state.season),)
+                st.session_state.last_buy = None
+                rerun()
+            contracts_df = st.data_editor(
+                pd.DataFrame([contract._asdict() for contract in st.session_state.contracts], columns=Contract._fields),
+                num_rows="dynamic",
+                column_config={
+                    "name": st.column_config.TextColumn("Player"),
+                    "fee": st.column_config.NumberColumn("Fee", min_value=0, step=100000, required=True),
+                    "wage": st.column_config.NumberColumn("Wage (p/w)", min_value=0, step=1000, required=True),
+                    "years": st.column_config.NumberColumn("Contract Length", min_value=1, max_value=MAX_CONTRACT_YEARS, step=1, required=True),
+                    "start": st.column_config.NumberColumn("Start Season", min_value=1, step=1, required=True)
+                },
+                key="contracts_editor"
+            )
+            try:
+                st.session_state.contracts = read_contracts(
+                    contracts_df.dropna(subset=["fee", "wage", "years", "start"]).to_dict("records")
+                )
+            except ValueError as e:
+                st.error(str(e))
+            contracts = st.session_state.contracts
+
+            col1, col2 = st.columns(2)
+            with col1:
+                contract_seasons = st.slider("Seasons to Project", min_value=1, max_value=MAX_SEASONS, value=5, key="contract_seasons")
+            with col2:
+                contract_growth = st.slider("Yearly Wage Growth (%)", min_value=0.0, max_value=10.0, value=0.0, step=0.5, key="contract_growth")
+            squad_wage_bill = sum(player["wage"] for player in st.session_state.starting_11 + st.session_state.squad)
+            projection = project(contracts, squad_wage_bill, contract_seasons, contract_growth / 100, st.session_state.season)
+            projection_table = projection_rows(projection, st.session_state.season)
+
+            col1, col2, col3 = st.columns(3)
+            col1.metric(f"Total Cost ({contract_seasons} Seasons)", f"{projection_table[-1]['cumulative']:,}")
+            col2.metric("Transfer Fees", f"{round(float(projection['amortisation'].sum())):,}")
+            col3.metric("Signing Wages", f"{round(float(projection['signing_wages'].sum())):,}")
+            st.bar_chart(
+                pd.DataFrame(projection_table).set_index("season")[["amortisation", "signing_wages", "squad_wages"]],
+                x_label="Season",
+                y_label="Cost"
+            )
+            st.dataframe(
+                projection_table,
+                column_config={
+                    "season": "Season",
+                    "amortisation": st.column_config.NumberColumn("Fee Amortisation", format="%,d"),
+                    "signing_wages": st.column_config.NumberColumn("Signing Wages", format="%,d"),
+                    "squad_wages": st.column_config.NumberColumn("Squad Wages", format="%,d"),
+                    "total": st.column_config.NumberColumn("Total", format="%,d"),
+                    "cumulative": st.column_config.NumberColumn("Cumulative", format="%,d")
+                }
+            )
+            if contracts:
+                st.write("Per contract:")
+                st.dataframe(contract_rows(contracts))
+
+        # Transfer Shortlist
+        with st.expander("Transfer Shortlist", expanded=False):
+            st.write(
+                "Upload a CSV of candidates (Name, Position, Value, Overall, Age) to rank them by value for money: "
+                "overall per million of starting bid plus a season of proportional wages."
+            )
+            with st.form(key="shortlist_form"):
+                shortlist_file = st.file_uploader("Candidate CSV", type=["csv"], key="shortlist_csv")
+                shortlist_k = st.number_input("Players per Position", min_value=1, max_value=100, value=10, step=1, format="%d", key="shortlist_k")
+                shortlist_under_cap = st.checkbox("Only players within the signing cap (average overall + 2)", value=True, key="shortlist_under_cap")
+                submit_shortlist = st.form_submit_button("Rank Candidates")
+
+            if submit_shortlist:
+                calculator_started = time.perf_counter()
+                if shortlist_file is None:
+                    st.warning("Please upload a candidate CSV to rank.")
+                else:
+                    import io
+                    from shortlist import rank_csv
+
+                    try:
+                        ranked, shortlist_stats = rank_csv(
+                            io.TextIOWrapper(shortlist_file, encoding="utf-8", newline=""),
+                            st.session_state.starting_11,
+                            st.session_state.average_team_overall,
+                            k=shortlist_k,
+                            under_cap_only=shortlist_under_cap
+                        )
+                    except ValueError as e:
+                        st.error(f"Invalid candidate CSV: {str(e)}")
+                    except UnicodeDecodeError:
+                        st.error("Candidate CSV must be UTF-8 text.")
+                    else:
+                        st.success(
+                            f"Ranked {shortlist_stats['rows'] - shortlist_stats['skipped']:,} of {shortlist_stats['rows']:,} candidates "
+                            f"({shortlist_stats['over_cap']:,} above the signing cap)."
+                        )
+                        if st.session_state.average_team_overall is None:
+                            st.warning("Bids use default markup. Calculate Starting 11 average for accuracy.")
+                        for position in [p for p in player_positions if p in ranked] + sorted(p for p in ranked if p not in player_positions):
+                            st.subheader(position)
+                            st.dataframe([
+                                {
+                                    "Player": candidate["name"] or "-",
+                                    "Overall": candidate["overall"],
+                                    "Age": candidate["age"],
+                                    "Starting Bid": f"{candidate['starting_bid']:,.0f}",
+                                    "Wage (p/w)": f"{candidate['wage']:,}",
+                                    "Season Cost": f"{candidate['season_cost']:,.0f}",
+                                    "Overall per Million": f"{candidate['score']:.2f}",
+                                    "Within Cap": "Yes" if candidate["within_cap"] else "No"
+                                }
+                                for candidate in ranked[position]
+                            ])
+                record_event("calculator", duration=time.perf_counter() - calculator_started, calculator="shortlist")
+
+        # Watchlist: re-price tracked players each window, showing the change
+        # since the previous season
+        with st.expander("Watchlist", expanded=False):
+            from watchlist import pricing_context, read_csv
+
+            init_session_state("season", "watchlist")
+            watchlist = st.session_state.watchlist
+            st.write(
+                "Upload a CSV of tracked players (Name, Value, Overall, Age, and optionally Position and their club's "
+                "League, Country and European) each window. Only players whose details or your club changed are re-priced; "
+                "prices are kept per season and compared with the previous season on record."
+            )
+            with st.form(key="watchlist_form"):
+                watchlist_file = st.file_uploader("Watchlist CSV", type=["csv"], key="watchlist_csv")
+                watchlist_replace = st.checkbox("Remove players not in this file", value=False, key="watchlist_replace")
+                submit_watchlist = st.form_submit_button("Update Watchlist")
+            col1, col2 = st.columns([1, 1])
+            with col1:
+                reprice_watchlist = st.button("Re-price for Current Club", key="watchlist_reprice", disabled=not len(watchlist))
+            with col2:
+                clear_watchlist = st.button("Clear Watchlist", key="watchlist_clear", disabled=not len(watchlist))
+
+            context = pricing_context(
+                st.session_state.club_details, st.session_state.average_team_overall, st.session_state.starting_11
+            )
+            if submit_watchlist:
+                calculator_started = time.perf_counter()
+                if watchlist_file is None:
+                    st.warning("Please upload a watchlist CSV.")
+                else:
+                    import io
+
+                    try:
+                        tracked, watchlist_skipped = read_csv(io.TextIOWrapper(watchlist_file, encoding="utf-8", newline=""))
+                    except ValueError as e:
+                        st.error(f"Invalid watchlist CSV: {str(e)}")
+                    except UnicodeDecodeError:
+                        st.error("Watchlist CSV must be UTF-8 text.")
+                    else:
+                        watchlist_stats = watchlist.update(tracked, st.session_state.season, context, replace=watchlist_replace)
+                        st.success(
+                            f"{watchlist_stats['added']:,} added, {watchlist_stats['changed']:,} changed, "
+                            f"{watchlist_stats['unchanged']:,} unchanged, {watchlist_stats['removed']:,} removed; "
+                            f"{watchlist_stats['repriced']:,} re-priced."
+                        )
+                        if watchlist_skipped:
+                            st.warning(f"Skipped {watchlist_skipped:,} row(s) without a name or a valid value, overall and age.")
+                record_event("calculator", duration=time.perf_counter() - calculator_started, calculator="watchlist")
+            elif reprice_watchlist:
+                st.success(f"{watchlist.reprice(st.session_state.season, context):,} player(s) re-priced.")
+            elif clear_watchlist:
+                st.session_state.watchlist = watchlist = Watchlist()
+                st.success("Watchlist cleared.")
+
+            watchlist_rows = watchlist.rows()
+            if watchlist_rows:
+                if st.session_state.average_team_overall is None:
+                    st.warning("Bids use default markup. Calculate Starting 11 average for accuracy.")
+
+                def format_change(change):
+                    return "-" if change is None else f"{change:+,.0f}"
+
+                st.dataframe([
+                    {
+                        "Player": row["name"],
+                        "Position": row["position"] or "-",
+                        "Overall": row["overall"],
+                        "Age": row["age"],
+                        "Priced In": f"Season {row['season']}",
+                        "Starting Bid": f"{row['starting_bid']:,.0f}",
+                        "Bid Change": format_change(row["starting_bid_change"]),
+                        "Wage (p/w)": "-" if row["wage"] is None else f"{row['wage']:,}",
+                        "Wage Change": format_change(row["wage_change"]),
+                        "Minimum Offer": f"{row['minimum_offer']:,.0f}",
+                        "Offer Change": format_change(row["minimum_offer_change"]),
+                        "Compared With": "-" if row["previous_season"] is None else f"Season {row['previous_season']}"
+                    }
+                    for row in watchlist_rows
+                ])
+
+        # League room: clubs of other users in a shared league, priced live
+        with st.expander("League Room", expanded=False):
+            from rooms import POLL_SECONDS, RoomError, join_room, member_stature, store as room_store, transfer_price
+
+            st.write(
+                "Join a room with your league's code to share your club with the other managers. "
+                "Their clubs update here as they edit them, and transfers between you are priced by your clubs' stature."
+            )
+            room_view = st.session_state.get("room_view")
+            if room_view is None:
+                with st.form(key="room_join_form"):
+                    room_code = st.text_input("Room Code", key="room_code", help="3 to 24 letters, digits or dashes")
+                    room_name = st.text_input("Your Name", key="room_name")
+                    submit_room = st.form_submit_button("Join Room")
+                if submit_room:
+                    if not room_name.strip():
+                        st.error("Please enter your name.")
+                    else:
+                        try:
+                            room_view = join_room(room_code.strip(), room_name.strip())
+                            room_view.publish(st.session_state.club_details, st.session_state.average_team_overall)
+                        except RoomError as e:
+                            st.error(str(e))
+                        else:
+                            st.session_state.room_view = room_view
+                            rerun()
             else:
-                st.error("Player value and overall must be greater than 0.")
+                col1, col2 = st.columns([3, 1])
+                with col1:
+                    st.write(f"**Room {room_view.code}** as {room_view.name}")
+                with col2:
+                    if st.button("Leave Room", key="room_leave"):
+                        room_store.leave(room_view.code, room_view.member_id)
+                        st.session_state.room_view = None
+                        rerun()
+
+                # Polls the room and only redraws the member list
+                @st.fragment(run_every=POLL_SECONDS)
+                def room_members():
+                    # Fragment runs skip the top of the script, so restore and mark the session active here
+                    resume_session()
+                    room = room_store.get(room_view.code)
+                    if room is not None:
+                        room_view.sync(room)
+                    st.dataframe([
+                        {
+                            "Manager": member.name + (" (you)" if member_id == room_view.member_id else ""),
+                            "Club": member.club_name or "-",
+                            "League": member.league,
+                            "Country": member.country,
+                            "European": "Yes" if member.european else "No",
+                            "Stature": f"{member_stature(member):.1f}",
+                            "Starting 11 Average": "-" if member.average_overall is None else member.average_overall
+                        }
+                        for member_id, member in sorted(room_view.members.items(), key=lambda item: -member_stature(item[1]))
+                    ], hide_index=True)
 
-# Tab 5: Help/Info
+                room_members()
+
+                others = room_view.others()
+                if not others:
+                    st.info("No other managers in this room yet.")
+                else:
+                    with st.form(key="room_transfer_form"):
+                        room_other = st.selectbox(
+                            "Other Manager", [member.member_id for member in others],
+                            format_func=lambda member_id: f"{room_view.members[member_id].name} ({room_view.members[member_id].club_name or room_view.members[member_id].league})",
+                            key="room_other"
+                        )
+                        room_direction = st.radio("Transfer", ["Selling to them", "Buying from them"], horizontal=True, key="room_direction")
+                        room_value = st.number_input("Player Value", min_value=0.0, step=1000.0, format="%.2f", key="room_value")
+                        room_young = st.checkbox("Player Aged 16-21", key="room_young")
+                        submit_room_transfer = st.form_submit_button("Price Transfer")
+                    if submit_room_transfer:
+                        calculator_started = time.perf_counter()
+                        if room_value <= 0:
+                            st.error("Player value must be greater than 0.")
+                        else:
+                            me = room_view.members.get(room_view.member_id)
+                            other = room_view.members.get(room_other)
+                            if me is None:
+                                st.error("Your club is not in the room yet. Please try again.")
+                            elif other is None:
+                                st.error("That manager has left the room.")
+                            else:
+                                seller, buyer = (me, other) if room_direction == "Selling to them" else (other, me)
+                                stature_diff, minimum_offer = transfer_price(seller, buyer, room_value, room_young)
+                                st.write(f"Stature difference (buyer - seller): {stature_diff:+.1f}")
+                                st.success(
+                                    f"{buyer.name} must offer {seller.name} at least {math.ceil(minimum_offer / 1000) * 1000:,.0f}."
+                                )
+                        record_event("calculator", duration=time.perf_counter() - calculator_started, calculator="room_transfer")
+
+        # What-if scenario comparison
+        with st.expander("Scenario Comparison", expanded=False):
+            import pandas as pd
+            from scenarios import compare_scenarios, default_scenarios
+
+            st.write(
+                "Compare pending transfers under several versions of your club, e.g. after promotion "
+                "or qualifying for Europe, without editing your club details."
+            )
+            with st.form(key="scenario_form"):
+                st.subheader("Club Scenarios")
+                scenario_df = st.data_editor(
+                    pd.DataFrame(default_scenarios(st.session_state.club_details, league_tiers), columns=["name", "league", "country", "european"]),
+                    num_rows="dynamic",
+                    column_config={
+                        "name": st.column_config.TextColumn("Scenario"),
+                        "league": st.column_config.SelectboxColumn("League", options=list(league_tiers.keys()), required=True),
+                        "country": st.column_config.SelectboxColumn("Country", options=list(country_prestige.keys()), required=True),
+                        "european": st.column_config.CheckboxColumn("European", default=False)
+                    },
+                    key="scenario_editor"
+                )
+                st.subheader("Pending Sales")
+                scenario_sales_df = st.data_editor(
+                    pd.DataFrame(columns=["name", "value", "is_young", "league", "country", "european"]).astype(
+                        {"name": "object", "value": "float", "is_young": "bool", "league": "object", "country": "object", "european": "bool"}
+                    ),
+                    num_rows="dynamic",
+                    column_config={
+                        "name": st.column_config.TextColumn("Player"),
+                        "value": st.column_config.NumberColumn("Player Value", min_value=0, step=1000, required=True),
+                        "is_young": st.column_config.CheckboxColumn("Aged 16-21", default=False),
+                        "league": st.column_config.SelectboxColumn("Offering Club League", options=list(league_tiers.keys()), required=True),
+                        "country": st.column_config.SelectboxColumn("Offering Club Country", options=list(country_prestige.keys()), required=True),
+                        "european": st.column_config.CheckboxColumn("Offering Club European", default=False)
+                    },
+                    key="scenario_sales_editor"
+                )
+                st.subheader("Pending Purchases")
+                scenario_purchases_df = st.data_editor(
+                    pd.DataFrame(columns=["name", "value", "overall", "age"]).astype(
+                        {"name": "object", "value": "float", "overall": "int", "age": "int"}
+                    ),
+                    num_rows="dynamic",
+                    column_config={
+                        "name": st.column_config.TextColumn("Player"),
+                        "value": st.column_config.NumberColumn("Player Value", min_value=0, step=1000, required=True),
+                        "overall": st.column_config.NumberColumn("Overall", min_value=1, max_value=99, step=1, required=True),
+                        "age": st.column_config.NumberColumn("Age", min_value=16, max_value=40, step=1, required=True)
+                    },
+                    key="scenario_purchases_editor"
+                )
+                submit_scenarios = st.form_submit_button("Compare Scenarios")
+
+            if submit_scenarios:
+                calculator_started = time.perf_counter()
+                scenario_clubs = [
+                    {"name": row["name"] if isinstance(row["name"], str) else "", "league": row["league"], "country": row["country"], "european": bool(row["european"])}
+                    for row in scenario_df.dropna(subset=["league", "country"]).to_dict("records")
+                ]
+                pending_sales = [
+                    {
+                        "name": row["name"] if isinstance(row["name"], str) else "", "value": float(row["value"]), "is_young": bool(row["is_young"]),
+                        "league": row["league"], "country": row["country"], "european": bool(row["european"])
+                    }
+                    for row in scenario_sales_df.dropna(subset=["value", "league", "country"]).to_dict("records")
+                    if row["value"] > 0
+                ]
+                pending_purchases = [
+                    {"name": row["name"] if isinstance(row["name"], str) else "", "value": float(row["value"]), "overall": int(row["overall"]), "age": int(row["age"])}
+                    for row in scenario_purchases_df.dropna(subset=["value", "overall", "age"]).to_dict("records")
+                    if row["value"] > 0 and row["overall"] > 0
+                ]
+                if not scenario_clubs:
+                    st.warning("Add at least one club scenario to compare.")
+                elif not pending_sales and not pending_purchases:
+                    st.warning("Add at least one pending sale or purchase to compare.")
+                else:
+                    results, scenario_info = compare_scenarios(
+                        scenario_clubs,
+                        pending_sales,
+                        pending_purchases,
+                        league_tiers,
+                        st.session_state.average_team_overall,
+                        st.session_state.starting_11
+                    )
+                    labels = [result["name"] for result in results]
+                    st.dataframe([
+                        {
+                            "Scenario": label,
+                            "League": result["league"],
+                            "Country": result["country"],
+                            "European": "Yes" if result["european"] else "No",
+                            "Scout Rating": f"{result['scout_rating']} stars",
+                            "Stature Score": f"{result['stature']:.1f}",
+                            "Minimum Offers": f"{result['total_minimum_offers']:,.0f}",
+                            "Starting Bids": f"{result['total_starting_bids']:,.0f}"
+                        }
+                        for label, result in zip(labels, results)
+                    ])
+                    if pending_sales:
+                        st.subheader("Minimum Offers by Scenario")
+                        st.dataframe([
+                            dict(
+                                {"Player": sale["name"] or "-", "Offering Club Stature": f"{offering_score:.1f}"},
+                                **{label: f"{result['minimum_offers'][i]:,.0f}" for label, result in zip(labels, results)}
+                            )
+                            for i, (sale, offering_score) in enumerate(zip(pending_sales, scenario_info["offering_scores"]))
+                        ])
+                    if pending_purchases:
+                        st.subheader("Starting Bids")
+                        st.write("Starting bids and wages depend on your Starting 11, so they are the same in every scenario.")
+                        st.dataframe([
+                            {
+                                "Player": purchase["name"] or "-",
+                                "Starting Bid": f"{results[0]['starting_bids'][i]:,.0f}",
+                                "Wage (p/w)": f"{results[0]['wages'][i]:,}" if results[0]["wages"][i] is not None else "-"
+                            }
+                            for i, purchase in enumerate(pending_purchases)
+                        ])
+                        if not scenario_info["bids_accurate"]:
+                            st.warning("Bids use default markup. Calculate Starting 11 average for accuracy.")
+                record_event("calculator", duration=time.perf_counter() - calculator_started, calculator="scenarios")
+
+# Tab 5: Career Dashboard
 with tab5:
-    st.header("Help & Info")
-    st.write(
-        """
-        **FIFA Realistic Toolkit** helps you manage your FIFA career mode with realistic transfer and wage guidelines.
+    if tab5.open:
+        init_session_state("season", "ledger", "starting_11", "squad", "season_trend")
+        import pandas as pd
+        from dashboard import COUNTER_LABELS, career_summary, compliance_rows, window_rows
+
+        st.header("Career Dashboard")
+        st.write(
+            "Spend and income per window, Starting 11 and wage bill trends, and how each season kept to the checklist limits. "
+            "Trends use the Starting 11 and squad as they stood at the end of each season."
+        )
+        season = st.session_state.season
+        ledger = st.session_state.ledger
+        trend = st.session_state.season_trend
+        # Only the current season's record is refreshed; past seasons are frozen
+        trend.record(season, st.session_state.starting_11, st.session_state.squad)
+
+        summary = career_summary(ledger, season)
+        col1, col2, col3 = st.columns([1, 1, 1])
+        col1.metric("Total Spend", f"{summary['spend']:,.0f}")
+        col2.metric("Total Income", f"{summary['income']:,.0f}")
+        col3.metric("Seasons Within Limits", f"{summary['compliant_seasons']} / {season}")
+
+        windows = pd.DataFrame(window_rows(ledger, season))
+        windows["label"] = "S" + windows["season"].astype(str).str.zfill(2) + " " + windows["window"].str.title()
+        st.subheader("Spend vs. Income per Window")
+        st.bar_chart(windows.set_index("label")[["spend", "income"]], stack=False)
+
+        trend_rows = pd.DataFrame(trend.rows(season))
+        if not trend_rows.empty:
+            trend_rows = trend_rows.set_index("season")
+            col1, col2 = st.columns([1, 1])
+            with col1:
+                st.subheader("Starting 11 Average Overall")
+                st.line_chart(trend_rows[["average_overall"]])
+            with col2:
+                st.subheader("Wage Bill (p/w)")
+                st.line_chart(trend_rows[["wage_bill"]])
+
+        st.subheader("Checklist Compliance")
+        st.dataframe(
+            pd.DataFrame([
+                {
+                    "Window": row["label"],
+                    "Signings": f"{row['signings']} / {row['signing_limit']}",
+                    "Loans": f"{row['loans']} / {row['loan_limit']}",
+                    "Starting Players Sold": row["sold"],
+                    "Net Spend": f"{row['net_spend']:,.0f}"
+                }
+                for row in windows.to_dict("records")
+            ]),
+            hide_index=True
+        )
+        for row in compliance_rows(ledger, season):
+            for window, counter, count, limit in row["breaches"]:
+                window_label = "" if window == "season" else f" {window.title()}"
+                st.warning(f"Season {row['season']}{window_label}: {count} {COUNTER_LABELS[counter]} (limit {limit}).")
+
+# Tab 6: Help/Info
+with tab6:
+    if tab6.open:
+        st.header("Help & Info")
+        st.write(
+            """
+            **FIFA Realistic Toolkit** helps you manage your FIFA career mode with realistic transfer and wage guidelines.
         
-        - **Club Details**: Enter your club's league, country, and European status to calculate stature and determine maximum scout ratings.
-        - **Career Checklist**: Track your signings, sales, and youth promotions to ensure compliance with transfer window rules.
-        - **Starting 11**: Input your starting lineup to determine average overall and wage caps.
-        - **Transfer Calculators**: Compute minimum selling offers and starting bids for buying players.
-        - **Save/Load**: Use the Save/Load tab to copy/paste JSON text or upload a JSON file, apply its content, and load your data.
+            - **Club Details**: Enter your club's league, country, and European status to calculate stature, determine maximum scout ratings and plan where your scouts can be assigned.
+            - **Career Checklist**: Track your signings, sales, and youth promotions to ensure compliance with transfer window rules. Every move is kept in a season-by-season transfer history.
+            - **Starting 11**: Input your starting lineup (or paste it from a spreadsheet) to determine average overall and wage caps, and plan proportional wages for your whole squad.
+            - **Transfer Calculators**: Compute minimum selling offers and starting bids for buying players (or turn on Live Mode to see them update as you edit), project the multi-season cost of new contracts, rank an uploaded shortlist of candidates by value for money, track a watchlist of players priced season by season, compare pending transfers across club scenarios, or join a league room to price transfers against other managers' live clubs.
+            - **Career Dashboard**: See spend vs. income per window, Starting 11 and wage bill trends by season, and which seasons kept to the checklist limits.
+            - **Save/Load**: Use the Save/Load tab to copy/paste JSON text or upload a JSON file, apply its content, and load your data. Turn on offline mode to keep your career in your browser between visits.
         
-        If you enjoy this tool, consider [buying me a coffee](https://buymeacoffee.com/whitespear11).
-        """
-    )
+            If you enjoy this tool, consider [buying me a coffee](https://buymeacoffee.com/whitespear11).
+            """
+        )
 
-# Tab 6: Save/Load
-with tab6:
-    st.header("Save/Load Data")
-    st.write(
-        """
-        Save your progress by copying the JSON text below or downloading it as a file (team_data.json).
-        Load a previous session by pasting JSON text or uploading a JSON file, then clicking 'Apply Uploaded JSON' and 'Load Data'.
-        The data includes your club details, starting 11, and career checklist.
-        """
-    )
+        # Shared pricing cache counters (process-wide, across all sessions)
+        with st.expander("Server Cache Statistics", expanded=False):
+            from contracts import contract_cache_stats
 
-    # Save Data
-    st.subheader("Save Your Data")
-    if st.session_state.club_details and st.session_state.starting_11 and st.session_state.checklist:
-        combined_data = {
-            "club_details": st.session_state.club_details,
-            "starting_11": st.session_state.starting_11,
-            "checklist": st.session_state.checklist
-        }
-        json_str = json.dumps(combined_data, indent=2)
+            st.write("Stature and pricing lookups, the checklist and progress blocks and contract schedules are cached once per server and shared by every session.")
+            st.table([
+                {
+                    "Lookup": name,
+                    "Hits": stats["hits"],
+                    "Misses": stats["misses"],
+                    "Hit Rate": f"{stats['hit_rate']:.0%}",
+                    "Entries": f"{stats['size']} / {stats['max_size']}"
+                }
+                for name, stats in {**pricing_cache_stats(), **block_cache_stats(), **contract_cache_stats()}.items()
+            ])
+            session_stats = spiller.stats()
+            st.write(
+                f"Sessions: {session_stats['sessions']:,}, idle sessions on disk: {session_stats['spilled']:,} "
+                f"({session_stats['spills']:,} spilled, {session_stats['restores']:,} restored)."
+            )
+            from rooms import store as room_store
+            room_stats = room_store.stats()
+            st.write(f"League rooms: {room_stats['rooms']:,} open with {room_stats['members']:,} members.")
+            st.write(f"Reference tables: version {reference.version}, {len(league_tiers)} leagues, {len(country_prestige)} countries.")
+            if reference_error():
+                st.warning(f"The last edit of the reference tables was rejected and the previous tables are still in use. {reference_error()}")
+            if METRICS_PORT:
+                st.write(f"Request metrics are served in Prometheus format at port {METRICS_PORT} (/metrics) on the server.")
+
+# Tab 7: Save/Load
+with tab7:
+    if tab7.open:
+        init_session_state(
+            "club_details", "starting_11", "checklist", "average_team_overall", "squad", "season", "ledger", "watchlist", "season_trend",
+            "contracts", "uploaded_json_content", "apply_json_content", "show_load_message"
+        )
+        # Only needed for saving and loading, so imported on first use
+        import json
+
+        st.header("Save/Load Data")
+        st.write(
+            """
+            Save your progress by copying the JSON text below or downloading it as a file (team_data.json).
+            Load a previous session by pasting JSON text or uploading a JSON file, then clicking 'Apply Uploaded JSON' and 'Load Data'.
+            The data includes your club details, starting 11, squad, career checklist, and transfer history.
+            """
+        )
+
+        # Save Data
+        st.subheader("Save Your Data")
+        if st.session_state.club_details and st.session_state.starting_11 and st.session_state.checklist:
+            save_started = time.perf_counter()
+            combined_data = career_data()
+            json_str = json.dumps(combined_data, indent=2)
+            save_duration = time.perf_counter() - save_started
+            col1, col2 = st.columns([3, 1])
+            with col1:
+                st.text_area(
+                    "Copy this JSON text or use the button to save as a file:",
+                    value=json_str,
+                    height=300,
+                    key="save_json",
+                    help="Copy this text to your clipboard or save it to a file (e.g., team_data.json)."
+                )
+            with col2:
+                if st.download_button(
+                    label="Save to JSON File",
+                    data=json_str,
+                    file_name="team_data.json",
+                    mime="application/json",
+                    key="download_json",
+                    use_container_width=True
+                ):
+                    record_event("save", duration=save_duration, payload_bytes=len(json_str), action="download")
+        else:
+            st.warning("No data to save. Please fill out Club Details, Starting 11, or Career Checklist first.")
+
+        # Offline mode
+        st.subheader("Offline Mode")
+        def toggle_offline_mode():
+            st.session_state.offline_mode = st.session_state.offline_mode_toggle
+        st.toggle(
+            "Keep my career on this device",
+            value=st.session_state.offline_mode,
+            key="offline_mode_toggle",
+            on_change=toggle_offline_mode,
+            help="Saves your career in this browser after every change and restores it automatically if your session is lost."
+        )
+        if st.session_state.offline_mode:
+            st.write("Your career is saved in this browser and restored automatically when you reconnect.")
+
+        # Load Data
+        st.subheader("Load Your Data")
         col1, col2 = st.columns([3, 1])
         with col1:
-            st.text_area(
-                "Copy this JSON text or use the button to save as a file:",
-                value=json_str,
+            # Use apply_json_content as the default value for the text area
+            json_input = st.text_area(
+                "Paste your JSON text here or apply uploaded file content:",
+                value=st.session_state.apply_json_content,
                 height=300,
-                key="save_json",
-                help="Copy this text to your clipboard or save it to a file (e.g., team_data.json)."
+                key="load_json",
+                help="Paste JSON text or click 'Apply Uploaded JSON' to use uploaded file content, then click 'Load Data'."
             )
         with col2:
-            st.download_button(
-                label="Save to JSON File",
-                data=json_str,
-                file_name="team_data.json",
-                mime="application/json",
-                key="download_json",
-                use_container_width=True
+            uploaded_file = st.file_uploader(
+                "Upload JSON File",
+                type=["json"],
+                key="upload_json",
+                help="Upload a team_data.json file to use its content."
             )
-    else:
-        st.warning("No data to save. Please fill out Club Details, Starting 11, or Career Checklist first.")
-
-    # Load Data
-    st.subheader("Load Your Data")
-    col1, col2 = st.columns([3, 1])
-    with col1:
-        # Use apply_json_content as the default value for the text area
-        json_input = st.text_area(
-            "Paste your JSON text here or apply uploaded file content:",
-            value=st.session_state.apply_json_content,
-            height=300,
-            key="load_json",
-            help="Paste JSON text or click 'Apply Uploaded JSON' to use uploaded file content, then click 'Load Data'."
-        )
-    with col2:
-        uploaded_file = st.file_uploader(
-            "Upload JSON File",
-            type=["json"],
-            key="upload_json",
-            help="Upload a team_data.json file to use its content."
-        )
-        if uploaded_file:
-            try:
-                json_content = uploaded_file.read().decode("utf-8")
-                st.session_state.uploaded_json_content = json_content
-                st.success("File uploaded successfully. Click 'Apply Uploaded JSON' to use.")
-            except json.JSONDecodeError:
-                st.error("Invalid JSON file uploaded. Please upload a valid JSON file.")
-            except Exception as e:
-                st.error(f"Error reading file: {str(e)}")
-
-        if st.session_state.uploaded_json_content:
-            if st.button("Apply Uploaded JSON", key="apply_uploaded_json"):
-                # Set the content to be applied in the next run
-                st.session_state.apply_json_content = st.session_state.uploaded_json_content
-                st.session_state.uploaded_json_content = ""  # Clear uploaded content
-                st.session_state.show_load_message = True  # Show the load message
-                st.rerun()
-
-        if st.button("Load Data", key="load_data_button"):
-            st.session_state.show_load_message = False  # Clear the message
-            if json_input:
+            if uploaded_file:
                 try:
-                    loaded_data = json.loads(json_input)
-                    # Validate club_details
-                    club_valid = (
-                        isinstance(loaded_data.get("club_details"), dict) and
-                        all(key in loaded_data["club_details"] for key in ["name", "league", "country", "european"]) and
-                        isinstance(loaded_data["club_details"]["name"], str) and
-                        loaded_data["club_details"]["league"] in league_tiers and
-                        loaded_data["club_details"]["country"] in country_prestige and
-                        isinstance(loaded_data["club_details"]["european"], bool)
-                    )
-                    # Validate starting_11
-                    starting_11_valid = (
-                        isinstance(loaded_data.get("starting_11"), list) and
-                        len(loaded_data["starting_11"]) == 11 and
-                        all(
-                            isinstance(player, dict) and
-                            all(key in player for key in ["position", "overall", "wage"]) and
-                            player["position"] in player_positions and
-                            isinstance(player["overall"], int) and
-                            0 <= player["overall"] <= 99 and
-                            isinstance(player["wage"], int) and
-                            player["wage"] >= 0
-                            for player in loaded_data["starting_11"]
-                        )
-                    )
-                    # Validate checklist
-                    checklist_valid = (
-                        isinstance(loaded_data.get("checklist"), dict) and
-                        "summer" in loaded_data["checklist"] and
-                        "winter" in loaded_data["checklist"] and
-                        "youth_promotions" in loaded_data["checklist"] and
-                        isinstance(loaded_data["checklist"]["summer"], dict) and
-                        isinstance(loaded_data["checklist"]["winter"], dict) and
-                        isinstance(loaded_data["checklist"]["youth_promotions"], int) and
-                        loaded_data["checklist"]["youth_promotions"] >= 0 and
-                        all(
-                            key in loaded_data["checklist"]["summer"]
-                            for key in ["starting_signings", "bench_signings", "reserve_signings", "loans", "starting_sold"]
-                        ) and
-                        all(
-                            key in loaded_data["checklist"]["winter"]
-                            for key in ["starting_signings", "bench_signings", "reserve_signings", "loans", "starting_sold"]
-                        ) and
-                        all(
-                            isinstance(loaded_data["checklist"]["summer"][key], int) and
-                            loaded_data["checklist"]["summer"][key] >= 0
-                            for key in loaded_data["checklist"]["summer"]
-                        ) and
-                        all(
-                            isinstance(loaded_data["checklist"]["winter"][key], int) and
-                            loaded_data["checklist"]["winter"][key] >= 0
-                            for key in loaded_data["checklist"]["winter"]
-                        )
-                    )
-                    if club_valid and starting_11_valid:
-                        st.session_state.club_details = loaded_data["club_details"]
-                        st.session_state.starting_11 = loaded_data["starting_11"]
-                        if checklist_valid:
-                            st.session_state.checklist = loaded_data["checklist"]
-                        else:
-                            st.session_state.checklist = {
-                                "summer": {
-                                    "starting_signings": 0,
-                                    "bench_signings": 0,
-                                    "reserve_signings": 0,
-                                    "loans": 0,
-                                    "starting_sold": 0
-                                },
-                                "winter": {
-                                    "starting_signings": 0,
-                                    "bench_signings": 0,
-                                    "reserve_signings": 0,
-                                    "loans": 0,
-                                    "starting_sold": 0
-                                },
-                                "youth_promotions": 0
-                            }
-                            st.warning("Checklist data invalid or missing; reset to defaults.")
-                        total_overall = sum(player["overall"] for player in loaded_data["starting_11"])
-                        st.session_state.average_team_overall = math.floor(total_overall / 11)
-                        st.success(
-                            f"Club data loaded: {loaded_data['club_details']['name'] or 'None'}, "
-                            f"{loaded_data['club_details']['league']}, "
-                            f"{loaded_data['club_details']['country']}, "
-                            f"European: {loaded_data['club_details']['european']}. "
-                            f"Stature: {calculate_score(loaded_data['club_details']['league'], loaded_data['club_details']['country'], loaded_data['club_details']['european'], league_tiers):.1f}"
-                        )
-                        st.info("Data loaded successfully. Visit the 'Club Details' and 'Starting 11' tabs to view or edit the loaded data.")
-                        # Clear apply_json_content to allow new input
-                        st.session_state.apply_json_content = ""
-                        st.rerun()
-                    else:
-                        st.error("Invalid JSON format or data. Ensure 'club_details' and 'starting_11' are correctly formatted.")
+                    json_content = uploaded_file.read().decode("utf-8")
+                    st.session_state.uploaded_json_content = json_content
+                    st.success("File uploaded successfully. Click 'Apply Uploaded JSON' to use.")
                 except json.JSONDecodeError:
-                    st.error("Invalid JSON text. Please paste or upload valid JSON data.")
+                    st.error("Invalid JSON file uploaded. Please upload a valid JSON file.")
                 except Exception as e:
-                    st.error(f"An error occurred while loading data: {str(e)}")
-            else:
-                st.warning("Please paste JSON text or apply uploaded file content to load.")
+                    st.error(f"Error reading file: {str(e)}")
 
-        # Show the "Click here to load data" message if applicable
-        if st.session_state.show_load_message:
-            st.markdown(
-                '<div class="load-message">Click here to load data</div>',
-                unsafe_allow_html=True
-            )
+            if st.session_state.uploaded_json_content:
+                if st.button("Apply Uploaded JSON", key="apply_uploaded_json"):
+                    # Set the content to be applied in the next run
+                    st.session_state.apply_json_content = st.session_state.uploaded_json_content
+                    st.session_state.uploaded_json_content = ""  # Clear uploaded content
+                    st.session_state.show_load_message = True  # Show the load message
+                    rerun()
+
+            if st.button("Load Data", key="load_data_button"):
+                st.session_state.show_load_message = False  # Clear the message
+                if json_input:
+                    load_started = time.perf_counter()
+                    try:
+                        loaded_data = json.loads(json_input)
+                        load_warnings = load_career_data(loaded_data)
+                        record_event(
+                            "load", duration=time.perf_counter() - load_started, payload_bytes=len(json_input),
+                            action="json", ok=load_warnings is not None
+                        )
+                        if load_warnings is not None:
+                            for warning in load_warnings:
+                                st.warning(warning)
+                            st.success(
+                                f"Club data loaded: {loaded_data['club_details']['name'] or 'None'}, "
+                                f"{loaded_data['club_details']['league']}, "
+                                f"{loaded_data['club_details']['country']}, "
+                                f"European: {loaded_data['club_details']['european']}. "
+                                f"Stature: {calculate_score(loaded_data['club_details']['league'], loaded_data['club_details']['country'], loaded_data['club_details']['european'], league_tiers):.1f}"
+                            )
+                            st.info("Data loaded successfully. Visit the 'Club Details' and 'Starting 11' tabs to view or edit the loaded data.")
+                            # Clear apply_json_content to allow new input
+                            st.session_state.apply_json_content = ""
+                            rerun()
+                        else:
+                            st.error("Invalid JSON format or data. Ensure 'club_details' and 'starting_11' are correctly formatted.")
+                    except json.JSONDecodeError:
+                        record_event("load", payload_bytes=len(json_input), action="json", ok=False)
+                        st.error("Invalid JSON text. Please paste or upload valid JSON data.")
+                    except Exception as e:
+                        st.error(f"An error occurred while loading data: {str(e)}")
+                else:
+                    st.warning("Please paste JSON text or apply uploaded file content to load.")
+
+            # Show the "Click here to load data" message if applicable
+            if st.session_state.show_load_message:
+                st.markdown(
+                    '<div class="load-message">Click here to load data</div>',
+                    unsafe_allow_html=True
+                )
 
 # Close the wrapper div
-st.markdown("</div>", unsafe_allow_html=True)
\ No newline at end of file
+st.markdown("</div>", unsafe_allow_html=True)
+
+record_rerun()
\ No newline at end of file
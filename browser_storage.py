@@ -0,0 +1,26 @@
+import json
+import os
+
+import streamlit.components.v1 as components
+
+# Browser storage for offline mode.
+#
+# A hidden component keeps a copy of the career in the browser's localStorage.
+# On the first run of a session it reports what the device has stored, so a
+# session that was lost on a flaky connection (or a server restart) can be
+# restored without re-loading a JSON file. After that it only writes: the app
+# passes the career on the reruns where it changed (None otherwise) and the
+# component stores it.
+
+STORAGE_KEY = "fifa-realistic-toolkit-career"
+
+_browser_storage = components.declare_component(
+    "browser_storage",
+    path=os.path.join(os.path.dirname(os.path.abspath(__file__)), "browser_storage_frontend")
+)
+
+def browser_storage(career, enabled, key="browser_storage"):
+    # Returns the stored {"enabled", "saved_at", "career"} record (or None)
+    # once the component has reported, and None before that
+    payload = json.dumps(career, sort_keys=True) if enabled and career is not None else None
+    return _browser_storage(storage_key=STORAGE_KEY, payload=payload, enabled=enabled, key=key, default=None)
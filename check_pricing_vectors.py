@@ -0,0 +1,410 @@
+"""Shared test vectors and a property runner for the Python and JavaScript pricing formulas.
+
+pricing_vectors.json holds inputs and expected outputs for stature scores,
+minimum offers, starting bids and proportional wages: a grid over the
+reference tables plus cases on and either side of every branch boundary in
+pricing.py (the halving for league tiers under 3, the stature difference bands
+at 0, 3.5, 7.0 and 12.0, the 16-24 / 25-29 age bands, equal and neighbouring
+overalls, the 1.2x wage bump and the rounding up to 100 and 1000). Floats are
+stored with full precision and compared bit for bit. This script checks
+pricing.py against them and, when Node.js is installed, pricing.js too, so the
+live client-side calculators always agree with the server to the last digit.
+
+The property runner draws random cases with a fixed seed, snapping part of them
+onto the branch boundaries, and checks invariants of the scalar functions. Given
+a candidate module it instead checks that module bit-for-bit against the scalar
+functions. A candidate defines any of these, taking and returning numpy arrays:
+
+    stature_score(league_tier, prestige, european) -> score
+    minimum_offer(player_value, stature_diff, is_young) -> offer
+    starting_bid(player_value, overall, age, average_team_overall) -> (bid, accurate)
+        (average_team_overall is NaN where unknown)
+    proportional_wage(overall, max_wage, max_wage_overall, max_overall) -> wage
+
+Usage:
+    python check_pricing_vectors.py                                  # check Python and JavaScript
+    python check_pricing_vectors.py --regenerate                     # rewrite vectors from pricing.py
+    python check_pricing_vectors.py --properties 1000000 --seed 7    # invariants on random cases
+    python check_pricing_vectors.py --properties 1000000 --candidate my_pricing
+"""
+import argparse
+import importlib
+import itertools
+import json
+import math
+import os
+import shutil
+import subprocess
+import sys
+import time
+
+import numpy as np
+
+from pricing import (
+    _minimum_offer,
+    _starting_bid,
+    _stature_score,
+    calculate_minimum_offer,
+    calculate_score,
+    calculate_starting_bid,
+    proportional_wage_from_anchor,
+    wage_anchor
+)
+from reference import reference_tables
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+VECTORS_PATH = os.path.join(BASE_DIR, "pricing_vectors.json")
+PRICING_JS_PATH = os.path.join(BASE_DIR, "pricing.js")
+
+# The scalar functions without their caches: the reference the property runner uses
+stature_reference = _stature_score.__wrapped__
+minimum_offer_reference = _minimum_offer.__wrapped__
+starting_bid_reference = _starting_bid.__wrapped__
+
+# Branch boundaries in pricing.py
+TIER_BOUNDARIES = [3.0]
+STATURE_DIFF_BOUNDARIES = [0.0, 3.5, 7.0, 12.0]
+AGE_BOUNDARIES = [16, 24, 25, 29]
+BID_MULTIPLIERS = [1.10, 1.30, 1.40, 1.50, 1.75, 2.00]
+
+def around(boundary):
+    # The boundary and the nearest floats either side of it
+    return [math.nextafter(boundary, -math.inf), boundary, math.nextafter(boundary, math.inf)]
+
+# Evaluates every vector with pricing.js and prints the results as JSON
+NODE_RUNNER = """
+const fs = require("fs");
+const Pricing = require(process.argv[1]);
+const vectors = JSON.parse(fs.readFileSync(process.argv[2], "utf8"));
+const results = {};
+results.score = vectors.score.map(v => Pricing.calculateScore(v.league, v.country, v.european, vectors.league_tiers, vectors.country_prestige));
+results.stature = vectors.stature.map(v =>
+    Pricing.calculateScore("league", "country", v.european, {league: v.tier}, {country: v.prestige}));
+results.minimum_offer = vectors.minimum_offer.map(v => {
+    const offer = Pricing.calculateMinimumOffer(v.value, v.stature_diff, v.is_young);
+    return [offer, Pricing.roundUp(offer, 1000)];
+});
+results.starting_bid = vectors.starting_bid.map(v => {
+    const [bid, accurate] = Pricing.calculateStartingBid(v.value, v.overall, v.age, v.average_team_overall);
+    return [bid, accurate, Pricing.roundUp(bid, 1000)];
+});
+results.proportional_wage = vectors.proportional_wage.map(v => {
+    const anchor = Pricing.wageAnchor(v.starting_11);
+    return anchor === null ? null : Pricing.proportionalWageFromAnchor(v.overall, anchor);
+});
+process.stdout.write(JSON.stringify(results));
+"""
+
+def python_results(vectors):
+    # Results through the public (cached) functions, so the caches are checked too
+    results = {}
+    results["score"] = [
+        calculate_score(v["league"], v["country"], v["european"], vectors["league_tiers"], vectors["country_prestige"])
+        for v in vectors["score"]
+    ]
+    results["stature"] = [
+        calculate_score("league", "country", v["european"], {"league": v["tier"]}, {"country": v["prestige"]})
+        for v in vectors["stature"]
+    ]
+    results["minimum_offer"] = []
+    for v in vectors["minimum_offer"]:
+        offer = calculate_minimum_offer(v["value"], v["stature_diff"], v["is_young"])
+        results["minimum_offer"].append([offer, math.ceil(offer / 1000) * 1000])
+    results["starting_bid"] = []
+    for v in vectors["starting_bid"]:
+        bid, accurate = calculate_starting_bid(v["value"], v["overall"], v["age"], v["average_team_overall"])
+        results["starting_bid"].append([bid, accurate, math.ceil(bid / 1000) * 1000])
+    results["proportional_wage"] = []
+    for v in vectors["proportional_wage"]:
+        anchor = wage_anchor(v["starting_11"])
+        results["proportional_wage"].append(None if anchor is None else proportional_wage_from_anchor(v["overall"], anchor))
+    return results
+
+def javascript_results(vectors_path):
+    node = shutil.which("node") or shutil.which("nodejs")
+    if node is None:
+        return None
+    output = subprocess.run(
+        [node, "-e", NODE_RUNNER, PRICING_JS_PATH, vectors_path],
+        check=True, capture_output=True, text=True
+    ).stdout
+    return json.loads(output)
+
+def build_vectors():
+    tables = reference_tables()
+    league_tiers = dict(tables.league_tiers)
+    country_prestige = dict(tables.country_prestige)
+    vectors = {"league_tiers": league_tiers, "country_prestige": country_prestige}
+    vectors["score"] = [
+        {"league": league, "country": country, "european": european}
+        for league, country, european in itertools.product(
+            list(league_tiers) + ["Unknown League"], list(country_prestige) + ["Unknown Country"], [False, True]
+        )
+    ]
+    # Raw tiers and prestige around the league score halving
+    tiers = [0.0, 0.5, 1.0, 2.0, 2.5] + [value for boundary in TIER_BOUNDARIES for value in around(boundary)] + [4.0, 10.0]
+    vectors["stature"] = [
+        {"tier": tier, "prestige": prestige, "european": european}
+        for tier, prestige, european in itertools.product(tiers, [0.0, 1.0, 2.5, 5.0], [False, True])
+    ]
+    values = [0.0, 1.0, 50000.0, 250000.0, 1234567.0, 9999999.99, 87500000.0]
+    stature_diffs = [-14.0, -3.5, 0.0, 0.5, 3.5, 3.6, 6.0, 7.0, 7.5, 10.0, 12.0, 14.5]
+    vectors["minimum_offer"] = [
+        {"value": value, "stature_diff": diff, "is_young": young}
+        for value, diff, young in itertools.product(values, stature_diffs, [False, True])
+    ]
+    boundary_values = [0.0, 1.0, 999.0, 1000.0, 1001.0, 100000.0, 250000.0, 1234567.89, 87500000.0, 1e12]
+    boundary_diffs = [-14.0, 0.5, 6.0, 24.0] + [value for boundary in STATURE_DIFF_BOUNDARIES for value in around(boundary)]
+    vectors["minimum_offer"] += [
+        {"value": value, "stature_diff": diff, "is_young": young}
+        for value, diff, young in itertools.product(boundary_values, boundary_diffs, [False, True])
+    ]
+    vectors["starting_bid"] = [
+        {"value": value, "overall": overall, "age": age, "average_team_overall": average}
+        for value, overall, age, average in itertools.product(
+            values, [55, 70, 71, 72, 90], [16, 21, 24, 25, 29, 30, 38], [None, 71]
+        )
+    ]
+    vectors["starting_bid"] += [
+        {"value": value, "overall": overall, "age": age, "average_team_overall": average}
+        for value, overall, age, average in itertools.product(
+            [0.0, 1.0, 1000.0, 1234567.89, 87500000.0], [69, 70, 71], [15] + AGE_BOUNDARIES + [17, 30, 40], [None, 70]
+        )
+    ]
+    squads = [
+        [],
+        [{"position": "GK", "overall": 0, "wage": 0}] * 11,
+        [{"position": "ST", "overall": 70 + i, "wage": 10000 + 2500 * i} for i in range(11)],
+        [{"position": "CB", "overall": 80 - i, "wage": 45000 if i == 3 else 20000} for i in range(11)],
+        [{"position": "CM", "overall": 64, "wage": 7300}, {"position": "ST", "overall": 77, "wage": 7300}]
+    ]
+    vectors["proportional_wage"] = [
+        {"overall": overall, "starting_11": squad}
+        for squad, overall in itertools.product(squads, [1, 45, 66, 77, 81, 99])
+    ]
+    # Squads giving each (max wage, its player's overall, best overall) anchor,
+    # priced at overalls either side of the 1.2x bump
+    anchors = [(10000, 50, 80), (10000, 70, 80), (45000, 77, 77), (7300, 64, 77), (1, 1, 1), (250000, 99, 99)]
+    anchor_squads = [
+        [{"position": "ST", "overall": max_wage_overall, "wage": max_wage}] +
+        ([{"position": "ST", "overall": max_overall, "wage": 1}] if max_overall != max_wage_overall else [])
+        for max_wage, max_wage_overall, max_overall in anchors
+    ]
+    vectors["proportional_wage"] += [
+        {"overall": overall, "starting_11": squad}
+        for squad, overall in itertools.product(anchor_squads, [1, 50, 63, 64, 65, 76, 77, 78, 80, 81, 99])
+    ]
+    return vectors
+
+def same_value(want, got):
+    if isinstance(want, list) and isinstance(got, list):
+        return len(want) == len(got) and all(map(same_value, want, got))
+    if isinstance(want, float) and isinstance(got, float):
+        # repr() round-trips exactly and tells apart floats == does not (-0.0)
+        return repr(want) == repr(got)
+    # JSON from Node.js turns whole floats into ints
+    return want == got and isinstance(want, bool) == isinstance(got, bool)
+
+def compare(expected, actual, label):
+    failures = 0
+    for kind, rows in expected.items():
+        for index, (want, got) in enumerate(zip(rows, actual[kind])):
+            if not same_value(want, got):
+                failures += 1
+                print(f"{label} {kind}[{index}]: expected {want!r}, got {got!r}")
+        if len(rows) != len(actual[kind]):
+            failures += 1
+            print(f"{label} {kind}: expected {len(rows)} results, got {len(actual[kind])}")
+    return failures
+
+# Property runner
+def random_cases(count, seed):
+    rng = np.random.default_rng(seed)
+
+    def snapped(values, boundaries, share=0.25):
+        # Move a share of the draws onto a boundary or its neighbours
+        if values.dtype.kind == "f":
+            points = np.array([value for boundary in boundaries for value in around(boundary)])
+        else:
+            points = np.array([boundary + step for boundary in boundaries for step in (-1, 0, 1)])
+        mask = rng.random(count) < share
+        values[mask] = rng.choice(points, mask.sum())
+        return values
+
+    # Round values (as in FIFA) and arbitrary ones
+    values = np.where(rng.random(count) < 0.5, rng.integers(0, 4000, count) * 25000.0, rng.random(count) * 2e8)
+    overalls = rng.integers(1, 100, count)
+    averages = rng.integers(40, 100, count).astype(float)
+    # Overall equal to the average for a share of the draws
+    averages[rng.random(count) < 0.2] = np.nan
+    equal = rng.random(count) < 0.2
+    averages[equal] = overalls[equal]
+    anchor_overalls = rng.integers(1, 100, count)
+    return {
+        "stature": (
+            snapped(rng.random(count) * 6.0, TIER_BOUNDARIES),
+            rng.integers(0, 11, count) / 2.0,
+            rng.random(count) < 0.5
+        ),
+        "minimum_offer": (values, snapped(rng.random(count) * 30.0 - 10.0, STATURE_DIFF_BOUNDARIES), rng.random(count) < 0.5),
+        "starting_bid": (
+            values, overalls, snapped(rng.integers(14, 41, count), AGE_BOUNDARIES, 0.5), averages
+        ),
+        "proportional_wage": (
+            overalls, rng.integers(1, 500, count) * 1000, anchor_overalls,
+            np.maximum(anchor_overalls, rng.integers(1, 100, count))
+        )
+    }
+
+def reference_results(cases):
+    tiers, prestiges, europeans = cases["stature"]
+    values, diffs, young = cases["minimum_offer"]
+    bid_values, overalls, ages, averages = cases["starting_bid"]
+    wage_overalls, max_wages, max_wage_overalls, max_overalls = cases["proportional_wage"]
+    bids = [
+        starting_bid_reference(value, overall, age, None if math.isnan(average) else int(average))
+        for value, overall, age, average in zip(bid_values.tolist(), overalls.tolist(), ages.tolist(), averages.tolist())
+    ]
+    return {
+        "stature": np.array(list(map(stature_reference, tiers.tolist(), prestiges.tolist(), europeans.tolist()))),
+        "minimum_offer": np.array(list(map(minimum_offer_reference, values.tolist(), diffs.tolist(), young.tolist()))),
+        "starting_bid": (np.array([bid for bid, _ in bids]), np.array([accurate for _, accurate in bids])),
+        "proportional_wage": np.array([
+            proportional_wage_from_anchor(overall, anchor)
+            for overall, *anchor in zip(wage_overalls.tolist(), max_wages.tolist(), max_wage_overalls.tolist(), max_overalls.tolist())
+        ])
+    }
+
+def check_properties(cases, results):
+    # Invariants the scalar functions must keep; returns failure messages
+    failures = []
+
+    def expect(name, holds):
+        if not np.all(holds):
+            failures.append(f"{name}: fails for {int(np.size(holds) - np.count_nonzero(holds)):,} case(s)")
+
+    tiers, prestiges, europeans = cases["stature"]
+    scores = results["stature"]
+    league_scores = np.where(tiers < 3, tiers / 2, tiers)
+    expect("stature is league score + prestige + European bonus", scores == league_scores + prestiges + europeans)
+    expect("stature never falls as the league tier rises", np.diff(np.array(list(map(
+        stature_reference, np.sort(tiers).tolist(), [1.0] * tiers.size, [False] * tiers.size
+    )))) >= 0)
+
+    values, diffs, young = cases["minimum_offer"]
+    offers = results["minimum_offer"]
+    positive = values > 0
+    expect("minimum offer is 1.15x to 1.90x the value", (offers[positive] >= values[positive] * 1.15 - 1e-6) & (offers[positive] <= values[positive] * 1.90 + 1e-6))
+    expect("minimum offer is zero for a zero value", offers[~positive] == 0)
+    higher = np.array(list(map(minimum_offer_reference, values.tolist(), (diffs + 0.25).tolist(), young.tolist())))
+    expect("minimum offer never rises with the stature difference", higher <= offers)
+    older = np.array(list(map(minimum_offer_reference, values.tolist(), diffs.tolist(), [False] * values.size)))
+    expect("young players never cost less", offers >= older)
+    rounded = np.ceil(offers / 1000) * 1000
+    expect("rounded minimum offer is the next multiple of 1000", (rounded >= offers) & (rounded - offers < 1000) & (rounded % 1000 == 0))
+
+    bid_values, overalls, ages, averages = cases["starting_bid"]
+    bids, accurate = results["starting_bid"]
+    expect("starting bid is a known multiple of the value", np.any(
+        [bids == bid_values * multiplier for multiplier in BID_MULTIPLIERS], axis=0
+    ))
+    expect("starting bid is accurate exactly when the average is known", accurate == ~np.isnan(averages))
+
+    wage_overalls, max_wages, max_wage_overalls, max_overalls = cases["proportional_wage"]
+    wages = results["proportional_wage"]
+    raw = max_wages * (wage_overalls / max_wage_overalls)
+    raw = np.where(wage_overalls > max_overalls, raw * 1.2, raw)
+    expect("proportional wage is rounded up to the next 100", (wages % 100 == 0) & (wages >= raw) & (wages - raw < 100))
+    return failures
+
+def check_candidate(candidate, cases, results):
+    # Bit-for-bit comparison of a candidate module against the scalar functions
+    failures = []
+    checked = 0
+
+    def same(name, want, got):
+        want = np.asarray(want)
+        got = np.asarray(got)
+        if want.shape != got.shape:
+            failures.append(f"{name}: expected shape {want.shape}, got {got.shape}")
+            return
+        if want.dtype.kind == "f" or got.dtype.kind == "f":
+            mismatched = np.asarray(want, dtype=np.float64).view(np.int64) != np.asarray(got, dtype=np.float64).view(np.int64)
+        else:
+            mismatched = want != got
+        if mismatched.any():
+            index = int(np.argmax(mismatched))
+            failures.append(f"{name}: {int(mismatched.sum()):,} mismatch(es), first at case {index}: expected {want[index].item()!r}, got {got[index].item()!r}")
+
+    if hasattr(candidate, "stature_score"):
+        same("stature_score", results["stature"], candidate.stature_score(*cases["stature"]))
+        checked += 1
+    if hasattr(candidate, "minimum_offer"):
+        same("minimum_offer", results["minimum_offer"], candidate.minimum_offer(*cases["minimum_offer"]))
+        checked += 1
+    if hasattr(candidate, "starting_bid"):
+        bids, accurate = candidate.starting_bid(*cases["starting_bid"])
+        same("starting_bid", results["starting_bid"][0], bids)
+        same("starting_bid accurate", results["starting_bid"][1], accurate)
+        checked += 1
+    if hasattr(candidate, "proportional_wage"):
+        same("proportional_wage", results["proportional_wage"], candidate.proportional_wage(*cases["proportional_wage"]))
+        checked += 1
+    if not checked:
+        failures.append("Candidate defines none of stature_score, minimum_offer, starting_bid or proportional_wage.")
+    return failures
+
+def run_properties(count, seed, candidate_name):
+    started = time.perf_counter()
+    cases = random_cases(count, seed)
+    results = reference_results(cases)
+    if candidate_name:
+        failures = check_candidate(importlib.import_module(candidate_name), cases, results)
+        label = f"{candidate_name} matches pricing.py bit for bit"
+    else:
+        failures = check_properties(cases, results)
+        label = "all properties hold"
+    for failure in failures:
+        print(failure)
+    elapsed = time.perf_counter() - started
+    if failures:
+        print(f"{len(failures)} failure(s) over {count:,} cases per formula (seed {seed}, {elapsed:.1f}s)")
+        sys.exit(1)
+    print(f"{count:,} cases per formula, {label} (seed {seed}, {elapsed:.1f}s)")
+
+def main():
+    parser = argparse.ArgumentParser(description="Check pricing.py and pricing.js against shared test vectors and random properties.")
+    parser.add_argument("--regenerate", action="store_true", help="Rewrite the vectors and expected results from pricing.py")
+    parser.add_argument("--properties", type=int, metavar="N", help="Run the property runner on N random cases per formula")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed for the property runner")
+    parser.add_argument("--candidate", help="Module to check bit for bit against pricing.py (with --properties)")
+    args = parser.parse_args()
+
+    if args.regenerate:
+        vectors = build_vectors()
+        vectors["expected"] = python_results(vectors)
+        with open(VECTORS_PATH, "w") as f:
+            json.dump(vectors, f, indent=1)
+            f.write("\n")
+        print(f"Wrote {sum(len(rows) for rows in vectors['expected'].values())} vectors to {VECTORS_PATH}")
+        return
+    if args.properties:
+        run_properties(args.properties, args.seed, args.candidate)
+        return
+
+    with open(VECTORS_PATH) as f:
+        vectors = json.load(f)
+    total = sum(len(rows) for rows in vectors["expected"].values())
+    failures = compare(vectors["expected"], python_results(vectors), "python")
+    js = javascript_results(VECTORS_PATH)
+    if js is None:
+        print("Node.js not found; skipped pricing.js")
+    else:
+        failures += compare(vectors["expected"], js, "javascript")
+    if failures:
+        print(f"{failures} mismatch(es) across {total} vectors")
+        sys.exit(1)
+    print(f"All {total} vectors match" + (" in Python and JavaScript" if js is not None else " in Python"))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+import bisect
+import csv
+import functools
+import math
+import os
+
+from pricing import calculate_minimum_offer, calculate_score
+from reference import reference_tables
+
+# Stature-aware club search.
+#
+# Loads a club database (club_data_sample.csv's schema) and sorts it once by
+# precomputed stature score. "Who can afford my player" queries are then two
+# binary searches for the stature range plus work proportional to the clubs
+# returned, instead of scoring and pricing every club in the database.
+
+CLUB_DATA_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "club_data_sample.csv")
+
+REQUIRED_COLUMNS = ["Club Name", "League", "Country"]
+
+def club_division(league, tables):
+    # Real league names are mapped onto the toolkit's leagues by the reference tables
+    return league if league in tables.league_tiers else tables.league_aliases.get(league, league)
+
+class ClubIndex:
+    def __init__(self, clubs, tables=None):
+        # clubs: dicts with name, league, country, european
+        tables = tables or reference_tables()
+        scored = []
+        for club in clubs:
+            division = club_division(club["league"], tables)
+            stature = calculate_score(division, club["country"], club["european"], tables.league_tiers, tables.country_prestige)
+            scored.append((stature, club["name"], dict(club, division=division, stature=stature)))
+        scored.sort(key=lambda entry: (entry[0], entry[1]))
+        self.statures = [stature for stature, _, _ in scored]
+        self.clubs = [club for _, _, club in scored]
+
+    def __len__(self):
+        return len(self.clubs)
+
+    def in_range(self, low, high):
+        # Clubs with low <= stature <= high, lowest stature first
+        start = bisect.bisect_left(self.statures, low)
+        end = bisect.bisect_right(self.statures, high)
+        return self.clubs[start:end]
+
+    def buyers(self, player_value, is_young, club_stature, min_diff=None, max_diff=None):
+        # Clubs whose stature difference to ours is within [min_diff, max_diff],
+        # highest stature (and so lowest minimum offer) first
+        low = -math.inf if min_diff is None else club_stature + min_diff
+        high = math.inf if max_diff is None else club_stature + max_diff
+        results = []
+        for club in reversed(self.in_range(low, high)):
+            stature_diff = club["stature"] - club_stature
+            minimum_offer = calculate_minimum_offer(player_value, stature_diff, is_young)
+            results.append(dict(club, stature_diff=stature_diff, minimum_offer=math.ceil(minimum_offer / 1000) * 1000))
+        return results
+
+def read_clubs(text_stream):
+    reader = csv.DictReader(text_stream)
+    missing = [column for column in REQUIRED_COLUMNS if column not in (reader.fieldnames or [])]
+    if missing:
+        raise ValueError(f"Missing column(s): {', '.join(missing)}.")
+    clubs = []
+    for row in reader:
+        # Short rows leave the missing cells as None
+        name, league, country = ((row.get(column) or "").strip() for column in REQUIRED_COLUMNS)
+        if not (name and league and country):
+            raise ValueError(f"Line {reader.line_num}: every club needs a Club Name, League and Country.")
+        try:
+            european = float(row.get("European Bonus") or 0) > 0
+        except (TypeError, ValueError):
+            european = False
+        clubs.append({"name": name, "league": league, "country": country, "european": european})
+    return clubs
+
+@functools.lru_cache(maxsize=8)
+def _load_club_index(path, modified, tables_modified):
+    with open(path, newline="", encoding="utf-8") as f:
+        return ClubIndex(read_clubs(f))
+
+def load_club_index(path=CLUB_DATA_PATH):
+    # Built once per version of the club file and of the reference tables,
+    # and shared by every session
+    return _load_club_index(path, os.path.getmtime(path), reference_tables().modified)
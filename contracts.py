@@ -0,0 +1,133 @@
+import collections
+import functools
+import math
+
+# Contract and amortisation planner.
+#
+# A signing's fee is spread evenly over its contract (straight-line
+# amortisation) and its wage is paid for every season of the contract. The
+# rest of the squad keeps its current wage bill. Projections are built from a
+# schedule matrix (one row per contract, one column per season from the
+# current one) summed and accumulated in single numpy passes.
+#
+# The schedule depends only on the contracts and the current season and the
+# growth factors only on the wage growth rate, so both are cached: moving the
+# season or growth sliders reuses them and only redoes the sums. numpy is
+# imported on first use, so loading saved contracts does not pay for it.
+
+WEEKS_PER_SEASON = 52
+MAX_SEASONS = 10
+MAX_CONTRACT_YEARS = 5
+MAX_FEE = 1e12
+CONTRACT_CACHE_SIZE = 256
+
+# start is the career season the contract begins in, so contracts run out as
+# the career moves on
+Contract = collections.namedtuple("Contract", ["name", "fee", "wage", "years", "start"])
+
+def read_contracts(rows):
+    # rows: dicts with name, fee, wage (p/w), years and start; raises ValueError
+    contracts = []
+    for number, row in enumerate(rows, start=1):
+        try:
+            name = row.get("name") if isinstance(row.get("name"), str) else ""
+            fee, wage = float(row["fee"]), int(row["wage"])
+            years, start = int(row["years"]), int(row["start"])
+        except (AttributeError, KeyError, TypeError, ValueError, OverflowError):
+            raise ValueError(f"Contract {number} is missing a fee, wage, length or start season.")
+        if not math.isfinite(fee) or fee > MAX_FEE:
+            raise ValueError(f"Contract {number} must have a fee no larger than {MAX_FEE:,.0f}.")
+        if fee < 0 or wage < 0:
+            raise ValueError(f"Contract {number} has a negative fee or wage.")
+        if not 1 <= years <= MAX_CONTRACT_YEARS:
+            raise ValueError(f"Contract {number} must run for 1 to {MAX_CONTRACT_YEARS} seasons.")
+        if start < 1:
+            raise ValueError(f"Contract {number} must start in season 1 or later.")
+        contracts.append(Contract(name, fee, wage, years, start))
+    return tuple(contracts)
+
+@functools.lru_cache(maxsize=CONTRACT_CACHE_SIZE)
+def contract_schedule(contracts, first_season=1):
+    # (amortisation, wages): contracts x MAX_SEASONS arrays of yearly costs for
+    # the seasons from first_season on
+    import numpy as np
+
+    if not contracts:
+        empty = np.zeros((0, MAX_SEASONS))
+        empty.flags.writeable = False
+        return empty, empty
+    fees, wages, years, starts = (np.array(column, dtype=np.float64) for column in list(zip(*contracts))[1:])
+    seasons = np.arange(first_season, first_season + MAX_SEASONS)
+    active = (seasons >= starts[:, None]) & (seasons < (starts + years)[:, None])
+    amortisation = np.where(active, (fees / years)[:, None], 0.0)
+    yearly_wages = np.where(active, (wages * WEEKS_PER_SEASON)[:, None], 0.0)
+    amortisation.flags.writeable = False
+    yearly_wages.flags.writeable = False
+    return amortisation, yearly_wages
+
+@functools.lru_cache(maxsize=CONTRACT_CACHE_SIZE)
+def growth_factors(wage_growth):
+    # Wage multiplier for each season at a yearly growth rate (0.03 = 3%)
+    import numpy as np
+
+    factors = (1.0 + wage_growth) ** np.arange(MAX_SEASONS)
+    factors.flags.writeable = False
+    return factors
+
+def project(contracts, squad_wage_bill, seasons, wage_growth=0.0, first_season=1):
+    # Yearly and cumulative costs for `seasons` seasons from first_season (the
+    # current career season); squad_wage_bill is the current squad's weekly wages
+    import numpy as np
+
+    amortisation, yearly_wages = contract_schedule(contracts, first_season)
+    factors = growth_factors(wage_growth)[:seasons]
+    fees = amortisation[:, :seasons].sum(axis=0)
+    signing_wages = yearly_wages[:, :seasons].sum(axis=0) * factors
+    squad_wages = squad_wage_bill * WEEKS_PER_SEASON * factors
+    total = fees + signing_wages + squad_wages
+    return {
+        "amortisation": fees,
+        "signing_wages": signing_wages,
+        "squad_wages": squad_wages,
+        "total": total,
+        "cumulative": np.cumsum(total)
+    }
+
+def projection_rows(projection, first_season):
+    return [
+        {
+            "season": first_season + index,
+            "amortisation": round(float(projection["amortisation"][index])),
+            "signing_wages": round(float(projection["signing_wages"][index])),
+            "squad_wages": round(float(projection["squad_wages"][index])),
+            "total": round(float(projection["total"][index])),
+            "cumulative": round(float(projection["cumulative"][index]))
+        }
+        for index in range(len(projection["total"]))
+    ]
+
+def contract_rows(contracts):
+    return [
+        {
+            "name": contract.name,
+            "yearly_amortisation": round(contract.fee / contract.years),
+            "yearly_wage": contract.wage * WEEKS_PER_SEASON,
+            "seasons": f"{contract.start}-{contract.start + contract.years - 1}",
+            "total_cost": round(contract.fee + contract.wage * WEEKS_PER_SEASON * contract.years)
+        }
+        for contract in contracts
+    ]
+
+def contract_cache_stats():
+    stats = {}
+    for name, cached in [("contract_schedule", contract_schedule), ("growth_factors", growth_factors)]:
+        info = cached.cache_info()
+        total = info.hits + info.misses
+        stats[name] = {
+            "hits": info.hits,
+            "misses": info.misses,
+            "hit_rate": info.hits / total if total else 0.0,
+            "size": info.currsize,
+            "max_size": info.maxsize,
+        }
+    return stats
@@ -0,0 +1,126 @@
+import itertools
+import math
+
+from ledger import window_limits
+
+# Career analytics rollups.
+#
+# Money and checklist rollups are kept by the transfer ledger itself, updated
+# as each row is appended, so they are read per season and window rather than
+# recomputed from transfer rows. The squad trend is one small record per
+# season (Starting 11 average, wage bill, squad size), refreshed only for the
+# current season and frozen when a new season starts. Building the dashboard
+# therefore costs one pass over the seasons, however long the career.
+
+# Revision numbers, unique across trends in this process
+_revisions = itertools.count(1)
+
+def _is_int(value):
+    return isinstance(value, int) and not isinstance(value, bool)
+
+class SeasonTrend:
+    def __init__(self):
+        # season -> (average_overall, wage_bill, squad_size)
+        self.seasons = {}
+        # Changes whenever a season's record changes
+        self.revision = next(_revisions)
+
+    def __len__(self):
+        return len(self.seasons)
+
+    def record(self, season, starting_11, squad):
+        # Returns True if the season's record changed
+        rated = [player for player in starting_11 if player["overall"] > 0]
+        average = math.floor(sum(player["overall"] for player in starting_11) / 11) if rated else None
+        wage_bill = sum(player["wage"] for player in starting_11) + sum(player["wage"] for player in squad)
+        record = (average, wage_bill, len(rated) + len(squad))
+        if self.seasons.get(season) == record:
+            return False
+        self.seasons[season] = record
+        self.revision = next(_revisions)
+        return True
+
+    def rows(self, through_season=None):
+        return [
+            {"season": season, "average_overall": average, "wage_bill": wage_bill, "squad_size": size}
+            for season, (average, wage_bill, size) in sorted(self.seasons.items())
+            if through_season is None or season <= through_season
+        ]
+
+    # Serialisation
+    def to_dict(self):
+        return {str(season): list(record) for season, record in self.seasons.items()}
+
+    @classmethod
+    def from_dict(cls, data):
+        if not isinstance(data, dict):
+            raise ValueError("Season trend data must be an object.")
+        trend = cls()
+        try:
+            for season, record in data.items():
+                average, wage_bill, size = record
+                if not (
+                    int(season) >= 1 and (average is None or _is_int(average)) and
+                    _is_int(wage_bill) and wage_bill >= 0 and _is_int(size) and size >= 0
+                ):
+                    raise ValueError(f"season {season} has an invalid record")
+                trend.seasons[int(season)] = (average, wage_bill, size)
+        except (TypeError, ValueError) as e:
+            raise ValueError(f"Invalid season trend data: {e}")
+        return trend
+
+def window_rows(ledger, through_season):
+    # Spend, income and checklist usage per transfer window
+    totals = ledger.window_totals()
+    rows = []
+    for season in range(1, through_season + 1):
+        checklist = ledger.checklist(season)
+        for window in ("summer", "winter"):
+            money = totals.get((season, window), {"spend": 0.0, "income": 0.0})
+            counts = checklist[window]
+            limits = window_limits(window, counts)
+            signings = counts["starting_signings"] + counts["bench_signings"] + counts["reserve_signings"]
+            rows.append({
+                "season": season,
+                "window": window,
+                "spend": money["spend"],
+                "income": money["income"],
+                "net_spend": money["spend"] - money["income"],
+                "signings": signings,
+                "signing_limit": limits["starting_signings"] + limits["bench_signings"] + limits["reserve_signings"],
+                "loans": counts["loans"],
+                "loan_limit": limits["loans"],
+                "sold": counts["starting_sold"]
+            })
+    return rows
+
+def compliance_rows(ledger, through_season):
+    rows = []
+    for season in range(1, through_season + 1):
+        breaches = ledger.breaches(season)
+        checklist = ledger.checklist(season)
+        rows.append({
+            "season": season,
+            "youth_promotions": checklist["youth_promotions"],
+            "breaches": breaches,
+            "compliant": not breaches
+        })
+    return rows
+
+def career_summary(ledger, through_season):
+    totals = ledger.season_totals()
+    seasons = [season for season in totals if season <= through_season]
+    return {
+        "spend": sum(totals[season]["spend"] for season in seasons),
+        "income": sum(totals[season]["income"] for season in seasons),
+        "compliant_seasons": sum(1 for season in range(1, through_season + 1) if not ledger.breaches(season))
+    }
+
+# Labels for checklist counters in breach messages
+COUNTER_LABELS = {
+    "starting_signings": "first team signings",
+    "bench_signings": "bench signings",
+    "reserve_signings": "reserve signings",
+    "loans": "loans",
+    "youth_promotions": "youth promotions"
+}
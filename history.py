@@ -0,0 +1,80 @@
+from collections import namedtuple
+
+# Undo/redo history for club details, Starting 11 and the checklist.
+#
+# Snapshots are immutable and share structure: a part of the state that did
+# not change between two snapshots is the same object in both, and each
+# Starting 11 player is shared individually. The checklist is derived from the
+# append-only transfer ledger, so a snapshot only stores the ledger's length
+# and the season. Hundreds of steps therefore cost kilobytes, not copies of the
+# whole career.
+
+MAX_HISTORY_STEPS = 500
+
+Snapshot = namedtuple("Snapshot", ["club_details", "starting_11", "season", "ledger_length"])
+
+def freeze(value):
+    if isinstance(value, dict):
+        return tuple((key, freeze(item)) for key, item in value.items())
+    if isinstance(value, list):
+        return tuple(freeze(item) for item in value)
+    return value
+
+def thaw_record(frozen):
+    return {key: value for key, value in frozen}
+
+def _share(new, old):
+    # Reuse the previous object when nothing changed
+    return old if new == old else new
+
+class History:
+    def __init__(self, max_steps=MAX_HISTORY_STEPS):
+        self.max_steps = max_steps
+        self.current = None
+        self.undo_stack = []
+        self.redo_stack = []
+
+    def snapshot(self, club_details, starting_11, season, ledger):
+        previous = self.current
+        frozen_club = freeze(club_details) if club_details is not None else None
+        frozen_11 = tuple(freeze(player) for player in starting_11) if starting_11 is not None else None
+        if previous is not None:
+            frozen_club = _share(frozen_club, previous.club_details)
+            if frozen_11 is not None and previous.starting_11 is not None and len(frozen_11) == len(previous.starting_11):
+                frozen_11 = tuple(_share(new, old) for new, old in zip(frozen_11, previous.starting_11))
+            frozen_11 = _share(frozen_11, previous.starting_11)
+        return Snapshot(frozen_club, frozen_11, season, len(ledger) if ledger is not None else None)
+
+    def track(self, snapshot):
+        # Called once per rerun; records a step only when the state changed
+        if self.current is None:
+            self.current = snapshot
+            return False
+        # Lazily initialised state appearing for the first time is not an edit
+        if all(old is None or old == new for old, new in zip(self.current, snapshot)):
+            self.current = snapshot
+            return False
+        self.undo_stack.append((self.current, None))
+        if len(self.undo_stack) > self.max_steps:
+            del self.undo_stack[0]
+        self.redo_stack.clear()
+        self.current = snapshot
+        return True
+
+    def _move(self, source, target, ledger):
+        previous, ledger_rows = source.pop()
+        removed = None
+        if ledger is not None and self.current.ledger_length is not None and previous.ledger_length is not None:
+            if previous.ledger_length < len(ledger):
+                removed = ledger.truncate(previous.ledger_length)
+            elif ledger_rows:
+                ledger.extend(ledger_rows)
+        target.append((self.current, removed))
+        self.current = previous
+        return previous
+
+    def undo(self, ledger):
+        return self._move(self.undo_stack, self.redo_stack, ledger) if self.undo_stack else None
+
+    def redo(self, ledger):
+        return self._move(self.redo_stack, self.undo_stack, ledger) if self.redo_stack else None
@@ -0,0 +1,51 @@
+import functools
+import html
+
+# Small HTML blocks for the checklist tallies and completion bars.
+#
+# Each block is built once per distinct set of counters and shared by every
+# session, and is styled by classes in app.py's stylesheet rather than inline
+# styles. A rerun then sends a short cached string whose content only changes
+# when the counters do.
+
+TALLY_HEADER = "<tr><th>Category</th><th>Current Count</th><th>Max Limit</th></tr>"
+
+@functools.lru_cache(maxsize=1024)
+def tally_table(rows):
+    # rows: tuple of (category, count, limit); a limit of None shows "-"
+    cells = "".join(
+        f"<tr><td>{html.escape(category)}</td><td>{count}</td><td>{'-' if limit is None else limit}</td></tr>"
+        for category, count, limit in rows
+    )
+    return f'<table class="tally">{TALLY_HEADER}{cells}</table>'
+
+@functools.lru_cache(maxsize=256)
+def progress_bar(label, percentage):
+    state = " complete" if percentage == 100 else ""
+    return (
+        f'<div class="progress-label">{html.escape(label)}: {percentage}%</div>'
+        f'<div class="custom-progress-container"><div class="custom-progress-bar{state}" style="width:{percentage}%"></div></div>'
+    )
+
+def window_tally(counts, starting_max, bench_max, reserve_max, loan_max):
+    return tally_table((
+        ("First Team Signings", counts["starting_signings"], starting_max),
+        ("Bench Signings", counts["bench_signings"], bench_max),
+        ("Reserve Signings", counts["reserve_signings"], reserve_max),
+        ("Loans", counts["loans"], loan_max),
+        ("Starting Players Sold", counts["starting_sold"], None)
+    ))
+
+def block_cache_stats():
+    stats = {}
+    for name, block in [("tally_table", tally_table), ("progress_bar", progress_bar)]:
+        info = block.cache_info()
+        total = info.hits + info.misses
+        stats[name] = {
+            "hits": info.hits,
+            "misses": info.misses,
+            "hit_rate": info.hits / total if total else 0.0,
+            "size": info.currsize,
+            "max_size": info.maxsize,
+        }
+    return stats
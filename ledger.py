@@ -0,0 +1,284 @@
+import itertools
+from array import array
+
+# Append-only transfer ledger for a career.
+#
+# Every signing, sale and youth promotion is appended as a row in compact
+# column arrays. Corrections are appended as reversal rows rather than editing
+# history. Rows are indexed by (season, window), and the checklist counters
+# and per-season spend are maintained incrementally as rows are appended, so
+# queries never rescan the whole career.
+
+WINDOWS = ("summer", "winter", "season")
+CATEGORIES = ("starting", "bench", "reserve", "sold", "youth")
+SIGNING_CATEGORIES = ("starting", "bench", "reserve")
+
+# Checklist counter incremented by each category
+CHECKLIST_COUNTERS = {
+    "starting": "starting_signings",
+    "bench": "bench_signings",
+    "reserve": "reserve_signings",
+    "sold": "starting_sold"
+}
+
+COLUMNS = ("season", "window", "category", "loan", "fee", "wage", "reverses", "player")
+
+# Checklist limits per transfer window. Two starting players sold in a window
+# unlock one extra first team and one extra bench signing.
+WINDOW_LIMITS = {
+    "summer": {"starting_signings": 2, "bench_signings": 2, "reserve_signings": 3, "loans": 3},
+    "winter": {"starting_signings": 1, "bench_signings": 1, "reserve_signings": 2, "loans": 1}
+}
+YOUTH_PROMOTION_MAX = 3
+
+# Revision numbers, unique across ledgers in this process
+_revisions = itertools.count(1)
+
+def window_limits(window, counts):
+    limits = dict(WINDOW_LIMITS[window])
+    if counts["starting_sold"] >= 2:
+        limits["starting_signings"] += 1
+        limits["bench_signings"] += 1
+    return limits
+
+def empty_window_counts():
+    return {
+        "starting_signings": 0,
+        "bench_signings": 0,
+        "reserve_signings": 0,
+        "loans": 0,
+        "starting_sold": 0
+    }
+
+class TransferLedger:
+    def __init__(self):
+        self.season = array("H")
+        self.window = array("B")
+        self.category = array("B")
+        self.loan = array("B")
+        self.fee = array("d")
+        self.wage = array("q")
+        self.reverses = array("l")
+        self.player = []
+        self._reversed = set()
+        self._index = {}
+        self._counts = {}
+        self._youth = {}
+        self._spend = {}
+        self._income = {}
+        self._window_spend = {}
+        self._window_income = {}
+        # Changes on every append and truncate, so callers can tell whether
+        # the ledger changed without comparing rows
+        self.revision = next(_revisions)
+
+    def __len__(self):
+        return len(self.season)
+
+    # Writing
+    def _append(self, season, window, category, player, fee, wage, loan, reverses):
+        row = len(self.season)
+        self.season.append(season)
+        self.window.append(WINDOWS.index(window))
+        self.category.append(CATEGORIES.index(category))
+        self.loan.append(1 if loan else 0)
+        self.fee.append(float(fee))
+        self.wage.append(int(wage))
+        self.reverses.append(reverses)
+        self.player.append(player)
+        self._index.setdefault((season, window), array("L")).append(row)
+        self._aggregate(row, 1)
+        self.revision = next(_revisions)
+        return row
+
+    def _aggregate(self, row, sign):
+        # Apply one row to the running totals (sign -1 takes it back out).
+        # A reversal row applies its original entry with the opposite sign.
+        source = row
+        if self.reverses[row] >= 0:
+            source = self.reverses[row]
+            sign = -sign
+        season = self.season[source]
+        window = WINDOWS[self.window[source]]
+        category = CATEGORIES[self.category[source]]
+        if category == "youth":
+            self._youth[season] = self._youth.get(season, 0) + sign
+            return
+        counts = self._counts.setdefault((season, window), empty_window_counts())
+        counts[CHECKLIST_COUNTERS[category]] += sign
+        if self.loan[source] and category in SIGNING_CATEGORIES:
+            counts["loans"] += sign
+        key = (season, window)
+        if category == "sold":
+            self._income[season] = self._income.get(season, 0.0) + sign * self.fee[source]
+            self._window_income[key] = self._window_income.get(key, 0.0) + sign * self.fee[source]
+        else:
+            self._spend[season] = self._spend.get(season, 0.0) + sign * self.fee[source]
+            self._window_spend[key] = self._window_spend.get(key, 0.0) + sign * self.fee[source]
+
+    def record(self, season, window, category, player="", fee=0.0, wage=0, loan=False):
+        if window not in WINDOWS:
+            raise ValueError(f"Unknown window: {window}")
+        if category not in CATEGORIES:
+            raise ValueError(f"Unknown category: {category}")
+        return self._append(season, window, category, player, fee, wage, loan, -1)
+
+    def reverse_last(self, season, window, category):
+        # Append a reversal of the latest live entry in this window and category
+        code = CATEGORIES.index(category)
+        for row in reversed(self._index.get((season, window), ())):
+            if self.reverses[row] < 0 and self.category[row] == code and row not in self._reversed:
+                self._reversed.add(row)
+                return self._append(
+                    season, window, category, self.player[row], self.fee[row], self.wage[row],
+                    self.loan[row], row
+                )
+        return None
+
+    def truncate(self, length):
+        # Drop rows after length (used by undo) and return them for extend()
+        removed = []
+        while len(self.season) > length:
+            row = len(self.season) - 1
+            self._aggregate(row, -1)
+            if self.reverses[row] >= 0:
+                self._reversed.discard(self.reverses[row])
+            self._index[(self.season[row], WINDOWS[self.window[row]])].pop()
+            removed.append(tuple(getattr(self, column)[row] for column in COLUMNS))
+            for column in COLUMNS:
+                getattr(self, column).pop()
+        removed.reverse()
+        self.revision = next(_revisions)
+        return removed
+
+    def extend(self, rows):
+        # Re-append rows returned by truncate() (used by redo)
+        for season, window, category, loan, fee, wage, reverses, player in rows:
+            if reverses >= 0:
+                self._reversed.add(reverses)
+            self._append(season, WINDOWS[window], CATEGORIES[category], player, fee, wage, loan, reverses)
+
+    # Queries
+    def checklist(self, season):
+        return {
+            "summer": dict(self._counts.get((season, "summer"), empty_window_counts())),
+            "winter": dict(self._counts.get((season, "winter"), empty_window_counts())),
+            "youth_promotions": self._youth.get(season, 0)
+        }
+
+    def net_spend(self, season):
+        return self._spend.get(season, 0.0) - self._income.get(season, 0.0)
+
+    def season_totals(self):
+        seasons = sorted(set(self._spend) | set(self._income) | set(self._youth))
+        return {
+            season: {
+                "spend": self._spend.get(season, 0.0),
+                "income": self._income.get(season, 0.0),
+                "net_spend": self.net_spend(season)
+            }
+            for season in seasons
+        }
+
+    def window_totals(self):
+        # Spend and income per (season, window) with any recorded transfers
+        keys = sorted(set(self._window_spend) | set(self._window_income) | set(self._counts))
+        return {
+            key: {"spend": self._window_spend.get(key, 0.0), "income": self._window_income.get(key, 0.0)}
+            for key in keys
+        }
+
+    def seasons(self):
+        return sorted({season for season, _ in self._counts} | set(self._youth) | set(self._spend) | set(self._income))
+
+    def breaches(self, season):
+        # Checklist limits exceeded in a season as (window, counter, count, limit)
+        found = []
+        for window in ("summer", "winter"):
+            counts = self._counts.get((season, window))
+            if counts is None:
+                continue
+            for counter, limit in window_limits(window, counts).items():
+                if counts[counter] > limit:
+                    found.append((window, counter, counts[counter], limit))
+        if self._youth.get(season, 0) > YOUTH_PROMOTION_MAX:
+            found.append(("season", "youth_promotions", self._youth[season], YOUTH_PROMOTION_MAX))
+        return found
+
+    def entries(self, season=None, window=None, include_reversed=False):
+        if season is None:
+            rows = range(len(self.season))
+        elif window is None:
+            rows = sorted(
+                row for (indexed_season, _), indexed_rows in self._index.items()
+                if indexed_season == season for row in indexed_rows
+            )
+        else:
+            rows = self._index.get((season, window), ())
+        result = []
+        for row in rows:
+            if not include_reversed and (self.reverses[row] >= 0 or row in self._reversed):
+                continue
+            result.append({
+                "season": self.season[row],
+                "window": WINDOWS[self.window[row]],
+                "category": CATEGORIES[self.category[row]],
+                "player": self.player[row],
+                "fee": self.fee[row],
+                "wage": self.wage[row],
+                "loan": bool(self.loan[row]),
+                "reversal": self.reverses[row] >= 0
+            })
+        return result
+
+    # Persistence as columns, so long careers stay small in saved JSON
+    def to_dict(self):
+        return {
+            "season": list(self.season),
+            "window": list(self.window),
+            "category": list(self.category),
+            "loan": list(self.loan),
+            "fee": list(self.fee),
+            "wage": list(self.wage),
+            "reverses": list(self.reverses),
+            "player": list(self.player)
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        if not isinstance(data, dict) or not all(isinstance(data.get(column), list) for column in COLUMNS):
+            raise ValueError("Ledger data must contain a list for every column.")
+        if len({len(data[column]) for column in COLUMNS}) != 1:
+            raise ValueError("Ledger columns must all have the same length.")
+        ledger = cls()
+        try:
+            for row in range(len(data["season"])):
+                reverses = data["reverses"][row]
+                if reverses >= 0:
+                    if reverses >= row or ledger.reverses[reverses] >= 0 or reverses in ledger._reversed:
+                        raise ValueError(f"Invalid reversal at ledger row {row}.")
+                    ledger._reversed.add(reverses)
+                ledger._append(
+                    data["season"][row], WINDOWS[data["window"][row]], CATEGORIES[data["category"][row]],
+                    str(data["player"][row]), data["fee"][row], data["wage"][row], data["loan"][row], reverses
+                )
+        except (IndexError, TypeError, OverflowError) as e:
+            raise ValueError(f"Invalid ledger data: {e}")
+        return ledger
+
+    @classmethod
+    def from_checklist(cls, checklist, season):
+        # Opening balance for saves made before the ledger existed
+        ledger = cls()
+        for window in ("summer", "winter"):
+            counts = checklist[window]
+            loans = counts["loans"]
+            for category in SIGNING_CATEGORIES:
+                for _ in range(counts[CHECKLIST_COUNTERS[category]]):
+                    ledger.record(season, window, category, loan=loans > 0)
+                    loans -= 1
+            for _ in range(counts["starting_sold"]):
+                ledger.record(season, window, "sold")
+        for _ in range(checklist["youth_promotions"]):
+            ledger.record(season, "season", "youth")
+        return ledger
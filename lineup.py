@@ -0,0 +1,116 @@
+import math
+
+# Best XI selector.
+#
+# Picks the Starting 11 for a formation from a larger squad as an assignment
+# problem: each formation slot gets one player, each player fills at most one
+# slot, and the total overall (and so the team average that drives the
+# average_team_overall + 2 signing cap) is maximised. Wages can be used as a
+# tie-break so the cheapest of equally strong line-ups wins. Solved with the
+# Hungarian algorithm, which is instant for squads of 60+.
+
+FORMATIONS = {
+    "4-4-2": ["GK", "LB", "CB", "CB", "RB", "LM", "CM", "CM", "RM", "ST", "ST"],
+    "4-3-3": ["GK", "LB", "CB", "CB", "RB", "CM", "CM", "CM", "LW", "ST", "RW"],
+    "4-2-3-1": ["GK", "LB", "CB", "CB", "RB", "CDM", "CDM", "LM", "CAM", "RM", "ST"],
+    "4-1-2-1-2": ["GK", "LB", "CB", "CB", "RB", "CDM", "CM", "CM", "CAM", "ST", "ST"],
+    "3-5-2": ["GK", "CB", "CB", "CB", "LWB", "CM", "CDM", "CM", "RWB", "ST", "ST"],
+    "5-3-2": ["GK", "LWB", "CB", "CB", "CB", "RWB", "CM", "CM", "CM", "ST", "ST"]
+}
+
+# Positions that can fill each slot when exact matches are not required
+POSITION_COMPATIBILITY = {
+    "GK": ["GK"],
+    "LB": ["LB", "LWB"],
+    "LWB": ["LWB", "LB"],
+    "CB": ["CB"],
+    "RB": ["RB", "RWB"],
+    "RWB": ["RWB", "RB"],
+    "CDM": ["CDM", "CM"],
+    "LM": ["LM", "LW"],
+    "CM": ["CM", "CDM", "CAM"],
+    "RM": ["RM", "RW"],
+    "CAM": ["CAM", "CM", "CF"],
+    "CF": ["CF", "ST", "CAM"],
+    "LW": ["LW", "LM"],
+    "ST": ["ST", "CF"],
+    "RW": ["RW", "RM"]
+}
+
+def hungarian(cost):
+    # Minimum-cost assignment of every row to a distinct column (rows <= columns).
+    # Returns the assigned column for each row.
+    rows = len(cost)
+    columns = len(cost[0]) if rows else 0
+    u = [0] * (rows + 1)
+    v = [0] * (columns + 1)
+    match = [0] * (columns + 1)
+    way = [0] * (columns + 1)
+    for row in range(1, rows + 1):
+        match[0] = row
+        column0 = 0
+        min_value = [math.inf] * (columns + 1)
+        used = [False] * (columns + 1)
+        while True:
+            used[column0] = True
+            row0 = match[column0]
+            delta = math.inf
+            column1 = 0
+            for column in range(1, columns + 1):
+                if not used[column]:
+                    current = cost[row0 - 1][column - 1] - u[row0] - v[column]
+                    if current < min_value[column]:
+                        min_value[column] = current
+                        way[column] = column0
+                    if min_value[column] < delta:
+                        delta = min_value[column]
+                        column1 = column
+            for column in range(columns + 1):
+                if used[column]:
+                    u[match[column]] += delta
+                    v[column] -= delta
+                else:
+                    min_value[column] -= delta
+            column0 = column1
+            if match[column0] == 0:
+                break
+        while column0:
+            column1 = way[column0]
+            match[column0] = match[column1]
+            column0 = column1
+    assignment = [None] * rows
+    for column in range(1, columns + 1):
+        if match[column]:
+            assignment[match[column] - 1] = column - 1
+    return assignment
+
+def best_lineup(squad, formation, exact_positions=False, minimise_wages=False):
+    # Returns the chosen squad index for each formation slot (None if no
+    # eligible player is left for that slot)
+    candidates = [index for index, player in enumerate(squad) if player["overall"] > 0]
+    if not candidates:
+        return [None] * len(formation)
+    # Overall dominates; wages only break ties when minimising wages
+    scale = max(squad[index]["wage"] for index in candidates) + 1 if minimise_wages else 1
+    infeasible = 100 * scale * (len(formation) + 1)
+    cost = []
+    for slot in formation:
+        allowed = [slot] if exact_positions else POSITION_COMPATIBILITY.get(slot, [slot])
+        row = []
+        for index in candidates:
+            player = squad[index]
+            if player["position"] in allowed:
+                row.append(-player["overall"] * scale + (player["wage"] if minimise_wages else 0))
+            else:
+                row.append(infeasible)
+        # Dummy columns so every slot can be left empty when the squad runs out
+        row.extend([infeasible] * len(formation))
+        cost.append(row)
+    assignment = hungarian(cost)
+    lineup = []
+    for slot, column in enumerate(assignment):
+        if column is None or column >= len(candidates) or cost[slot][column] >= infeasible:
+            lineup.append(None)
+        else:
+            lineup.append(candidates[column])
+    return lineup
@@ -0,0 +1,202 @@
+import collections
+import json
+import math
+import os
+
+import streamlit as st
+
+from pricing import calculate_minimum_offer, calculate_score, calculate_starting_bid, proportional_wage_from_anchor, wage_anchor
+from reference import reference_tables
+
+# Live transfer calculators.
+#
+# Renders the selling and buying calculators as a small HTML component that
+# runs pricing.js in the browser, so results update on every keystroke with no
+# server rerun. Club details, the Starting 11 average and the wage anchor are
+# passed in once when the component is drawn; the formulas themselves are kept
+# identical to pricing.py by check_pricing_vectors.py. Input events are
+# debounced, and a result is only recomputed when the inputs actually changed.
+#
+# The server-side live mode of the selling and buying calculators (no form to
+# submit) memoises results per session on the calculator inputs and the
+# career version: the club, Starting 11 average and wage anchor they depend
+# on. A rerun that leaves the inputs unchanged reuses the stored result.
+
+# Quiet time after the last keystroke before the browser calculators update
+DEBOUNCE_MS = 150
+# Results kept per session in live mode
+LIVE_RESULTS_SIZE = 64
+
+with open(os.path.join(os.path.dirname(os.path.abspath(__file__)), "pricing.js")) as _f:
+    PRICING_JS = _f.read()
+
+LIVE_CALCULATOR_HTML = """
+<style>
+    body { font-family: Arial, sans-serif; background-color: #1a2526; color: #ffffff; margin: 0; }
+    h4 { margin: 12px 0 6px 0; }
+    label { display: block; margin: 6px 0 2px 0; font-size: 0.9rem; }
+    input[type=number], select {
+        width: 100%; box-sizing: border-box; padding: 8px; font-size: 1rem;
+        background-color: #2c3e50; color: #ffffff; border: 1px solid #4a5b6c; border-radius: 0.5rem;
+    }
+    input[type=checkbox] { transform: scale(1.3); margin-right: 8px; }
+    .result { margin-top: 8px; padding: 8px; border-radius: 0.5rem; background-color: rgba(40, 167, 69, 0.25); }
+    .warning { margin-top: 8px; padding: 8px; border-radius: 0.5rem; background-color: rgba(255, 193, 7, 0.25); }
+    .hidden { display: none; }
+</style>
+<h4>Selling</h4>
+<label for="sell_league">Offering Club League</label><select id="sell_league"></select>
+<label for="sell_country">Offering Club Country</label><select id="sell_country"></select>
+<label><input type="checkbox" id="sell_european">Offering Club in European Competitions</label>
+<label for="sell_value">Player Value</label><input type="number" id="sell_value" min="0" step="1000" inputmode="decimal">
+<label><input type="checkbox" id="sell_young">Player Aged 16-21</label>
+<div id="sell_result" class="result hidden"></div>
+<h4>Buying</h4>
+<label for="buy_value">Player Value</label><input type="number" id="buy_value" min="0" step="1000" inputmode="decimal">
+<label for="buy_overall">Player Overall</label><input type="number" id="buy_overall" min="0" max="99" step="1" inputmode="numeric">
+<label for="buy_age">Player Age</label><input type="number" id="buy_age" min="16" max="40" step="1" value="16" inputmode="numeric">
+<div id="buy_result" class="result hidden"></div>
+<div id="buy_warning" class="warning hidden"></div>
+<script>
+__PRICING_JS__
+const data = __DATA__;
+const anchor = Pricing.wageAnchor(data.starting_11);
+const clubScore = Pricing.calculateScore(data.club.league, data.club.country, data.club.european, data.league_tiers, data.country_prestige);
+const el = id => document.getElementById(id);
+const money = value => value.toLocaleString("en-US", {maximumFractionDigits: 0});
+
+function fill(select, options) {
+    options.forEach(option => select.add(new Option(option, option)));
+}
+
+function show(id, text) {
+    el(id).textContent = text;
+    el(id).classList.toggle("hidden", !text);
+}
+
+function updateSelling() {
+    const value = parseFloat(el("sell_value").value) || 0;
+    if (value <= 0) {
+        show("sell_result", "");
+        return;
+    }
+    const offeringScore = Pricing.calculateScore(el("sell_league").value, el("sell_country").value, el("sell_european").checked, data.league_tiers, data.country_prestige);
+    const offer = Pricing.roundUp(Pricing.calculateMinimumOffer(value, offeringScore - clubScore, el("sell_young").checked), 1000);
+    show("sell_result", `Stature ${clubScore.toFixed(1)} vs ${offeringScore.toFixed(1)}. Accept offers of ${money(offer)} or higher.`);
+}
+
+function updateBuying() {
+    const value = parseFloat(el("buy_value").value) || 0;
+    const overall = parseInt(el("buy_overall").value) || 0;
+    const age = parseInt(el("buy_age").value) || 16;
+    if (value <= 0 || overall <= 0) {
+        show("buy_result", "");
+        show("buy_warning", "");
+        return;
+    }
+    const [bid, accurate] = Pricing.calculateStartingBid(value, overall, age, data.average_team_overall);
+    let text = `Start your bid at ${money(Pricing.roundUp(bid, 1000))}.`;
+    if (anchor !== null) {
+        text += ` Minimum Wage: ${money(Pricing.proportionalWageFromAnchor(overall, anchor))} p/w`;
+    }
+    show("buy_result", text);
+    const warnings = [];
+    if (data.average_team_overall !== null && overall > data.average_team_overall + 2) {
+        warnings.push("Player's overall is too high. Sign players with lower overall or update Starting 11.");
+    }
+    if (!accurate) {
+        warnings.push("Bid uses default markup. Calculate Starting 11 average for accuracy.");
+    }
+    if (anchor === null) {
+        warnings.push("No wage: enter a Starting 11 with non-zero wages and overalls.");
+    }
+    show("buy_warning", warnings.join(" "));
+}
+
+// Runs update once input has been quiet for the debounce time, and only if
+// the inputs differ from the last run
+function live(ids, update) {
+    let timer = null;
+    let last = null;
+    const run = () => {
+        const inputs = JSON.stringify(ids.map(id => el(id).type === "checkbox" ? el(id).checked : el(id).value));
+        if (inputs !== last) {
+            last = inputs;
+            update();
+        }
+    };
+    ids.forEach(id => el(id).addEventListener("input", () => {
+        clearTimeout(timer);
+        timer = setTimeout(run, __DEBOUNCE_MS__);
+    }));
+}
+
+fill(el("sell_league"), Object.keys(data.league_tiers));
+fill(el("sell_country"), Object.keys(data.country_prestige));
+live(["sell_league", "sell_country", "sell_european", "sell_value", "sell_young"], updateSelling);
+live(["buy_value", "buy_overall", "buy_age"], updateBuying);
+</script>
+"""
+
+def render_live_calculators(club_details, average_team_overall, starting_11, height=720):
+    tables = reference_tables()
+    data = {
+        "club": club_details,
+        "average_team_overall": average_team_overall,
+        "starting_11": [{"overall": player["overall"], "wage": player["wage"]} for player in starting_11],
+        "league_tiers": dict(tables.league_tiers),
+        "country_prestige": dict(tables.country_prestige)
+    }
+    # Escape "</" so club names cannot close the script tag
+    html = (
+        LIVE_CALCULATOR_HTML.replace("__PRICING_JS__", PRICING_JS)
+        .replace("__DEBOUNCE_MS__", str(DEBOUNCE_MS))
+        .replace("__DATA__", json.dumps(data).replace("</", "<\\/"))
+    )
+    st.iframe(html, height=height)
+
+def career_version(club_details, average_team_overall, starting_11):
+    # Everything besides the calculator inputs that live results depend on
+    return (
+        reference_tables().version,
+        club_details["league"],
+        club_details["country"],
+        bool(club_details["european"]),
+        average_team_overall,
+        wage_anchor(starting_11)
+    )
+
+def selling_result(club_details, league, country, european, player_value, is_young):
+    # (your stature, offering club's stature, minimum offer rounded up to 1,000)
+    tables = reference_tables()
+    score1 = calculate_score(club_details["league"], club_details["country"], club_details["european"], tables.league_tiers)
+    score2 = calculate_score(league, country, european, tables.league_tiers)
+    minimum_offer = calculate_minimum_offer(player_value, score2 - score1, is_young)
+    return score1, score2, math.ceil(minimum_offer / 1000) * 1000
+
+def buying_result(player_value, player_overall, player_age, average_team_overall, starting_11):
+    # (starting bid rounded up to 1,000, bid is accurate, minimum wage or None)
+    starting_bid, is_accurate = calculate_starting_bid(player_value, player_overall, player_age, average_team_overall)
+    anchor = wage_anchor(starting_11)
+    wage = proportional_wage_from_anchor(player_overall, anchor) if anchor is not None else None
+    return math.ceil(starting_bid / 1000) * 1000, is_accurate, wage
+
+class LiveResults:
+    # A session's recent live calculator results, least recently used first
+    def __init__(self, size=LIVE_RESULTS_SIZE):
+        self.size = size
+        self.results = collections.OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key, compute):
+        # Returns (result, True if it was reused)
+        if key in self.results:
+            self.results.move_to_end(key)
+            self.hits += 1
+            return self.results[key], True
+        result = self.results[key] = compute()
+        self.misses += 1
+        if len(self.results) > self.size:
+            self.results.popitem(last=False)
+        return result, False
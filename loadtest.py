@@ -0,0 +1,221 @@
+"""Local load test for the FIFA Realistic Toolkit.
+
+Simulates many concurrent Streamlit sessions with Streamlit's AppTest driver.
+Each simulated session replays realistic interaction scripts (club details,
+Starting 11, checklist buttons, transfer calculators and Save/Load) and every
+rerun is timed. Reports p50/p95/p99 rerun latency and per-session memory.
+
+Usage:
+    python loadtest.py --sessions 200 --concurrency 50
+"""
+import argparse
+import math
+import os
+import pickle
+import random
+import resource
+import statistics
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from streamlit import config
+from streamlit.runtime.runtime import Runtime
+from streamlit.runtime.scriptrunner.script_cache import ScriptCache
+from streamlit.testing.v1 import AppTest
+
+APP_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "app.py")
+
+# AppTest is built for one session at a time. It installs a mock Runtime
+# singleton at the start of each run and clears it at the end, which breaks runs
+# in other threads. Keep the most recent mock available so concurrent sessions
+# can share it, as they would share one server.
+_shared_runtime = None
+
+def _shared_runtime_instance(cls):
+    global _shared_runtime
+    if cls._instance is not None:
+        _shared_runtime = cls._instance
+    if _shared_runtime is None:
+        raise RuntimeError("Runtime hasn't been created!")
+    return _shared_runtime
+
+# AppTest also builds a fresh ScriptCache per run, recompiling app.py every
+# rerun. A real server compiles once, and concurrent ast.parse calls are not
+# thread-safe on every Python version, so compile once under a lock.
+_bytecode_lock = threading.Lock()
+_bytecode = {}
+_original_get_bytecode = ScriptCache.get_bytecode
+
+def _shared_get_bytecode(self, script_path):
+    with _bytecode_lock:
+        if script_path not in _bytecode:
+            _bytecode[script_path] = _original_get_bytecode(self, script_path)
+        return _bytecode[script_path]
+
+def patch_apptest_for_concurrency():
+    # AppTest toggles this option around each run; a run finishing in one
+    # thread would switch it off for runs still in progress in others
+    config.set_option("global.appTest", True)
+    Runtime.instance = classmethod(_shared_runtime_instance)
+    Runtime.exists = classmethod(lambda cls: cls._instance is not None or _shared_runtime is not None)
+    ScriptCache.get_bytecode = _shared_get_bytecode
+
+# Interaction scripts: each step mutates widgets and returns the rerun to time
+def _button(at, label):
+    return next(button for button in at.button if button.label == label)
+
+def script_club_details(at, rng):
+    at.text_input(key="club_name").input(f"Club {rng.randint(1, 9999)}")
+    at.selectbox(key="form_league").select(rng.choice(at.selectbox(key="form_league").options))
+    at.selectbox(key="club_country").select(rng.choice(at.selectbox(key="club_country").options))
+    at.checkbox(key="club_european").set_value(rng.random() < 0.5)
+    yield "club_details_submit", _button(at, "Save Club Details").click()
+
+def script_starting_11(at, rng):
+    for i in range(11):
+        at.number_input(key=f"player_{i}_overall").set_value(rng.randint(60, 90))
+        at.number_input(key=f"player_{i}_wage").set_value(rng.randrange(10000, 200000, 1000))
+    yield "starting_11_submit", _button(at, "Calculate Team Overall").click()
+
+def script_checklist(at, rng):
+    window = rng.choice(["summer", "winter"])
+    category = rng.choice(["starting", "bench", "reserve"])
+    yield "checklist_signing", at.button(key=f"{window}_signing_question").click()
+    yield "checklist_category", at.button(key=f"{window}_{category}_add").click()
+    yield "checklist_loan", at.button(key=f"{window}_loan_{rng.choice(['yes', 'no'])}").click()
+    yield "checklist_sale", at.button(key=f"{window}_sale_add").click()
+    yield "checklist_youth", at.button(key="youth_promotion_add").click()
+
+def script_calculators(at, rng):
+    at.number_input(key="player_value_sell").set_value(float(rng.randrange(100000, 50000000, 1000)))
+    at.checkbox(key="is_young_sell").set_value(rng.random() < 0.3)
+    yield "selling_calculator", _button(at, "Calculate Selling Offer").click()
+    at.number_input(key="player_value_buy").set_value(float(rng.randrange(100000, 50000000, 1000)))
+    at.number_input(key="player_overall_buy").set_value(rng.randint(50, 90))
+    at.number_input(key="player_age_buy").set_value(rng.randint(16, 35))
+    yield "buying_calculator", _button(at, "Calculate Bid and Wage").click()
+
+def script_save_load(at, rng):
+    saved = at.text_area(key="save_json").value
+    at.text_area(key="load_json").input(saved)
+    yield "save_load", at.button(key="load_data_button").click()
+
+SCRIPTS = {
+    "club_details": script_club_details,
+    "starting_11": script_starting_11,
+    "checklist": script_checklist,
+    "calculators": script_calculators,
+    "save_load": script_save_load,
+}
+
+# Only the open tab is rendered, so each script first switches to its tab
+SCRIPT_TABS = {
+    "club_details": "Club Details",
+    "starting_11": "Starting 11",
+    "checklist": "Career Checklist",
+    "calculators": "Transfer Calculators",
+    "save_load": "Save/Load",
+}
+
+# Measurement helpers
+def session_state_bytes(at):
+    state = {}
+    for key in at.session_state.keys():
+        try:
+            state[key] = pickle.dumps(at.session_state[key])
+        except Exception:
+            continue
+    return sum(len(value) for value in state.values())
+
+def percentile(samples, pct):
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    # Nearest-rank percentile
+    rank = math.ceil(pct / 100 * len(ordered))
+    return ordered[max(rank, 1) - 1]
+
+def peak_rss_mb():
+    # ru_maxrss is kilobytes on Linux and bytes on macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if os.uname().sysname == "Darwin" else peak / 1024
+
+def run_session(session_id, scripts, iterations, seed, timeout):
+    rng = random.Random(seed + session_id)
+    timings = []
+    errors = []
+    at = AppTest.from_file(APP_PATH, default_timeout=timeout)
+    start = time.perf_counter()
+    at.run()
+    timings.append(("initial_load", time.perf_counter() - start))
+    for _ in range(iterations):
+        for name in rng.sample(scripts, len(scripts)):
+            if at.session_state["active_tab"] != SCRIPT_TABS[name]:
+                at.session_state["active_tab"] = SCRIPT_TABS[name]
+                start = time.perf_counter()
+                at.run()
+                timings.append(("switch_tab", time.perf_counter() - start))
+            try:
+                for step, pending in SCRIPTS[name](at, rng):
+                    start = time.perf_counter()
+                    pending.run()
+                    timings.append((step, time.perf_counter() - start))
+                    if at.exception:
+                        errors.append(f"{step}: {at.exception[0].value}")
+            except (StopIteration, KeyError) as e:
+                errors.append(f"{name}: widget not found ({e})")
+    return timings, session_state_bytes(at), errors
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test the Streamlit app with simulated sessions.")
+    parser.add_argument("--sessions", type=int, default=100, help="Number of simulated sessions")
+    parser.add_argument("--concurrency", type=int, default=20, help="Sessions running at the same time")
+    parser.add_argument("--iterations", type=int, default=1, help="Times each session replays its scripts")
+    parser.add_argument("--scripts", nargs="*", default=list(SCRIPTS), choices=list(SCRIPTS),
+                        help="Interaction scripts to replay (none to measure cold start only)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--timeout", type=float, default=60.0, help="Per-rerun timeout in seconds")
+    args = parser.parse_args()
+
+    patch_apptest_for_concurrency()
+    results = []
+    lock = threading.Lock()
+    wall_start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+        futures = [
+            pool.submit(run_session, session_id, args.scripts, args.iterations, args.seed, args.timeout)
+            for session_id in range(args.sessions)
+        ]
+        for future in futures:
+            result = future.result()
+            with lock:
+                results.append(result)
+    wall_time = time.perf_counter() - wall_start
+
+    by_step = {}
+    all_timings = []
+    for timings, _, _ in results:
+        for step, duration in timings:
+            by_step.setdefault(step, []).append(duration * 1000)
+            all_timings.append(duration * 1000)
+    memory = [state_bytes / 1024 for _, state_bytes, _ in results]
+    errors = [error for _, _, session_errors in results for error in session_errors]
+
+    print(f"Sessions: {args.sessions}  Concurrency: {args.concurrency}  Reruns: {len(all_timings)}  Wall time: {wall_time:.1f}s")
+    print(f"Throughput: {len(all_timings) / wall_time:.1f} reruns/s")
+    print()
+    print(f"{'Step':<22}{'Count':>7}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}")
+    for step, samples in sorted(by_step.items()) + [("ALL", all_timings)]:
+        print(f"{step:<22}{len(samples):>7}{percentile(samples, 50):>10.1f}{percentile(samples, 95):>10.1f}{percentile(samples, 99):>10.1f}")
+    print()
+    print(f"Session state per session: mean {statistics.mean(memory):.1f} KiB, max {max(memory):.1f} KiB")
+    print(f"Process peak RSS: {peak_rss_mb():.0f} MiB")
+    if errors:
+        print()
+        print(f"{len(errors)} errors (first 10):")
+        for error in errors[:10]:
+            print(f"  {error}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+// Client-side copy of the pricing formulas in pricing.py, used by the live
+// calculators so results update as the user types without a server rerun.
+// Keep every expression in the same order as the Python version so both give
+// identical floating-point results; check_pricing_vectors.py verifies both
+// against pricing_vectors.json.
+
+const Pricing = (function () {
+    function stature(leagueTier, prestige, european) {
+        let leagueScore = leagueTier;
+        if (leagueTier < 3) {
+            leagueScore /= 2;
+        }
+        const europeanBonus = european ? 1.0 : 0.0;
+        return leagueScore + prestige + europeanBonus;
+    }
+
+    function calculateScore(league, country, european, leagueTiers, countryPrestige) {
+        const tier = league in leagueTiers ? leagueTiers[league] : 1;
+        const prestige = country in countryPrestige ? countryPrestige[country] : 1;
+        return stature(tier, prestige, Boolean(european));
+    }
+
+    function calculateMinimumOffer(playerValue, statureDiff, isYoung) {
+        let markup;
+        if (statureDiff <= 0) {
+            markup = 65.0;
+        } else {
+            markup = 65.0 - (statureDiff / 12.0) * 50.0;
+            markup = Math.max(markup, 15.0);
+        }
+        const multiplier = 1.0 + markup / 100.0;
+        let ageMarkup;
+        if (isYoung) {
+            if (statureDiff <= 0 || statureDiff <= 3.5) {
+                ageMarkup = 0.25;
+            } else if (statureDiff <= 7.0) {
+                ageMarkup = 0.18;
+            } else {
+                ageMarkup = 0.12;
+            }
+        } else {
+            ageMarkup = 0.0;
+        }
+        return playerValue * multiplier + playerValue * ageMarkup;
+    }
+
+    // Returns [bid, isAccurate] like the Python tuple
+    function calculateStartingBid(playerValue, playerOverall, playerAge, averageTeamOverall) {
+        const known = averageTeamOverall !== null && averageTeamOverall !== undefined;
+        if (playerAge >= 16 && playerAge <= 24) {
+            if (!known) {
+                return [playerValue * 1.75, false];
+            } else if (playerOverall > averageTeamOverall) {
+                return [playerValue * 2.00, true];
+            } else if (playerOverall === averageTeamOverall) {
+                return [playerValue * 1.75, true];
+            } else {
+                return [playerValue * 1.50, true];
+            }
+        } else if (playerAge >= 25 && playerAge <= 29) {
+            if (!known) {
+                return [playerValue * 1.75, false];
+            } else if (playerOverall > averageTeamOverall) {
+                return [playerValue * 1.40, true];
+            } else if (playerOverall === averageTeamOverall) {
+                return [playerValue * 1.30, true];
+            } else {
+                return [playerValue * 1.10, true];
+            }
+        } else {
+            return [playerValue * 1.30, known];
+        }
+    }
+
+    // [maxWage, maxWageOverall, maxOverall] or null, like pricing.wage_anchor
+    function wageAnchor(starting11) {
+        const valid = starting11.filter(function (player) {
+            return player.overall > 0 && player.wage > 0;
+        });
+        if (valid.length === 0) {
+            return null;
+        }
+        const maxWage = Math.max.apply(null, valid.map(function (player) { return player.wage; }));
+        const maxWageOverall = valid.find(function (player) { return player.wage === maxWage; }).overall;
+        const maxOverall = Math.max.apply(null, valid.map(function (player) { return player.overall; }));
+        return [maxWage, maxWageOverall, maxOverall];
+    }
+
+    function proportionalWageFromAnchor(playerOverall, anchor) {
+        let wage = anchor[0] * (playerOverall / anchor[1]);
+        if (playerOverall > anchor[2]) {
+            wage *= 1.2;
+        }
+        return Math.ceil(wage / 100) * 100;
+    }
+
+    function roundUp(value, step) {
+        return Math.ceil(value / step) * step;
+    }
+
+    return {
+        calculateScore: calculateScore,
+        calculateMinimumOffer: calculateMinimumOffer,
+        calculateStartingBid: calculateStartingBid,
+        wageAnchor: wageAnchor,
+        proportionalWageFromAnchor: proportionalWageFromAnchor,
+        roundUp: roundUp
+    };
+})();
+
+if (typeof module !== "undefined") {
+    module.exports = Pricing;
+}
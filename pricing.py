@@ -0,0 +1,129 @@
+import functools
+import math
+
+from reference import reference_tables
+
+# Pricing functions live in their own module so Streamlit imports them once per
+# server process. app.py is re-executed on every rerun, so caches defined there
+# would be thrown away; caches defined here are shared by every session.
+
+# Maximum number of entries kept per cached lookup before LRU eviction
+PRICING_CACHE_SIZE = 4096
+
+# Cached lookups
+@functools.lru_cache(maxsize=PRICING_CACHE_SIZE)
+def _stature_score(league_tier, prestige, european):
+    league_score = league_tier
+    if league_tier < 3:
+        league_score /= 2
+    european_bonus = 1.0 if european else 0.0
+    return league_score + prestige + european_bonus
+
+@functools.lru_cache(maxsize=PRICING_CACHE_SIZE)
+def _minimum_offer(player_value, stature_diff, is_young):
+    if stature_diff <= 0:
+        markup = 65.0
+    else:
+        markup = 65.0 - (stature_diff / 12.0) * 50.0
+        markup = max(markup, 15.0)
+    multiplier = 1.0 + markup / 100.0
+    if is_young:
+        if stature_diff <= 0 or stature_diff <= 3.5:
+            age_markup = 0.25
+        elif stature_diff <= 7.0:
+            age_markup = 0.18
+        else:
+            age_markup = 0.12
+    else:
+        age_markup = 0.0
+    return player_value * multiplier + player_value * age_markup
+
+@functools.lru_cache(maxsize=PRICING_CACHE_SIZE)
+def _starting_bid(player_value, player_overall, player_age, average_team_overall):
+    if player_age >= 16 and player_age <= 24:
+        if average_team_overall is None:
+            return player_value * 1.75, False
+        elif player_overall > average_team_overall:
+            return player_value * 2.00, True
+        elif player_overall == average_team_overall:
+            return player_value * 1.75, True
+        else:
+            return player_value * 1.50, True
+    elif player_age >= 25 and player_age <= 29:
+        if average_team_overall is None:
+            return player_value * 1.75, False
+        elif player_overall > average_team_overall:
+            return player_value * 1.40, True
+        elif player_overall == average_team_overall:
+            return player_value * 1.30, True
+        else:
+            return player_value * 1.10, True
+    else:
+        return player_value * 1.30, average_team_overall is not None
+
+# Function definitions
+def calculate_score(league, country, european, league_tiers, country_prestige=None):
+    # Keyed on the resolved tier and prestige so the cache stays valid
+    # whichever mapping the caller passes in (or the reference tables reload)
+    if country_prestige is None:
+        country_prestige = reference_tables().country_prestige
+    return _stature_score(league_tiers.get(league, 1), country_prestige.get(country, 1), bool(european))
+
+def calculate_minimum_offer(player_value, stature_diff, is_young):
+    return _minimum_offer(player_value, stature_diff, bool(is_young))
+
+def calculate_starting_bid(player_value, player_overall, player_age, average_team_overall=None):
+    return _starting_bid(player_value, player_overall, player_age, average_team_overall)
+
+def calculate_proportional_wage(player_overall, starting_11):
+    anchor = wage_anchor(starting_11)
+    if anchor is None:
+        return None, "No valid Starting 11 data with non-zero wages and overalls."
+    return proportional_wage_from_anchor(player_overall, anchor), None
+
+# Split out so callers pricing many players against the same Starting 11
+# only derive the anchor once
+def wage_anchor(starting_11):
+    valid_players = [
+        player for player in starting_11
+        if player["overall"] > 0 and player["wage"] > 0
+    ]
+    if not valid_players:
+        return None
+    max_wage = max(player["wage"] for player in valid_players)
+    max_wage_players = [player for player in valid_players if player["wage"] == max_wage]
+    max_wage_overall = max_wage_players[0]["overall"]
+    max_overall = max(player["overall"] for player in valid_players)
+    return max_wage, max_wage_overall, max_overall
+
+def proportional_wage_from_anchor(player_overall, anchor):
+    max_wage, max_wage_overall, max_overall = anchor
+    wage = max_wage * (player_overall / max_wage_overall)
+    if player_overall > max_overall:
+        wage *= 1.2
+    return math.ceil(wage / 100) * 100
+
+# Cache monitoring
+_cached_lookups = {
+    "calculate_score": _stature_score,
+    "calculate_minimum_offer": _minimum_offer,
+    "calculate_starting_bid": _starting_bid,
+}
+
+def pricing_cache_stats():
+    stats = {}
+    for name, lookup in _cached_lookups.items():
+        info = lookup.cache_info()
+        total = info.hits + info.misses
+        stats[name] = {
+            "hits": info.hits,
+            "misses": info.misses,
+            "hit_rate": info.hits / total if total else 0.0,
+            "size": info.currsize,
+            "max_size": info.maxsize,
+        }
+    return stats
+
+def clear_pricing_caches():
+    for lookup in _cached_lookups.values():
+        lookup.cache_clear()
@@ -0,0 +1,132 @@
+import functools
+import json
+import os
+import threading
+import time
+from collections import namedtuple
+from types import MappingProxyType
+
+# Reference tables.
+#
+# League tiers, scout scopes, league aliases, country prestige and player
+# positions are read from
+# reference_tables.json into an immutable registry (read-only mappings and
+# tuples) shared by every session. The file's modification time is checked at
+# most every RELOAD_CHECK_SECONDS, so editing the file takes effect on the next
+# rerun without a restart, while lookups stay plain dict/tuple operations. A
+# broken edit is reported and the last good tables stay in use.
+
+REFERENCE_PATH = os.environ.get(
+    "FIFA_TOOLKIT_REFERENCE",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "reference_tables.json")
+)
+RELOAD_CHECK_SECONDS = 2.0
+
+# Scout assignment scopes, widest first (see scouting.SCOUT_PERMISSIONS)
+SCOUT_SCOPES = ("worldwide", "continent_neighbours", "continent", "country_neighbours", "country")
+
+ReferenceTables = namedtuple(
+    "ReferenceTables",
+    [
+        "version", "modified", "league_tiers", "scout_scopes", "league_aliases",
+        "country_prestige", "player_positions", "default_positions"
+    ]
+)
+
+def _weights(data, name):
+    table = data.get(name)
+    if not isinstance(table, dict) or not table:
+        raise ValueError(f"'{name}' must be a non-empty object.")
+    for key, value in table.items():
+        if isinstance(value, bool) or not isinstance(value, (int, float)) or value < 0:
+            raise ValueError(f"'{name}' value for {key!r} must be a number of 0 or more.")
+    return MappingProxyType(dict(table))
+
+def _scout_scopes(data, league_tiers):
+    # league -> (scope without European football, scope with it)
+    table = data.get("scout_scopes")
+    if not isinstance(table, dict):
+        raise ValueError("'scout_scopes' must be an object.")
+    missing = [league for league in league_tiers if league not in table]
+    if missing:
+        raise ValueError(f"'scout_scopes' has no entry for league(s): {', '.join(missing)}.")
+    scopes = {}
+    for league, entry in table.items():
+        if league not in league_tiers:
+            raise ValueError(f"'scout_scopes' names unknown league {league!r}.")
+        if not isinstance(entry, dict) or any(entry.get(key) not in SCOUT_SCOPES for key in ("domestic", "european")):
+            raise ValueError(
+                f"'scout_scopes' for {league!r} needs 'domestic' and 'european' scopes from: {', '.join(SCOUT_SCOPES)}."
+            )
+        scopes[league] = (entry["domestic"], entry["european"])
+    return MappingProxyType(scopes)
+
+def _league_aliases(data, league_tiers):
+    # Real league names mapped onto the toolkit's leagues (optional)
+    table = data.get("league_aliases", {})
+    if not isinstance(table, dict):
+        raise ValueError("'league_aliases' must be an object.")
+    for alias, league in table.items():
+        if alias in league_tiers:
+            raise ValueError(f"'league_aliases' entry {alias!r} is already a league.")
+        if league not in league_tiers:
+            raise ValueError(f"'league_aliases' maps {alias!r} to unknown league {league!r}.")
+    return MappingProxyType(dict(table))
+
+def parse_reference_tables(data, modified=None):
+    if not isinstance(data, dict):
+        raise ValueError("Reference tables must be a JSON object.")
+    positions = data.get("player_positions")
+    if not isinstance(positions, list) or not positions or not all(isinstance(p, str) for p in positions):
+        raise ValueError("'player_positions' must be a non-empty list of strings.")
+    if len(set(positions)) != len(positions):
+        raise ValueError("'player_positions' must not repeat a position.")
+    defaults = data.get("default_positions")
+    if not isinstance(defaults, list) or len(defaults) != 11:
+        raise ValueError("'default_positions' must list 11 positions.")
+    unknown = [p for p in defaults if p not in positions]
+    if unknown:
+        raise ValueError(f"Unknown default position(s): {', '.join(map(str, unknown))}.")
+    league_tiers = _weights(data, "league_tiers")
+    return ReferenceTables(
+        version=data.get("version"),
+        modified=modified,
+        league_tiers=league_tiers,
+        scout_scopes=_scout_scopes(data, league_tiers),
+        league_aliases=_league_aliases(data, league_tiers),
+        country_prestige=_weights(data, "country_prestige"),
+        player_positions=tuple(positions),
+        default_positions=tuple(defaults)
+    )
+
+@functools.lru_cache(maxsize=4)
+def _load(path, modified):
+    with open(path, encoding="utf-8") as f:
+        return parse_reference_tables(json.load(f), modified)
+
+_lock = threading.Lock()
+_current = None
+_checked_at = None
+_error = None
+
+def reference_tables():
+    global _current, _checked_at, _error
+    now = time.monotonic()
+    if _current is not None and now - _checked_at < RELOAD_CHECK_SECONDS:
+        return _current
+    with _lock:
+        if _current is None or now - _checked_at >= RELOAD_CHECK_SECONDS:
+            try:
+                _current = _load(REFERENCE_PATH, os.path.getmtime(REFERENCE_PATH))
+                _error = None
+            except (OSError, ValueError) as e:
+                # The first load must succeed; later broken edits keep the last good tables
+                if _current is None:
+                    raise
+                _error = f"{type(e).__name__}: {e}"
+            _checked_at = now
+    return _current
+
+def reference_error():
+    # Why the latest edit of the reference file was rejected, if it was
+    return _error
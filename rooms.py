@@ -0,0 +1,213 @@
+import collections
+import re
+import threading
+import time
+import uuid
+
+from pricing import calculate_minimum_offer, calculate_score
+from reference import reference_tables
+
+# League rooms.
+#
+# Several sessions share one league: each member's club details and Starting
+# 11 summary are published to a room held in a process-wide store (a local
+# stand-in for a server), and every member prices transfers between clubs
+# against the others' live data.
+#
+# Member records are immutable tuples shared by every reader, so fan-out never
+# copies a member per session. Each room keeps a version number and a short
+# log of which members changed at which version; a session remembers the
+# version it last saw and only fetches the members changed since, falling back
+# to the full member list when it has fallen behind the log. Publishing an
+# unchanged club is a no-op that does not bump the version.
+#
+# Every publish and poll marks the member as seen. Members not seen for
+# MEMBER_TTL_SECONDS (a closed tab never leaves) are dropped as departures,
+# and rooms left empty are freed.
+
+MAX_MEMBERS = 32
+MAX_ROOMS = 1000
+# Changes kept per room for sessions catching up
+CHANGE_LOG_SIZE = 256
+# Seconds between checks for other members' changes while the room is open
+POLL_SECONDS = 3
+# Seconds without a publish or poll before a member is dropped from the room
+MEMBER_TTL_SECONDS = 60
+ROOM_CODE_PATTERN = re.compile(r"^[A-Za-z0-9-]{3,24}$")
+
+Member = collections.namedtuple(
+    "Member", ["member_id", "name", "club_name", "league", "country", "european", "average_overall", "updated"]
+)
+
+class RoomError(Exception):
+    pass
+
+def member_stature(member):
+    tables = reference_tables()
+    return calculate_score(member.league, member.country, member.european, tables.league_tiers, tables.country_prestige)
+
+def transfer_price(seller, buyer, player_value, is_young):
+    # Minimum offer the buyer must make, as in the Selling Transfer Calculator
+    stature_diff = member_stature(buyer) - member_stature(seller)
+    return stature_diff, calculate_minimum_offer(player_value, stature_diff, is_young)
+
+class Room:
+    def __init__(self, code):
+        self.code = code
+        self.members = {}
+        # member_id: time of the member's last publish or poll
+        self.seen = {}
+        self.version = 0
+        # (version, member_id) for each join, update and departure
+        self.changes = collections.deque(maxlen=CHANGE_LOG_SIZE)
+        self.lock = threading.Lock()
+
+    def _changed(self, member_id):
+        self.version += 1
+        self.changes.append((self.version, member_id))
+
+    def _expire(self, now):
+        for member_id, seen in list(self.seen.items()):
+            if now - seen > MEMBER_TTL_SECONDS:
+                del self.seen[member_id]
+                if self.members.pop(member_id, None) is not None:
+                    self._changed(member_id)
+
+    def expire(self):
+        # Drops members not seen within the TTL; returns True if the room is empty
+        with self.lock:
+            self._expire(time.time())
+            return not self.members
+
+    def publish(self, member_id, name, club_details, average_overall):
+        with self.lock:
+            now = time.time()
+            self.seen[member_id] = now
+            self._expire(now)
+            current = self.members.get(member_id)
+            if current is None and len(self.members) >= MAX_MEMBERS:
+                raise RoomError(f"Room {self.code} is full ({MAX_MEMBERS} members).")
+            member = Member(
+                member_id, name, club_details["name"], club_details["league"], club_details["country"],
+                bool(club_details["european"]), average_overall, now
+            )
+            if current is not None and current[:-1] == member[:-1]:
+                return False
+            self.members[member_id] = member
+            self._changed(member_id)
+            return True
+
+    def leave(self, member_id):
+        with self.lock:
+            self.seen.pop(member_id, None)
+            if self.members.pop(member_id, None) is None:
+                return False
+            self._changed(member_id)
+            return True
+
+    def changes_since(self, version, member_id=None):
+        # Returns (version, {member_id: Member or None if they left}, full);
+        # full means the caller fell behind the log and got every member.
+        # member_id is the polling member, marked as seen
+        with self.lock:
+            now = time.time()
+            if member_id in self.members:
+                self.seen[member_id] = now
+            self._expire(now)
+            if version == self.version:
+                return version, {}, False
+            if not self.changes or self.changes[0][0] > version + 1 or version > self.version:
+                return self.version, dict(self.members), True
+            changed = {}
+            for change_version, changed_id in reversed(self.changes):
+                if change_version <= version:
+                    break
+                if changed_id not in changed:
+                    changed[changed_id] = self.members.get(changed_id)
+            return self.version, changed, False
+
+class RoomStore:
+    def __init__(self):
+        self.rooms = {}
+        self.lock = threading.Lock()
+
+    def join(self, code):
+        if not ROOM_CODE_PATTERN.match(code or ""):
+            raise RoomError("Room codes are 3 to 24 letters, digits or dashes.")
+        key = code.upper()
+        with self.lock:
+            room = self.rooms.get(key)
+            if room is None:
+                if len(self.rooms) >= MAX_ROOMS:
+                    self._free_empty()
+                if len(self.rooms) >= MAX_ROOMS:
+                    raise RoomError("Too many rooms are open on this server.")
+                room = self.rooms[key] = Room(key)
+            return room
+
+    def _free_empty(self):
+        for code, room in list(self.rooms.items()):
+            if room.expire():
+                del self.rooms[code]
+
+    def get(self, code):
+        # None if the room does not exist or every member has expired
+        with self.lock:
+            room = self.rooms.get(code.upper())
+            if room is not None and room.expire():
+                del self.rooms[room.code]
+                return None
+            return room
+
+    def leave(self, code, member_id):
+        with self.lock:
+            room = self.rooms.get(code.upper())
+            if room is None:
+                return
+            room.leave(member_id)
+            if not room.members:
+                del self.rooms[room.code]
+
+    def stats(self):
+        with self.lock:
+            self._free_empty()
+            return {"rooms": len(self.rooms), "members": sum(len(room.members) for room in self.rooms.values())}
+
+store = RoomStore()
+
+class RoomView:
+    # A session's copy of the room: the shared Member records it last saw
+    def __init__(self, code, member_id, name):
+        self.code = code
+        self.member_id = member_id
+        self.name = name
+        self.version = 0
+        self.members = {}
+
+    def sync(self, room):
+        # Applies the changes since the last sync; returns how many members changed
+        version, changed, full = room.changes_since(self.version, self.member_id)
+        if full:
+            self.members = changed
+        else:
+            for member_id, member in changed.items():
+                if member is None:
+                    self.members.pop(member_id, None)
+                else:
+                    self.members[member_id] = member
+        self.version = version
+        return len(changed)
+
+    def others(self):
+        return sorted(
+            (member for member_id, member in self.members.items() if member_id != self.member_id),
+            key=lambda member: (-member_stature(member), member.name)
+        )
+
+    def publish(self, club_details, average_overall):
+        # Rejoining recreates the room if every member had left it meanwhile
+        return store.join(self.code).publish(self.member_id, self.name, club_details, average_overall)
+
+def join_room(code, name):
+    room = store.join(code)
+    return RoomView(room.code, uuid.uuid4().hex, name)
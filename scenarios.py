@@ -0,0 +1,74 @@
+import math
+
+from pricing import calculate_minimum_offer, calculate_score, calculate_starting_bid, proportional_wage_from_anchor, wage_anchor
+from scouting import scout_permission
+
+# What-if scenario comparison.
+#
+# Evaluates one fixed set of pending transfers under several club_details
+# variants in a single pass. Everything that does not depend on the club is
+# computed once and shared by every scenario: offering-club stature scores,
+# starting bids (which only depend on the Starting 11 average) and proportional
+# wages. Only the club's own stature, scout rating and the minimum offers that
+# depend on the stature difference are computed per scenario.
+
+def compare_scenarios(scenarios, sales, purchases, league_tiers, average_team_overall=None, starting_11=None):
+    # scenarios: club_details-style dicts (name, league, country, european)
+    # sales: dicts with name, value, is_young, league, country, european of the offering club
+    # purchases: dicts with name, value, overall, age
+    offering_scores = [calculate_score(sale["league"], sale["country"], sale["european"], league_tiers) for sale in sales]
+    anchor = wage_anchor(starting_11) if starting_11 else None
+    bids = []
+    for purchase in purchases:
+        bid, is_accurate = calculate_starting_bid(purchase["value"], purchase["overall"], purchase["age"], average_team_overall)
+        wage = proportional_wage_from_anchor(purchase["overall"], anchor) if anchor is not None else None
+        bids.append((math.ceil(bid / 1000) * 1000, wage, is_accurate))
+    total_bids = sum(bid for bid, _, _ in bids)
+    total_wages = sum(wage for _, wage, _ in bids if wage is not None)
+
+    # Variants often repeat a club (e.g. only the European flag changes), so
+    # each distinct stature is only priced once
+    offers_by_score = {}
+    results = []
+    names = set()
+    for index, scenario in enumerate(scenarios, start=1):
+        # Scenario names label the result columns, so they are made unique
+        base_name = (scenario.get("name") or "").strip() or f"Scenario {index}"
+        name, copy = base_name, 1
+        while name in names:
+            copy += 1
+            name = f"{base_name} ({copy})"
+        names.add(name)
+        score = calculate_score(scenario["league"], scenario["country"], scenario["european"], league_tiers)
+        if score not in offers_by_score:
+            offers_by_score[score] = [
+                math.ceil(calculate_minimum_offer(sale["value"], offering_score - score, sale["is_young"]) / 1000) * 1000
+                for sale, offering_score in zip(sales, offering_scores)
+            ]
+        offers = offers_by_score[score]
+        results.append({
+            "name": name,
+            "league": scenario["league"],
+            "country": scenario["country"],
+            "european": bool(scenario["european"]),
+            "scout_rating": scout_permission(scenario["league"], scenario["european"]).rating,
+            "stature": score,
+            "minimum_offers": offers,
+            "total_minimum_offers": sum(offers),
+            "starting_bids": [bid for bid, _, _ in bids],
+            "total_starting_bids": total_bids,
+            "wages": [wage for _, wage, _ in bids],
+            "total_wages": total_wages
+        })
+    return results, {"bids_accurate": all(is_accurate for _, _, is_accurate in bids), "offering_scores": offering_scores}
+
+def default_scenarios(club_details, league_tiers):
+    # Current club, the next league up by tier (unless already in the top
+    # league) and the European flag flipped
+    tier = league_tiers.get(club_details["league"], min(league_tiers.values()))
+    higher = [league for league, league_tier in league_tiers.items() if league_tier > tier]
+    scenarios = [dict(club_details, name="Current")]
+    if higher:
+        scenarios.append(dict(club_details, name="Promoted", league=min(higher, key=league_tiers.get)))
+    scenarios.append(dict(club_details, name="No Europe" if club_details["european"] else "In Europe", european=not club_details["european"]))
+    return scenarios
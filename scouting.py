@@ -0,0 +1,156 @@
+from collections import namedtuple
+
+from reference import reference_tables
+
+# Scout assignment planner.
+#
+# The club's league and European status give a scout star rating and a region
+# the club's scouts may be sent to (set per league in the reference tables). Ratings are modelled as permission scopes
+# (worldwide, continent plus neighbours, continent, country plus neighbours,
+# country) and the countries each scope allows from each home country are
+# precomputed from the adjacency tables below, so checking or planning any
+# number of scouts is a set lookup per target.
+
+ScoutPermission = namedtuple("ScoutPermission", ["rating", "scope", "description"])
+
+SCOUT_PERMISSIONS = {
+    "worldwide": ScoutPermission(10, "worldwide", "Can assign worldwide."),
+    "continent_neighbours": ScoutPermission(8, "continent_neighbours", "Can only assign to local continent and neighbouring continents."),
+    "continent": ScoutPermission(6, "continent", "Can only assign to local continent."),
+    "country_neighbours": ScoutPermission(4, "country_neighbours", "Can only assign to local country and neighbouring countries."),
+    "country": ScoutPermission(2, "country", "Can only assign to local country.")
+}
+
+# Scouting destinations by continent
+COUNTRY_CONTINENTS = {
+    "England": "Europe", "Scotland": "Europe", "Wales": "Europe", "Ireland": "Europe",
+    "Spain": "Europe", "Portugal": "Europe", "France": "Europe", "Belgium": "Europe",
+    "Netherlands": "Europe", "Germany": "Europe", "Denmark": "Europe", "Switzerland": "Europe",
+    "Austria": "Europe", "Italy": "Europe", "Poland": "Europe", "Czech Republic": "Europe",
+    "Croatia": "Europe", "Serbia": "Europe", "Norway": "Europe", "Sweden": "Europe", "Turkey": "Europe",
+    "USA": "North America", "Canada": "North America", "Mexico": "North America",
+    "Brazil": "South America", "Argentina": "South America", "Uruguay": "South America",
+    "Colombia": "South America", "Chile": "South America",
+    "Morocco": "Africa", "Senegal": "Africa", "Nigeria": "Africa", "Ghana": "Africa",
+    "Ivory Coast": "Africa", "Egypt": "Africa",
+    "Japan": "Asia", "South Korea": "Asia", "China": "Asia", "Saudi Arabia": "Asia",
+    "Australia": "Oceania", "New Zealand": "Oceania"
+}
+
+CONTINENT_NEIGHBOURS = {
+    "Europe": ["Africa", "Asia"],
+    "Africa": ["Europe", "Asia", "South America"],
+    "Asia": ["Europe", "Africa", "Oceania"],
+    "North America": ["South America"],
+    "South America": ["North America", "Africa"],
+    "Oceania": ["Asia"]
+}
+
+# Bordering countries (and close neighbours across a short stretch of sea)
+COUNTRY_NEIGHBOURS = {
+    "England": ["Scotland", "Wales", "Ireland", "France"],
+    "Scotland": ["England"],
+    "Wales": ["England", "Ireland"],
+    "Ireland": ["England", "Wales"],
+    "Spain": ["Portugal", "France", "Morocco"],
+    "Portugal": ["Spain"],
+    "France": ["Spain", "Belgium", "Germany", "Switzerland", "Italy", "England"],
+    "Belgium": ["France", "Netherlands", "Germany"],
+    "Netherlands": ["Belgium", "Germany"],
+    "Germany": ["Netherlands", "Belgium", "France", "Switzerland", "Austria", "Czech Republic", "Poland", "Denmark"],
+    "Denmark": ["Germany", "Sweden", "Norway"],
+    "Switzerland": ["France", "Germany", "Austria", "Italy"],
+    "Austria": ["Germany", "Switzerland", "Italy", "Czech Republic"],
+    "Italy": ["France", "Switzerland", "Austria", "Croatia"],
+    "Poland": ["Germany", "Czech Republic"],
+    "Czech Republic": ["Germany", "Poland", "Austria"],
+    "Croatia": ["Italy", "Serbia"],
+    "Serbia": ["Croatia"],
+    "Norway": ["Sweden", "Denmark"],
+    "Sweden": ["Norway", "Denmark"],
+    "Turkey": [],
+    "USA": ["Canada", "Mexico"],
+    "Canada": ["USA"],
+    "Mexico": ["USA"],
+    "Brazil": ["Argentina", "Uruguay", "Colombia"],
+    "Argentina": ["Brazil", "Uruguay", "Chile"],
+    "Uruguay": ["Brazil", "Argentina"],
+    "Colombia": ["Brazil"],
+    "Chile": ["Argentina"],
+    "Morocco": ["Spain"],
+    "Senegal": [],
+    "Nigeria": [],
+    "Ghana": ["Ivory Coast"],
+    "Ivory Coast": ["Ghana"],
+    "Egypt": ["Saudi Arabia"],
+    "Japan": ["South Korea"],
+    "South Korea": ["Japan", "China"],
+    "China": ["South Korea"],
+    "Saudi Arabia": ["Egypt"],
+    "Australia": ["New Zealand"],
+    "New Zealand": ["Australia"]
+}
+
+SCOUTING_COUNTRIES = list(COUNTRY_CONTINENTS.keys())
+
+def scout_permission(league, european):
+    # Scopes per league come from the reference tables; an unknown league gets the narrowest
+    scopes = reference_tables().scout_scopes.get(league)
+    if scopes is None:
+        return SCOUT_PERMISSIONS["country"]
+    return SCOUT_PERMISSIONS[scopes[1] if european else scopes[0]]
+
+def scout_rating_message(permission):
+    return f"Scout Star Rating: {permission.rating} stars. {permission.description}"
+
+def _countries_in(continents):
+    return frozenset(country for country, continent in COUNTRY_CONTINENTS.items() if continent in continents)
+
+def _build_allowed_countries():
+    allowed = {}
+    for home, continent in COUNTRY_CONTINENTS.items():
+        allowed[home, "continent_neighbours"] = _countries_in({continent, *CONTINENT_NEIGHBOURS[continent]})
+        allowed[home, "continent"] = _countries_in({continent})
+        allowed[home, "country_neighbours"] = frozenset([home, *COUNTRY_NEIGHBOURS[home]])
+        allowed[home, "country"] = frozenset([home])
+    return allowed
+
+# Built once at import: (home country, scope) -> countries scouts may be sent to
+ALLOWED_COUNTRIES = _build_allowed_countries()
+
+def allowed_countries(home_country, scope):
+    if scope == "worldwide":
+        return frozenset(SCOUTING_COUNTRIES)
+    return ALLOWED_COUNTRIES.get((home_country, scope), frozenset([home_country]))
+
+def can_assign(home_country, scope, target):
+    return scope == "worldwide" or target in allowed_countries(home_country, scope)
+
+def plan_assignments(home_country, permission, targets, scouts):
+    # targets: countries in priority order; scouts: dicts with name and stars
+    # (experience + judgement, 2-10). Scouts rated above the club's scout
+    # rating cannot be hired, and each hired scout covers one target.
+    reachable = []
+    unreachable = []
+    for target in dict.fromkeys(targets):
+        (reachable if can_assign(home_country, permission.scope, target) else unreachable).append(target)
+    eligible = []
+    ineligible = []
+    for scout in scouts:
+        (eligible if scout["stars"] <= permission.rating else ineligible).append(scout)
+    # Best scouts go to the highest-priority targets
+    eligible.sort(key=lambda scout: scout["stars"], reverse=True)
+    assignments = [
+        {"scout": scout["name"], "stars": scout["stars"], "country": target}
+        for scout, target in zip(eligible, reachable)
+    ]
+    covered = len(assignments)
+    total = len(reachable) + len(unreachable)
+    return {
+        "assignments": assignments,
+        "uncovered": reachable[covered:],
+        "unreachable": unreachable,
+        "idle_scouts": [scout["name"] for scout in eligible[covered:]],
+        "ineligible_scouts": [scout["name"] for scout in ineligible],
+        "coverage": covered / total if total else 0.0
+    }
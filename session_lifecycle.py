@@ -0,0 +1,226 @@
+import atexit
+import logging
+import os
+import pickle
+import shutil
+import tempfile
+import threading
+import time
+import uuid
+import weakref
+
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+# Session state lifecycle.
+#
+# Two jobs keep per-session memory small:
+#
+# - Transient keys that only drive a multi-step flow (the signing/loan
+#   questions, an uploaded JSON blob, the scout rating banner, a proposed Best
+#   XI) are removed once the flow is finished or abandoned, i.e. once they are
+#   back at their idle value or the user has left the tab they belong to.
+#   init_session_state() recreates them lazily when they are needed again.
+# - Sessions left open but idle have their career data pickled to a temporary
+#   directory and removed from memory by a background sweeper. The next rerun
+#   or fragment run of that session loads it back before anything reads it,
+#   so the user never notices. Both count as activity, and a session is never
+#   swept while its script thread (which runs reruns and fragments alike) is
+#   still alive; a run that starts during a sweep waits for it in resume().
+
+logger = logging.getLogger(__name__)
+
+# Seconds without a rerun before a session's career is spilled to disk
+IDLE_SECONDS = 600
+# Seconds between sweeps for idle sessions
+SWEEP_SECONDS = 60
+
+# Career data moved to disk for idle sessions
+SPILL_KEYS = [
+    "club_details", "starting_11", "average_team_overall", "checklist", "squad", "season", "ledger", "watchlist", "season_trend", "contracts", "history"
+]
+
+# Session state key holding the session's SessionHandle
+HANDLE_KEY = "session_handle"
+
+# Flow keys owned by each tab; dropped once the user is on another tab
+FLOW_KEYS = {
+    "Club Details": ["scout_rating_display"],
+    "Career Checklist": [
+        "summer_signing_mode", "summer_loan_mode", "summer_signing_category",
+        "winter_signing_mode", "winter_loan_mode", "winter_signing_category"
+    ],
+    "Starting 11": ["best_xi", "wage_planner"],
+    "Transfer Calculators": ["last_buy", "live_results"],
+    "Save/Load": ["uploaded_json_content", "apply_json_content", "show_load_message"]
+}
+
+def is_idle(value):
+    # None, False or "" mean a flow key has nothing in progress; compared by
+    # type rather than ==, which 0 would also pass and DataFrames cannot answer
+    return value is None or value is False or (isinstance(value, str) and not value)
+
+def collect_transient_state(session_state, active_tab):
+    removed = []
+    for tab, keys in FLOW_KEYS.items():
+        for key in keys:
+            if key not in session_state:
+                continue
+            value = session_state[key]
+            if tab != active_tab or is_idle(value):
+                del session_state[key]
+                removed.append(key)
+    # A chosen signing category only matters while the loan question is open
+    for window in ["summer", "winter"]:
+        category_key = f"{window}_signing_category"
+        if category_key in session_state and not session_state.get(f"{window}_loan_mode"):
+            del session_state[category_key]
+            removed.append(category_key)
+    return removed
+
+class SessionHandle:
+    # Kept in the session's own state so it lives exactly as long as the
+    # session; the spiller only holds weak references to it
+    __slots__ = ["state", "session_id", "thread", "__weakref__"]
+
+    def __init__(self, state):
+        self.state = state
+        self.session_id = uuid.uuid4().hex
+        # Script thread of the session's latest run; it exits once the
+        # session has no more reruns or fragment runs queued
+        self.thread = None
+
+    def __reduce__(self):
+        return (SessionHandle, (None,))
+
+class SessionSpiller:
+    def __init__(self, idle_seconds=IDLE_SECONDS, keys=SPILL_KEYS):
+        self.idle_seconds = idle_seconds
+        self.keys = keys
+        self.directory = None
+        # session_id -> (weak reference to its SessionHandle, last rerun time)
+        self.sessions = {}
+        self.spilled = set()
+        self.spills = 0
+        self.restores = 0
+        self.lock = threading.Lock()
+
+    def _path(self, session_id):
+        # Recreated if something cleaned up the temporary directory meanwhile
+        if self.directory is None or not os.path.isdir(self.directory):
+            self.directory = tempfile.mkdtemp(prefix="fifa-toolkit-sessions-")
+            atexit.register(shutil.rmtree, self.directory, True)
+        return os.path.join(self.directory, f"{session_id}.pkl")
+
+    def resume(self, handle, now=None):
+        # Called at the start of every rerun and fragment run, before any
+        # career key is read
+        session_id = handle.session_id
+        state = handle.state
+        with self.lock:
+            handle.thread = threading.current_thread()
+            self.sessions[session_id] = (weakref.ref(handle), time.monotonic() if now is None else now)
+            if session_id not in self.spilled:
+                return False
+            path = self._path(session_id)
+            self.spilled.discard(session_id)
+            try:
+                with open(path, "rb") as f:
+                    values = pickle.load(f)
+                os.remove(path)
+            except Exception:
+                # The session carries on with fresh defaults rather than failing every run
+                logger.exception("Could not restore spilled session %s", session_id)
+                return False
+            for key, value in values.items():
+                if key not in state:
+                    state[key] = value
+            self.restores += 1
+            return True
+
+    def sweep(self, now=None):
+        now = time.monotonic() if now is None else now
+        spilled = 0
+        with self.lock:
+            for session_id, (handle_ref, last_seen) in list(self.sessions.items()):
+                handle = handle_ref()
+                if handle is None:
+                    # Session closed: forget it and anything it left on disk
+                    del self.sessions[session_id]
+                    if session_id in self.spilled:
+                        self.spilled.discard(session_id)
+                        try:
+                            os.remove(self._path(session_id))
+                        except OSError:
+                            pass
+                    continue
+                if session_id in self.spilled or now - last_seen < self.idle_seconds:
+                    continue
+                if handle.thread is not None and handle.thread.is_alive():
+                    # A run is in progress; never pull keys out from under it
+                    continue
+                state = handle.state
+                values = {key: state[key] for key in self.keys if key in state}
+                if not values:
+                    continue
+                # Written beside the final file and renamed, so a failed write
+                # never leaves a partial spill behind and the keys stay in memory
+                path = self._path(session_id)
+                partial = path + ".partial"
+                try:
+                    with open(partial, "wb") as f:
+                        pickle.dump(values, f, protocol=pickle.HIGHEST_PROTOCOL)
+                    os.replace(partial, path)
+                except Exception:
+                    logger.exception("Could not spill idle session %s", session_id)
+                    try:
+                        os.remove(partial)
+                    except OSError:
+                        pass
+                    continue
+                for key in values:
+                    del state[key]
+                self.spilled.add(session_id)
+                self.spills += 1
+                spilled += 1
+        return spilled
+
+    def stats(self):
+        with self.lock:
+            return {
+                "sessions": len(self.sessions),
+                "spilled": len(self.spilled),
+                "spills": self.spills,
+                "restores": self.restores
+            }
+
+spiller = SessionSpiller()
+_sweeper = None
+_sweeper_lock = threading.Lock()
+
+def _sweep_forever():
+    while True:
+        time.sleep(SWEEP_SECONDS)
+        try:
+            spiller.sweep()
+        except Exception:
+            # Keep sweeping; one bad pass must not stop spilling for the process
+            logger.exception("Idle session sweep failed")
+
+def resume_session():
+    # Restores this session's spilled career (if any) and marks it active.
+    # Call it at the start of the script and of every fragment. The sweeper thread is started on first use, once per server process.
+    global _sweeper
+    ctx = get_script_run_ctx()
+    if ctx is None:
+        return False
+    if _sweeper is None:
+        with _sweeper_lock:
+            if _sweeper is None:
+                _sweeper = threading.Thread(target=_sweep_forever, name="session-spiller", daemon=True)
+                _sweeper.start()
+    # SafeSessionState is recreated for every rerun; the handle points at the
+    # SessionState it wraps, which lives as long as the session
+    state = ctx.session_state._state
+    if HANDLE_KEY not in state:
+        state[HANDLE_KEY] = SessionHandle(state)
+    return spiller.resume(state[HANDLE_KEY])
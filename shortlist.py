@@ -0,0 +1,101 @@
+import csv
+import heapq
+import math
+
+from pricing import calculate_starting_bid, proportional_wage_from_anchor, wage_anchor
+
+# Transfer shortlist ranking.
+#
+# Streams candidate rows once and keeps only the best k per position in a
+# bounded min-heap, so a pool of a million players is ranked with memory
+# proportional to k rather than to the pool. Each candidate is scored by value
+# for money: overall per million of first-season cost, where cost is the
+# starting bid plus a season of the proportional wage.
+
+WEEKS_PER_SEASON = 52
+
+# Accepted header names for each field (case-insensitive)
+COLUMN_ALIASES = {
+    "name": ["name", "player", "player name"],
+    "position": ["position", "pos"],
+    "value": ["value", "player value", "market value"],
+    "overall": ["overall", "ovr", "rating"],
+    "age": ["age"]
+}
+REQUIRED_COLUMNS = ["position", "value", "overall", "age"]
+
+def resolve_columns(fieldnames):
+    lookup = {name.strip().lower(): name for name in fieldnames or []}
+    columns = {}
+    for field, aliases in COLUMN_ALIASES.items():
+        for alias in aliases:
+            if alias in lookup:
+                columns[field] = lookup[alias]
+                break
+    missing = [field for field in REQUIRED_COLUMNS if field not in columns]
+    if missing:
+        raise ValueError(f"Missing column(s): {', '.join(missing)}.")
+    return columns
+
+def score_candidate(value, overall, age, average_team_overall, anchor):
+    bid, _ = calculate_starting_bid(value, overall, age, average_team_overall)
+    bid = math.ceil(bid / 1000) * 1000
+    wage = proportional_wage_from_anchor(overall, anchor) if anchor is not None else 0
+    cost = bid + wage * WEEKS_PER_SEASON
+    return overall / (cost / 1_000_000), bid, wage, cost
+
+def rank_candidates(rows, starting_11, average_team_overall, k=10, positions=None, under_cap_only=True):
+    # rows: iterable of dicts with name/position/value/overall/age (e.g. csv.DictReader)
+    anchor = wage_anchor(starting_11)
+    signing_cap = average_team_overall + 2 if average_team_overall is not None else None
+    heaps = {}
+    seen = 0
+    skipped = 0
+    over_cap = 0
+    columns = None
+    for row in rows:
+        if columns is None:
+            columns = resolve_columns(row.keys())
+        seen += 1
+        try:
+            position = row[columns["position"]].strip().upper()
+            value, overall, age = (float(row[columns[field]]) for field in ("value", "overall", "age"))
+            if not all(map(math.isfinite, (value, overall, age))):
+                raise ValueError("Non-finite number.")
+            overall, age = int(overall), int(age)
+        except (TypeError, ValueError, AttributeError, OverflowError):
+            skipped += 1
+            continue
+        if value <= 0 or overall <= 0 or (positions is not None and position not in positions):
+            skipped += 1
+            continue
+        within_cap = signing_cap is None or overall <= signing_cap
+        if not within_cap:
+            over_cap += 1
+            if under_cap_only:
+                continue
+        try:
+            score, bid, wage, cost = score_candidate(value, overall, age, average_team_overall, anchor)
+        except (ValueError, OverflowError):
+            # Finite inputs whose prices overflow
+            skipped += 1
+            continue
+        heap = heaps.setdefault(position, [])
+        entry = (score, seen, row.get(columns.get("name"), "") if "name" in columns else "", overall, age, value, bid, wage, cost, within_cap)
+        if len(heap) < k:
+            heapq.heappush(heap, entry)
+        elif entry > heap[0]:
+            heapq.heapreplace(heap, entry)
+    ranked = {}
+    for position, heap in heaps.items():
+        ranked[position] = [
+            {
+                "name": name, "position": position, "overall": overall, "age": age, "value": value,
+                "starting_bid": bid, "wage": wage, "season_cost": cost, "score": score, "within_cap": within_cap
+            }
+            for score, _, name, overall, age, value, bid, wage, cost, within_cap in sorted(heap, reverse=True)
+        ]
+    return ranked, {"rows": seen, "skipped": skipped, "over_cap": over_cap}
+
+def rank_csv(text_stream, starting_11, average_team_overall, **options):
+    return rank_candidates(csv.DictReader(text_stream), starting_11, average_team_overall, **options)
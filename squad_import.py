@@ -0,0 +1,78 @@
+import io
+
+import pandas as pd
+
+# Bulk Starting 11 / squad import.
+#
+# Parses a pasted table (tab-separated from a spreadsheet, or comma/semicolon
+# separated) or an uploaded CSV of position, overall and wage in one pass, and
+# validates every row at once with pandas instead of one widget at a time.
+
+COLUMN_ALIASES = {
+    "position": ["position", "pos"],
+    "overall": ["overall", "ovr", "rating"],
+    "wage": ["wage", "wages", "wage (p/w)", "salary"]
+}
+COLUMNS = list(COLUMN_ALIASES.keys())
+
+# Wages like "25,000", "£25,000 p/w", "25k" or "1.2m"; anything else is an error
+WAGE_PATTERN = r"^\s*[£$€]?\s*(?P<number>\d[\d,]*(?:\.\d+)?|\.\d+)\s*(?P<suffix>[kKmM]?)\s*(?:p/?w)?\s*$"
+WAGE_SUFFIXES = {"": 1, "k": 1_000, "m": 1_000_000}
+# Larger wages are rejected rather than wrapped round when converted to int64
+MAX_WAGE = 100_000_000
+
+def _read_table(text):
+    sample = text.lstrip().splitlines()[0] if text.strip() else ""
+    separator = "\t" if "\t" in sample else ";" if sample.count(";") > sample.count(",") else ","
+    # Blank lines are read and then dropped so the index keeps the source line numbers
+    table = pd.read_csv(io.StringIO(text), sep=separator, header=None, dtype=str, skip_blank_lines=False, keep_default_na=False)
+    table = table.fillna("")
+    table.index = range(1, len(table) + 1)
+    table = table[~table.apply(lambda column: column.str.strip() == "").all(axis=1)]
+    first_row = [str(cell).strip().lower() for cell in table.iloc[0]] if len(table) else []
+    names = {}
+    for column, aliases in COLUMN_ALIASES.items():
+        for index, cell in enumerate(first_row):
+            if cell in aliases:
+                names[column] = index
+                break
+    if names:
+        missing = [column for column in COLUMNS if column not in names]
+        if missing:
+            raise ValueError(f"Missing column(s): {', '.join(missing)}.")
+        table = table.iloc[1:]
+    else:
+        # No header: position, overall, wage in that order
+        if table.shape[1] < 3:
+            raise ValueError("Expected three columns: position, overall, wage.")
+        names = {column: index for index, column in enumerate(COLUMNS)}
+    table = table[[names[column] for column in COLUMNS]]
+    table.columns = COLUMNS
+    return table
+
+def parse_players(text, player_positions):
+    # Returns (players, errors); errors are (line, message) pairs
+    table = _read_table(text)
+    positions = table["position"].str.strip().str.upper()
+    overalls = pd.to_numeric(table["overall"].str.replace(",", "").str.strip(), errors="coerce")
+    wage_parts = table["wage"].str.extract(WAGE_PATTERN)
+    wages = (
+        pd.to_numeric(wage_parts["number"].str.replace(",", ""), errors="coerce") *
+        wage_parts["suffix"].str.lower().map(WAGE_SUFFIXES)
+    ).round(6)
+    checks = [
+        (~positions.isin(player_positions), "position must be one of " + ", ".join(player_positions)),
+        (overalls.isna() | (overalls % 1 != 0) | (overalls < 0) | (overalls > 99), "overall must be a whole number from 0 to 99"),
+        (
+            wages.isna() | (wages % 1 != 0) | (wages < 0) | (wages > MAX_WAGE),
+            f"wage must be a whole number from 0 to {MAX_WAGE:,}, e.g. 25000, 25,000 or 25k"
+        )
+    ]
+    errors = []
+    for invalid, message in checks:
+        errors.extend((line, message) for line in table.index[invalid.to_numpy()])
+    errors.sort()
+    if errors:
+        return [], errors
+    players = pd.DataFrame({"position": positions, "overall": overalls.astype(int), "wage": wages.astype(int)})
+    return players.to_dict("records"), []
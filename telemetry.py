@@ -0,0 +1,219 @@
+import atexit
+import bisect
+import json
+import os
+import queue
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Structured events and metrics.
+#
+# record_event() only stamps a dict and puts it on a queue, so the request path
+# never waits on disk or on a lock shared with the metrics endpoint. A
+# background thread drains the queue in batches: it folds them into in-process
+# counters and histograms and, when FIFA_TOOLKIT_EVENT_LOG names a file,
+# appends them to that JSON-lines log with one write per batch. The log is rotated to a single .1 backup once it
+# passes EVENT_LOG_MAX_BYTES. The metrics are served in Prometheus text format
+# by a small HTTP server on a daemon thread (GET /metrics), started once per
+# process when FIFA_TOOLKIT_METRICS_PORT is set.
+
+# The event log is off unless a path is set
+EVENT_LOG_PATH = os.environ.get("FIFA_TOOLKIT_EVENT_LOG", "")
+# Size at which the event log is rotated (0 never rotates)
+EVENT_LOG_MAX_BYTES = int(os.environ.get("FIFA_TOOLKIT_EVENT_LOG_MAX_BYTES", str(50 * 1024 * 1024)))
+METRICS_HOST = os.environ.get("FIFA_TOOLKIT_METRICS_HOST", "127.0.0.1")
+# The metrics endpoint is off unless a port is set
+METRICS_PORT = int(os.environ.get("FIFA_TOOLKIT_METRICS_PORT", "0"))
+
+# Events written per batch, and the longest an event waits to be written
+BATCH_SIZE = 500
+FLUSH_SECONDS = 1.0
+# Events beyond this many waiting are dropped (and counted) rather than block
+MAX_QUEUED_EVENTS = 100_000
+
+# Event fields that become metric labels; everything else only goes to the log
+LABELS = ("calculator", "action", "tab", "endpoint")
+
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+SIZE_BUCKETS = (1_000, 10_000, 100_000, 1_000_000, 10_000_000)
+
+class Histogram:
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+def _label_text(labels, extra=None):
+    pairs = list(labels) + ([extra] if extra else [])
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{key}="{_escape(value)}"' for key, value in pairs) + "}"
+
+class Metrics:
+    def __init__(self):
+        self.lock = threading.Lock()
+        # (event, labels) -> count / Histogram; labels is a tuple of (key, value)
+        self.events = {}
+        self.durations = {}
+        self.sizes = {}
+        self.dropped = 0
+        self.written = 0
+
+    def apply(self, batch):
+        with self.lock:
+            for event in batch:
+                key = (event["event"], tuple((label, event[label]) for label in LABELS if event.get(label) is not None))
+                self.events[key] = self.events.get(key, 0) + 1
+                if event.get("duration") is not None:
+                    self.durations.setdefault(key, Histogram(DURATION_BUCKETS)).observe(event["duration"])
+                if event.get("payload_bytes") is not None:
+                    self.sizes.setdefault(key, Histogram(SIZE_BUCKETS)).observe(event["payload_bytes"])
+
+    def _histograms(self, lines, name, help_text, histograms):
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} histogram")
+        for (event, labels), histogram in sorted(histograms.items()):
+            base = (("event", event),) + labels
+            cumulative = 0
+            for bound, count in zip(histogram.buckets, histogram.counts):
+                cumulative += count
+                lines.append(f"{name}_bucket{_label_text(base, ('le', repr(float(bound))))} {cumulative}")
+            lines.append(f"{name}_bucket{_label_text(base, ('le', '+Inf'))} {histogram.count}")
+            lines.append(f"{name}_sum{_label_text(base)} {histogram.sum!r}")
+            lines.append(f"{name}_count{_label_text(base)} {histogram.count}")
+
+    def render(self):
+        with self.lock:
+            lines = [
+                "# HELP fifa_toolkit_events_total Events recorded, by event and labels.",
+                "# TYPE fifa_toolkit_events_total counter"
+            ]
+            for (event, labels), count in sorted(self.events.items()):
+                lines.append(f"fifa_toolkit_events_total{_label_text((('event', event),) + labels)} {count}")
+            self._histograms(lines, "fifa_toolkit_event_duration_seconds", "Time taken by timed events.", self.durations)
+            self._histograms(lines, "fifa_toolkit_payload_bytes", "Size of saved, loaded or served JSON payloads.", self.sizes)
+            lines.append("# HELP fifa_toolkit_events_dropped_total Events dropped because the queue was full or they could not be recorded.")
+            lines.append("# TYPE fifa_toolkit_events_dropped_total counter")
+            lines.append(f"fifa_toolkit_events_dropped_total {self.dropped}")
+            lines.append("# HELP fifa_toolkit_events_written_total Events written to the event log.")
+            lines.append("# TYPE fifa_toolkit_events_written_total counter")
+            lines.append(f"fifa_toolkit_events_written_total {self.written}")
+            return "\n".join(lines) + "\n"
+
+class EventWriter:
+    def __init__(self, metrics, path=EVENT_LOG_PATH, max_bytes=EVENT_LOG_MAX_BYTES):
+        self.metrics = metrics
+        self.path = path
+        self.max_bytes = max_bytes
+        self.queue = queue.Queue(maxsize=MAX_QUEUED_EVENTS)
+        self.thread = None
+        self.lock = threading.Lock()
+
+    def emit(self, event):
+        if self.thread is None:
+            with self.lock:
+                if self.thread is None:
+                    self.thread = threading.Thread(target=self._run, name="event-writer", daemon=True)
+                    self.thread.start()
+                    atexit.register(self.flush)
+        try:
+            self.queue.put_nowait(event)
+        except queue.Full:
+            with self.metrics.lock:
+                self.metrics.dropped += 1
+
+    def _run(self):
+        while True:
+            batch = [self.queue.get()]
+            deadline = time.monotonic() + FLUSH_SECONDS
+            while len(batch) < BATCH_SIZE:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self.queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+            try:
+                self._write(batch)
+            except Exception:
+                # A bad event must not end the writer (flush() would then wait out its timeout)
+                with self.metrics.lock:
+                    self.metrics.dropped += len(batch)
+            finally:
+                for _ in batch:
+                    self.queue.task_done()
+
+    def _write(self, batch):
+        self.metrics.apply(batch)
+        if not self.path:
+            return
+        try:
+            if self.max_bytes and os.path.getsize(self.path) >= self.max_bytes:
+                os.replace(self.path, self.path + ".1")
+        except OSError:
+            pass
+        try:
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write("".join(json.dumps(event, separators=(",", ":"), default=str) + "\n" for event in batch))
+        except OSError:
+            return
+        with self.metrics.lock:
+            self.metrics.written += len(batch)
+
+    def flush(self, timeout=5.0):
+        # Waits (up to timeout) for queued events to be written
+        deadline = time.monotonic() + timeout
+        while self.queue.unfinished_tasks and time.monotonic() < deadline:
+            time.sleep(0.01)
+
+metrics = Metrics()
+writer = EventWriter(metrics)
+
+def record_event(event, duration=None, payload_bytes=None, **fields):
+    writer.emit({"time": time.time(), "event": event, "duration": duration, "payload_bytes": payload_bytes, **fields})
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.split("?", 1)[0].rstrip("/") != "/metrics":
+            self.send_error(404)
+            return
+        body = metrics.render().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+_server = None
+_server_started = False
+_server_lock = threading.Lock()
+
+def start_metrics_server(host=METRICS_HOST, port=METRICS_PORT):
+    # Tried once per process; returns the server, or None if disabled or the port is taken
+    global _server, _server_started
+    if _server_started or not port:
+        return _server
+    with _server_lock:
+        if not _server_started:
+            _server_started = True
+            try:
+                _server = ThreadingHTTPServer((host, port), _MetricsHandler)
+            except OSError:
+                return None
+            _server.daemon_threads = True
+            threading.Thread(target=_server.serve_forever, name="metrics-server", daemon=True).start()
+    return _server
@@ -0,0 +1,96 @@
+import asyncio
+import json
+
+import pytest
+
+import api
+from reference import reference_tables
+
+def club():
+    tables = reference_tables()
+    return {"league": next(iter(tables.league_tiers)), "country": next(iter(tables.country_prestige)), "european": False}
+
+@pytest.mark.parametrize("body", [
+    b"{",
+    b"\xff\xfe",
+    b'{"player_value": NaN, "stature_diff": 0}',
+    b'{"player_value": Infinity, "stature_diff": 0}',
+    b"[" * 200_000,
+    b"[1, 2]"
+])
+def test_malformed_json_is_a_400(body):
+    with pytest.raises(api.ApiError) as error:
+        api.handle("POST", "/minimum-offer", body)
+    assert error.value.status == 400
+
+@pytest.mark.parametrize("data", [
+    {"player_value": "1000", "stature_diff": 0},
+    {"player_value": True, "stature_diff": 0},
+    {"player_value": 1e300, "stature_diff": 0},
+    {"player_value": 0, "stature_diff": 0},
+    {"player_value": 1000, "stature_diff": 1e13},
+    {"player_value": 1000, "club": {"league": "Nowhere"}, "offering_club": {}}
+])
+def test_invalid_minimum_offer_fields_are_a_400(data):
+    with pytest.raises(api.ApiError) as error:
+        api.handle("POST", "/minimum-offer", json.dumps(data).encode())
+    assert error.value.status == 400
+
+def test_proportional_wage_checks_every_player():
+    starting_11 = [{"position": "ST", "overall": 70, "wage": 10_000}] * 10 + [{"position": "ST", "overall": 70, "wage": 1e300}]
+    with pytest.raises(api.ApiError):
+        api.proportional_wage({"player_overall": 70, "starting_11": starting_11})
+
+def test_unknown_path_and_method():
+    with pytest.raises(api.ApiError) as error:
+        api.handle("POST", "/nope", b"{}")
+    assert error.value.status == 404
+    with pytest.raises(api.ApiError) as error:
+        api.handle("GET", "/stature", b"")
+    assert error.value.status == 405
+
+def test_batch_reports_errors_per_item():
+    result = api.handle("POST", "/batch/stature", json.dumps({"items": [club(), {"league": "Nowhere"}, 5]}).encode())
+    first, second, third = result["results"]
+    assert "stature" in first
+    assert "error" in second
+    assert "error" in third
+
+def request(raw):
+    # Sends raw bytes to serve_connection and returns the full response
+    async def run():
+        server = await asyncio.start_server(api.serve_connection, "127.0.0.1", 0)
+        port = server.sockets[0].getsockname()[1]
+        async with server:
+            reader, writer = await asyncio.open_connection("127.0.0.1", port)
+            writer.write(raw)
+            await writer.drain()
+            writer.write_eof()
+            response = await asyncio.wait_for(reader.read(), 10)
+            writer.close()
+            return response
+    return asyncio.run(run())
+
+def status(response):
+    return int(response.split(b" ", 2)[1])
+
+def test_server_answers_a_valid_request():
+    body = json.dumps(club()).encode()
+    response = request(b"POST /stature HTTP/1.1\r\nConnection: close\r\nContent-Length: %d\r\n\r\n%s" % (len(body), body))
+    assert status(response) == 200
+    assert b'"stature"' in response
+
+@pytest.mark.parametrize("raw, expected", [
+    (b"GARBAGE\r\n\r\n", 400),
+    (b"GET /" + b"a" * 70_000 + b" HTTP/1.1\r\n\r\n", 431),
+    (b"GET /health HTTP/1.1\r\nX-Long: " + b"a" * 70_000 + b"\r\n\r\n", 431),
+    (b"POST /stature HTTP/1.1\r\nContent-Length: nope\r\n\r\n", 400),
+    (b"POST /stature HTTP/1.1\r\nContent-Length: -5\r\n\r\n", 400),
+    (b"POST /stature HTTP/1.1\r\nContent-Length: %d\r\n\r\n" % (api.MAX_BODY_BYTES + 1), 413),
+    (b"POST /stature HTTP/1.1\r\nConnection: close\r\nContent-Length: 200000\r\n\r\n" + b"[" * 200_000, 400)
+])
+def test_server_rejects_malformed_requests(raw, expected):
+    assert status(request(raw)) == expected
+
+def test_truncated_body_closes_quietly():
+    assert request(b"POST /stature HTTP/1.1\r\nContent-Length: 100\r\n\r\n{") == b""
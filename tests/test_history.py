@@ -0,0 +1,86 @@
+from history import History, thaw_record
+from ledger import TransferLedger
+
+CLUB = {"name": "Leeds", "league": "Second Division", "country": "England", "european": False}
+
+def starting_11(overall):
+    return [{"position": "ST", "overall": overall, "wage": 1000} for _ in range(11)]
+
+class Career:
+    # The parts of session state History tracks, edited like the app does
+    def __init__(self):
+        self.history = History()
+        self.club_details = dict(CLUB)
+        self.starting_11 = starting_11(70)
+        self.season = 1
+        self.ledger = TransferLedger()
+        self.track()
+
+    def track(self):
+        return self.history.track(self.history.snapshot(self.club_details, self.starting_11, self.season, self.ledger))
+
+    def restore(self, snapshot):
+        self.club_details = thaw_record(snapshot.club_details)
+        self.starting_11 = [thaw_record(player) for player in snapshot.starting_11]
+        self.season = snapshot.season
+
+    def undo(self):
+        self.restore(self.history.undo(self.ledger))
+
+    def redo(self):
+        self.restore(self.history.redo(self.ledger))
+
+    def state(self):
+        return self.club_details, self.starting_11, self.season, self.ledger.to_dict(), self.ledger.checklist(self.season)
+
+def test_unchanged_rerun_is_not_a_step():
+    career = Career()
+    assert not career.track()
+    assert not career.history.undo_stack
+
+def test_undo_redo_across_a_season_reset():
+    career = Career()
+    states = [career.state()]
+    career.ledger.record(1, "summer", "starting", "Striker", fee=1_000_000)
+    assert career.track()
+    states.append(career.state())
+    career.season += 1
+    assert career.track()
+    states.append(career.state())
+    career.ledger.record(2, "summer", "bench", "Keeper")
+    career.starting_11 = starting_11(72)
+    assert career.track()
+    states.append(career.state())
+
+    for expected in reversed(states[:-1]):
+        career.undo()
+        assert career.state() == expected
+    assert career.history.undo(career.ledger) is None
+    assert career.ledger.checklist(1)["summer"]["starting_signings"] == 0
+
+    for expected in states[1:]:
+        career.redo()
+        assert career.state() == expected
+    assert career.history.redo(career.ledger) is None
+    assert career.ledger.checklist(2)["summer"]["bench_signings"] == 1
+
+def test_new_edit_after_undo_clears_redo():
+    career = Career()
+    career.ledger.record(1, "summer", "starting")
+    career.track()
+    career.undo()
+    career.ledger.record(1, "summer", "reserve")
+    assert career.track()
+    assert not career.history.redo_stack
+    summer = career.ledger.checklist(1)["summer"]
+    assert (summer["starting_signings"], summer["reserve_signings"]) == (0, 1)
+
+def test_unchanged_players_are_shared_between_snapshots():
+    career = Career()
+    first = career.history.current
+    career.starting_11[0] = dict(career.starting_11[0], overall=80)
+    career.track()
+    second = career.history.current
+    assert second.club_details is first.club_details
+    assert second.starting_11[0] is not first.starting_11[0]
+    assert all(new is old for new, old in zip(second.starting_11[1:], first.starting_11[1:]))
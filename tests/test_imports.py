@@ -0,0 +1,83 @@
+import io
+
+import pytest
+
+from club_index import read_clubs
+from reference import reference_tables
+from shortlist import rank_csv
+from squad_import import MAX_WAGE, parse_players
+from watchlist import Watchlist, pricing_context, read_csv
+
+POSITIONS = ["GK", "CB", "CM", "ST"]
+STARTING_11 = [{"position": "ST", "overall": 80, "wage": 10_000}] * 11
+
+@pytest.mark.parametrize("value, overall, age", [
+    ("inf", "80", "20"), ("1e400", "80", "20"), ("nan", "80", "20"),
+    ("1000000", "inf", "20"), ("1000000", "nan", "20"), ("1000000", "80", "inf"),
+    ("1e308", "1e300", "20")
+])
+def test_shortlist_skips_non_finite_rows(value, overall, age):
+    text = f"Name,Position,Value,Overall,Age\nBad,ST,{value},{overall},{age}\nGood,ST,1000000,80,20\n"
+    ranked, stats = rank_csv(io.StringIO(text), STARTING_11, 80, under_cap_only=False)
+    assert [candidate["name"] for candidate in ranked["ST"]] == ["Good"]
+    assert stats["skipped"] == 1
+
+def test_club_rows_missing_cells_are_reported_with_their_line():
+    text = "Club Name,League,Country\nLeeds,Second Division,England\n\nArsenal,Premier League\n"
+    with pytest.raises(ValueError, match="Line 4"):
+        read_clubs(io.StringIO(text))
+
+def test_club_rows_with_extra_or_odd_cells_still_load():
+    text = "Club Name,League,Country,European Bonus\nLeeds,Second Division,England,x,extra\n"
+    assert read_clubs(io.StringIO(text)) == [
+        {"name": "Leeds", "league": "Second Division", "country": "England", "european": False}
+    ]
+
+@pytest.mark.parametrize("wage", ["99999999999999999999999", f"{MAX_WAGE + 1}", "100.5m", "-5", "lots", "1e5"])
+def test_squad_import_rejects_bad_wages_by_line(wage):
+    players, errors = parse_players(f"Position,Overall,Wage\nST,80,25k\n\nGK,70,{wage}\n", POSITIONS)
+    assert players == []
+    assert [line for line, _ in errors] == [4]
+
+def test_squad_import_parses_wage_formats():
+    players, errors = parse_players("ST\t80\t£25,000 p/w\nGK\t70\t1.2m\nCB\t65\t$500\n", POSITIONS)
+    assert errors == []
+    assert [player["wage"] for player in players] == [25_000, 1_200_000, 500]
+
+@pytest.mark.parametrize("value, overall, age", [
+    ("inf", "80", "20"), ("1e400", "80", "20"), ("nan", "80", "20"), ("1e308", "80", "20"),
+    ("1000000", "inf", "20"), ("1000000", "80", "inf"), ("1000000", "nan", "20")
+])
+def test_watchlist_skips_non_finite_rows(value, overall, age):
+    players, skipped = read_csv(io.StringIO(f"Name,Value,Overall,Age\nBad,{value},{overall},{age}\nGood,1000000,80,20\n"))
+    assert list(players) == ["Good"]
+    assert skipped == 1
+
+def watchlist_data():
+    tables = reference_tables()
+    club = {"league": next(iter(tables.league_tiers)), "country": next(iter(tables.country_prestige)), "european": False}
+    players, _ = read_csv(io.StringIO("Name,Value,Overall,Age\nGood,1000000,80,20\n"))
+    watchlist = Watchlist()
+    watchlist.update(players, 1, pricing_context(club, 75, STARTING_11))
+    return watchlist.to_dict()
+
+def test_watchlist_round_trip():
+    data = watchlist_data()
+    assert Watchlist.from_dict(data).to_dict() == data
+
+@pytest.mark.parametrize("change", [
+    lambda entry: entry.update(inputs=5),
+    lambda entry: entry["inputs"].__setitem__(1, "1000000"),
+    lambda entry: entry["inputs"].__setitem__(1, float("inf")),
+    lambda entry: entry["inputs"].__setitem__(2, 80.5),
+    lambda entry: entry["inputs"].pop(),
+    lambda entry: entry["history"][0].__setitem__(1, "a"),
+    lambda entry: entry["history"][0].__setitem__(0, 0),
+    lambda entry: entry.update(key=5),
+    lambda entry: entry.pop("history")
+])
+def test_watchlist_from_dict_rejects_malformed_entries(change):
+    data = watchlist_data()
+    change(data["Good"])
+    with pytest.raises(ValueError):
+        Watchlist.from_dict(data)
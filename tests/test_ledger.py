@@ -0,0 +1,86 @@
+import pytest
+
+from ledger import TransferLedger
+
+def make_ledger():
+    ledger = TransferLedger()
+    ledger.record(1, "summer", "starting", "Striker", fee=5_000_000, wage=40_000)
+    ledger.record(1, "summer", "bench", "Keeper", fee=1_000_000, wage=10_000, loan=True)
+    ledger.record(1, "summer", "sold", "Winger", fee=8_000_000)
+    ledger.record(1, "season", "youth", "Academy")
+    ledger.record(2, "winter", "reserve", "Prospect", fee=250_000, wage=2_000)
+    return ledger
+
+def state(ledger):
+    return ledger.to_dict(), [ledger.checklist(season) for season in (1, 2)], ledger.season_totals()
+
+def test_record_updates_checklist_and_spend():
+    ledger = make_ledger()
+    summer = ledger.checklist(1)["summer"]
+    assert summer["starting_signings"] == 1
+    assert summer["bench_signings"] == 1
+    assert summer["loans"] == 1
+    assert summer["starting_sold"] == 1
+    assert ledger.checklist(1)["youth_promotions"] == 1
+    assert ledger.net_spend(1) == 5_000_000 + 1_000_000 - 8_000_000
+
+def test_reversal_takes_the_entry_back_out():
+    ledger = make_ledger()
+    before = ledger.checklist(1)
+    row = ledger.reverse_last(1, "summer", "bench")
+    assert row == len(ledger) - 1
+    assert ledger.checklist(1)["summer"]["bench_signings"] == before["summer"]["bench_signings"] - 1
+    assert ledger.checklist(1)["summer"]["loans"] == before["summer"]["loans"] - 1
+    assert ledger.net_spend(1) == 5_000_000 - 8_000_000
+    # The only bench signing is already reversed
+    assert ledger.reverse_last(1, "summer", "bench") is None
+
+def test_truncate_and_extend_round_trip():
+    ledger = make_ledger()
+    ledger.reverse_last(1, "summer", "starting")
+    full = state(ledger)
+    removed = ledger.truncate(3)
+    assert len(ledger) == 3
+    assert ledger.checklist(2)["winter"]["reserve_signings"] == 0
+    assert ledger.checklist(1)["summer"]["starting_signings"] == 1
+    ledger.extend(removed)
+    assert state(ledger) == full
+    # The reversal was restored with its link, so it cannot be reversed twice
+    assert ledger.reverse_last(1, "summer", "starting") is None
+
+def test_revision_changes_on_every_write():
+    ledger = make_ledger()
+    revisions = {ledger.revision}
+    ledger.record(2, "summer", "starting")
+    revisions.add(ledger.revision)
+    ledger.truncate(len(ledger) - 1)
+    revisions.add(ledger.revision)
+    assert len(revisions) == 3
+
+def test_to_dict_from_dict_round_trip():
+    ledger = make_ledger()
+    ledger.reverse_last(1, "summer", "sold")
+    loaded = TransferLedger.from_dict(ledger.to_dict())
+    assert state(loaded) == state(ledger)
+    assert loaded.reverse_last(1, "summer", "sold") is None
+
+@pytest.mark.parametrize("change", [
+    lambda data: data.pop("fee"),
+    lambda data: data["fee"].append(1.0),
+    lambda data: data.update(window=[9] * len(data["window"])),
+    lambda data: data.update(category=[-9] * len(data["category"])),
+    lambda data: data["reverses"].__setitem__(0, 0),
+    lambda data: data["reverses"].__setitem__(1, 4),
+    lambda data: data.update(reverses=[-1, 0, 0, -1, -1]),
+    lambda data: data.update(season=["one"] * len(data["season"])),
+    lambda data: data.update(wage=[2 ** 70] * len(data["wage"]))
+])
+def test_from_dict_rejects_invalid_data(change):
+    data = make_ledger().to_dict()
+    change(data)
+    with pytest.raises(ValueError):
+        TransferLedger.from_dict(data)
+
+def test_from_dict_rejects_non_objects():
+    with pytest.raises(ValueError):
+        TransferLedger.from_dict([])
@@ -0,0 +1,67 @@
+import itertools
+import random
+
+import pytest
+
+from lineup import FORMATIONS, POSITION_COMPATIBILITY, best_lineup, hungarian
+
+def brute_force_cost(cost):
+    columns = range(len(cost[0]))
+    return min(
+        sum(cost[row][column] for row, column in enumerate(assignment))
+        for assignment in itertools.permutations(columns, len(cost))
+    )
+
+@pytest.mark.parametrize("seed", range(40))
+def test_hungarian_matches_brute_force(seed):
+    rng = random.Random(seed)
+    rows = rng.randint(1, 5)
+    columns = rng.randint(rows, 6)
+    cost = [[rng.randint(-50, 50) for _ in range(columns)] for _ in range(rows)]
+    assignment = hungarian(cost)
+    assert len(set(assignment)) == rows
+    assert sum(cost[row][column] for row, column in enumerate(assignment)) == brute_force_cost(cost)
+
+def lineup_key(squad, lineup, minimise_wages):
+    # Most slots filled, then total overall, then (when minimising) lowest wages
+    chosen = [index for index in lineup if index is not None]
+    return (
+        len(chosen), sum(squad[index]["overall"] for index in chosen),
+        -sum(squad[index]["wage"] for index in chosen) if minimise_wages else 0
+    )
+
+def brute_force_lineup(squad, formation, exact_positions, minimise_wages):
+    # Best key over every valid assignment of players (or nobody) to slots
+    options = [None] + [index for index, player in enumerate(squad) if player["overall"] > 0]
+    return max(
+        lineup_key(squad, lineup, minimise_wages)
+        for lineup in itertools.product(options, repeat=len(formation))
+        if len([index for index in lineup if index is not None]) == len({index for index in lineup if index is not None}) and all(
+            index is None or squad[index]["position"] in ([slot] if exact_positions else POSITION_COMPATIBILITY[slot])
+            for slot, index in zip(formation, lineup)
+        )
+    )
+
+@pytest.mark.parametrize("seed", range(30))
+@pytest.mark.parametrize("exact_positions", [False, True])
+@pytest.mark.parametrize("minimise_wages", [False, True])
+def test_best_lineup_matches_brute_force(seed, exact_positions, minimise_wages):
+    rng = random.Random(seed)
+    formation = rng.sample(FORMATIONS["4-4-2"], 4)
+    positions = sorted(POSITION_COMPATIBILITY)
+    squad = [
+        {"position": rng.choice(positions), "overall": rng.choice([0, 60, 65, 70, 70, 75]), "wage": rng.choice([1000, 5000, 20000])}
+        for _ in range(rng.randint(3, 7))
+    ]
+    lineup = best_lineup(squad, formation, exact_positions, minimise_wages)
+    assert len(lineup) == len(formation)
+    chosen = [index for index in lineup if index is not None]
+    assert len(chosen) == len(set(chosen))
+    for slot, index in zip(formation, lineup):
+        if index is not None:
+            assert squad[index]["overall"] > 0
+            assert squad[index]["position"] in ([slot] if exact_positions else POSITION_COMPATIBILITY[slot])
+    assert lineup_key(squad, lineup, minimise_wages) == brute_force_lineup(squad, formation, exact_positions, minimise_wages)
+
+def test_empty_squad_leaves_every_slot_empty():
+    assert best_lineup([{"position": "ST", "overall": 0, "wage": 0}], FORMATIONS["4-3-3"]) == [None] * 11
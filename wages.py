@@ -0,0 +1,106 @@
+import numpy as np
+
+# Squad-wide wage structure planner.
+#
+# Applies calculate_proportional_wage to every squad member in one vectorised
+# pass. The wage structure is anchored on the Starting 11 (the first 11
+# players): the highest-paid valid starter sets the rate and the best valid
+# starter's overall sets the threshold for the 1.2x bump. When a player's
+# overall or wage changes, only that player is repriced unless the change
+# moves the anchor, in which case the whole squad is repriced at once.
+
+STARTING_11_SIZE = 11
+WAGE_CAP_MULTIPLIER = 1.2
+
+def proportional_wages(overalls, max_wage, max_wage_overall, max_overall):
+    # Same operation order as calculate_proportional_wage, so results are identical
+    overalls = np.asarray(overalls, dtype=np.float64)
+    wages = max_wage * (overalls / max_wage_overall)
+    wages = np.where(overalls > max_overall, wages * 1.2, wages)
+    return (np.ceil(wages / 100) * 100).astype(np.int64)
+
+class WagePlanner:
+    def __init__(self, players):
+        self.positions = [player["position"] for player in players]
+        self.overalls = np.array([player["overall"] for player in players], dtype=np.float64)
+        self.wages = np.array([player["wage"] for player in players], dtype=np.float64)
+        self.full_recalculations = 0
+        self.player_recalculations = 0
+        self._recalculate_all()
+
+    # Anchor derived from the Starting 11
+    def _anchor(self):
+        overalls = self.overalls[:STARTING_11_SIZE]
+        wages = self.wages[:STARTING_11_SIZE]
+        valid = (overalls > 0) & (wages > 0)
+        if not valid.any():
+            return None
+        valid_wages = np.where(valid, wages, -np.inf)
+        anchor_index = int(np.argmax(valid_wages))
+        return (
+            float(wages[anchor_index]),
+            float(overalls[anchor_index]),
+            float(overalls[valid].max())
+        )
+
+    def _recalculate_all(self):
+        self.anchor = self._anchor()
+        if self.anchor is None:
+            self.proportional = None
+        else:
+            self.proportional = proportional_wages(self.overalls, *self.anchor)
+        starting_wages = self.wages[:STARTING_11_SIZE]
+        self.wage_cap = int(starting_wages.max() * WAGE_CAP_MULTIPLIER) if starting_wages.size else 0
+        self.wage_bill = int(self.wages.sum())
+        self.projected_wage_bill = int(self.proportional.sum()) if self.proportional is not None else None
+        self.full_recalculations += 1
+
+    def update_player(self, index, overall=None, wage=None):
+        if overall is not None:
+            self.overalls[index] = overall
+        if wage is not None:
+            self.wage_bill += int(wage - self.wages[index])
+            self.wages[index] = wage
+        if index < STARTING_11_SIZE:
+            starting_wages = self.wages[:STARTING_11_SIZE]
+            self.wage_cap = int(starting_wages.max() * WAGE_CAP_MULTIPLIER)
+            if self._anchor() != self.anchor:
+                self._recalculate_all()
+                return
+        if self.proportional is not None:
+            new_wage = int(proportional_wages(self.overalls[index:index + 1], *self.anchor)[0])
+            self.projected_wage_bill += new_wage - int(self.proportional[index])
+            self.proportional[index] = new_wage
+        self.player_recalculations += 1
+
+    def sync(self, players):
+        # Apply only the differences between the planner and the given players
+        if len(players) != len(self.overalls):
+            self.__init__(players)
+            return
+        self.positions = [player["position"] for player in players]
+        overalls = np.array([player["overall"] for player in players], dtype=np.float64)
+        wages = np.array([player["wage"] for player in players], dtype=np.float64)
+        changed = np.flatnonzero((overalls != self.overalls) | (wages != self.wages))
+        for index in changed:
+            self.update_player(int(index), overall=overalls[index], wage=wages[index])
+
+    @property
+    def headroom(self):
+        # Room left under the wage cap for each player's proportional wage
+        if self.proportional is None:
+            return None
+        return self.wage_cap - self.proportional
+
+    def rows(self):
+        rows = []
+        for index, position in enumerate(self.positions):
+            rows.append({
+                "Role": "Starting 11" if index < STARTING_11_SIZE else "Squad",
+                "Position": position,
+                "Overall": int(self.overalls[index]),
+                "Current Wage": int(self.wages[index]),
+                "Proportional Wage": int(self.proportional[index]) if self.proportional is not None else None,
+                "Headroom to Cap": int(self.headroom[index]) if self.proportional is not None else None
+            })
+        return rows
@@ -0,0 +1,233 @@
+import csv
+import hashlib
+import itertools
+import math
+
+from pricing import calculate_minimum_offer, calculate_score, calculate_starting_bid, proportional_wage_from_anchor, wage_anchor
+from reference import reference_tables
+
+# Player watchlist with price history.
+#
+# Remembers each tracked player's pricing inputs and results together with a
+# hash of those inputs and of the club context they were priced against
+# (stature, Starting 11 average and wage anchor). Re-pricing the list after a
+# window only recomputes players whose hash changed, so updating a large
+# watchlist costs as much as the changes. Results are kept once per season, and
+# the latest season is diffed against the one before it.
+
+# Accepted header names for each field (case-insensitive)
+COLUMN_ALIASES = {
+    "name": ["name", "player", "player name"],
+    "position": ["position", "pos"],
+    "value": ["value", "player value", "market value"],
+    "overall": ["overall", "ovr", "rating"],
+    "age": ["age"],
+    "league": ["league", "club league"],
+    "country": ["country", "club country"],
+    "european": ["european", "european bonus"]
+}
+REQUIRED_COLUMNS = ["name", "value", "overall", "age"]
+
+# Pricing results kept per season
+RESULTS = ("starting_bid", "wage", "minimum_offer")
+# Largest player value accepted, so prices stay finite
+MAX_VALUE = 1e12
+
+# Revision numbers, unique across watchlists in this process
+_revisions = itertools.count(1)
+
+def resolve_columns(fieldnames):
+    lookup = {name.strip().lower(): name for name in fieldnames or []}
+    columns = {}
+    for field, aliases in COLUMN_ALIASES.items():
+        for alias in aliases:
+            if alias in lookup:
+                columns[field] = lookup[alias]
+                break
+    missing = [field for field in REQUIRED_COLUMNS if field not in columns]
+    if missing:
+        raise ValueError(f"Missing column(s): {', '.join(missing)}.")
+    return columns
+
+def input_key(inputs, context):
+    # Stable across processes (unlike hash()), so saved watchlists keep their keys
+    return hashlib.blake2b(repr((inputs, context)).encode(), digest_size=8).hexdigest()
+
+def pricing_context(club_details, average_team_overall, starting_11):
+    tables = reference_tables()
+    club_stature = calculate_score(
+        club_details["league"], club_details["country"], club_details["european"], tables.league_tiers, tables.country_prestige
+    )
+    return club_stature, average_team_overall, wage_anchor(starting_11)
+
+def price_player(inputs, context):
+    _, value, overall, age, league, country, european = inputs
+    club_stature, average_team_overall, anchor = context
+    bid, _ = calculate_starting_bid(value, overall, age, average_team_overall)
+    wage = proportional_wage_from_anchor(overall, anchor) if anchor is not None else None
+    # The least the player's club accepts from us; same stature when their club is unknown
+    stature_diff = 0.0
+    if league:
+        tables = reference_tables()
+        stature_diff = club_stature - calculate_score(league, country, european, tables.league_tiers, tables.country_prestige)
+    offer = calculate_minimum_offer(value, stature_diff, 16 <= age <= 21)
+    return math.ceil(bid / 1000) * 1000, wage, math.ceil(offer / 1000) * 1000
+
+def read_players(rows):
+    # rows: iterable of dicts (e.g. csv.DictReader); returns ({name: inputs}, skipped)
+    players = {}
+    skipped = 0
+    columns = None
+    for row in rows:
+        if columns is None:
+            columns = resolve_columns(row.keys())
+        try:
+            name = row[columns["name"]].strip()
+            value, overall, age = (float(row[columns[field]]) for field in ("value", "overall", "age"))
+            if not all(map(math.isfinite, (value, overall, age))):
+                raise ValueError("Non-finite number.")
+            overall, age = int(overall), int(age)
+            position = row[columns["position"]].strip().upper() if "position" in columns else ""
+            league = row[columns["league"]].strip() if "league" in columns else ""
+            country = row[columns["country"]].strip() if "country" in columns else ""
+            european_text = row[columns["european"]].strip().lower() if "european" in columns else ""
+        except (TypeError, ValueError, AttributeError):
+            skipped += 1
+            continue
+        if not name or not 0 < value <= MAX_VALUE or not 0 < overall <= 99 or age <= 0:
+            skipped += 1
+            continue
+        european = european_text in ("yes", "true", "y") or (european_text.replace(".", "", 1).isdigit() and float(european_text) > 0)
+        players[name] = (position, value, overall, age, league, country, european)
+    return players, skipped
+
+def _is_int(value):
+    return isinstance(value, int) and not isinstance(value, bool)
+
+def valid_inputs(inputs):
+    return (
+        len(inputs) == 7 and
+        isinstance(inputs[0], str) and
+        isinstance(inputs[1], (int, float)) and not isinstance(inputs[1], bool) and
+        math.isfinite(inputs[1]) and 0 < inputs[1] <= MAX_VALUE and
+        _is_int(inputs[2]) and 0 < inputs[2] <= 99 and
+        _is_int(inputs[3]) and inputs[3] > 0 and
+        isinstance(inputs[4], str) and isinstance(inputs[5], str) and isinstance(inputs[6], bool)
+    )
+
+def valid_record(record):
+    # (season, bid, wage, offer); wage is None without a Starting 11
+    return (
+        len(record) == 1 + len(RESULTS) and
+        _is_int(record[0]) and record[0] >= 1 and
+        _is_int(record[1]) and (record[2] is None or _is_int(record[2])) and _is_int(record[3])
+    )
+
+class Watchlist:
+    def __init__(self):
+        # name -> [inputs, key, history]; history holds (season, bid, wage, offer),
+        # one per season, oldest first
+        self.players = {}
+        # Context of the last re-price and players changed since, so an
+        # update under the same context does not even rehash the rest
+        self.context = None
+        self.dirty = set()
+        # Changes whenever players or prices may have changed
+        self.revision = next(_revisions)
+
+    def __len__(self):
+        return len(self.players)
+
+    def update(self, players, season, context, replace=False):
+        # players: {name: inputs} as returned by read_players
+        stats = {"added": 0, "changed": 0, "unchanged": 0, "removed": 0}
+        if replace:
+            for name in [name for name in self.players if name not in players]:
+                del self.players[name]
+                self.dirty.discard(name)
+                stats["removed"] += 1
+        for name, inputs in players.items():
+            entry = self.players.get(name)
+            if entry is None:
+                self.players[name] = [inputs, None, []]
+                self.dirty.add(name)
+                stats["added"] += 1
+            elif entry[0] != inputs:
+                entry[0] = inputs
+                self.dirty.add(name)
+                stats["changed"] += 1
+            else:
+                stats["unchanged"] += 1
+        stats["repriced"] = self.reprice(season, context)
+        return stats
+
+    def reprice(self, season, context):
+        # Recomputes only players whose inputs or club context changed
+        repriced = 0
+        names = self.dirty if context == self.context else self.players
+        for name in names:
+            entry = self.players[name]
+            key = input_key(entry[0], context)
+            if key == entry[1]:
+                continue
+            history = entry[2]
+            record = (season,) + price_player(entry[0], context)
+            # One record per season: a re-price within the season replaces it
+            if history and history[-1][0] == season:
+                history[-1] = record
+            else:
+                history.append(record)
+            entry[1] = key
+            repriced += 1
+        self.context = context
+        self.dirty = set()
+        self.revision = next(_revisions)
+        return repriced
+
+    def rows(self):
+        # Latest prices with the change since the previous season on record
+        rows = []
+        for name, (inputs, _, history) in self.players.items():
+            if not history:
+                continue
+            current = history[-1]
+            previous = history[-2] if len(history) > 1 else None
+            row = {
+                "name": name, "position": inputs[0], "value": inputs[1], "overall": inputs[2], "age": inputs[3],
+                "season": current[0], "previous_season": previous[0] if previous else None
+            }
+            for index, field in enumerate(RESULTS, start=1):
+                row[field] = current[index]
+                if previous is None or current[index] is None or previous[index] is None:
+                    row[f"{field}_change"] = None
+                else:
+                    row[f"{field}_change"] = current[index] - previous[index]
+            rows.append(row)
+        return rows
+
+    # Serialisation
+    def to_dict(self):
+        return {
+            name: {"inputs": list(inputs), "key": key, "history": [list(record) for record in history]}
+            for name, (inputs, key, history) in self.players.items()
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        if not isinstance(data, dict):
+            raise ValueError("Watchlist data must be an object.")
+        watchlist = cls()
+        try:
+            for name, entry in data.items():
+                inputs = tuple(entry["inputs"])
+                history = [tuple(record) for record in entry["history"]]
+                key = entry.get("key")
+                if not valid_inputs(inputs) or not all(map(valid_record, history)) or not (key is None or isinstance(key, str)):
+                    raise ValueError(f"Invalid watchlist entry for {name!r}.")
+                watchlist.players[str(name)] = [inputs, key, history]
+        except (KeyError, TypeError, AttributeError) as e:
+            raise ValueError(f"Invalid watchlist data: {e}")
+        return watchlist
+
+def read_csv(text_stream):
+    return read_players(csv.DictReader(text_stream))